@@ -1,36 +1,20 @@
-import fitz  # PyMuPDF
+import os
 import re
+import sys
 from collections import defaultdict
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server'))
+from pdf_spans import load_spans
+
 print("=" * 80)
 print("ANÁLISIS COMPLETO DE NUMERACIÓN - PDF ZONIFICACIÓN TEATRO")
 print("=" * 80)
 
-doc = fitz.open(r"C:\Users\Alecs\Desktop\ddu\BOLETERA PROJECT\boletera1\ZONIFICACION RECORTE FINAL TEATRO DE LA CIUDAD.pdf")
-page = doc[0]
-
-# Extraer todo el texto con posiciones
-blocks = page.get_text("dict")["blocks"]
-
-# Recopilar todos los textos con sus posiciones
-all_texts = []
-for block in blocks:
-    if "lines" in block:
-        for line in block["lines"]:
-            for span in line["spans"]:
-                text = span["text"].strip()
-                if text:
-                    bbox = span["bbox"]
-                    all_texts.append({
-                        'text': text,
-                        'x': bbox[0],
-                        'y': bbox[1],
-                        'x2': bbox[2],
-                        'y2': bbox[3]
-                    })
-
-# Ordenar por Y (de arriba hacia abajo)
-all_texts.sort(key=lambda x: (x['y'], x['x']))
+# Spans del PDF con indice espacial (server/pdf_spans.py; se extraen una vez por PDF)
+spans = load_spans(r"C:\Users\Alecs\Desktop\ddu\BOLETERA PROJECT\boletera1\ZONIFICACION RECORTE FINAL TEATRO DE LA CIUDAD.pdf")
+
+# Todos los textos con sus posiciones, ordenados por Y (de arriba hacia abajo)
+all_texts = spans.records(page=0)
 
 # Buscar elementos clave
 print("\n📍 ELEMENTOS ESTRUCTURALES DEL PDF:")
@@ -53,14 +37,14 @@ row_numbers = ['8', '7', '6', '5', '4', '3', '2', '1']
 
 rows_found = defaultdict(list)
 
-for t in all_texts:
-    text = t['text'].strip()
+for label in row_letters + row_numbers:
     # Buscar solo letras/números solos que sean filas
-    if text in row_letters or text in row_numbers:
-        rows_found[text].append({
-            'y': t['y'],
-            'x': t['x']
-        })
+    for t in spans.records(spans.find(label, page=0, exact=True)):
+        if t['text'] == label:
+            rows_found[label].append({
+                'y': t['y'],
+                'x': t['x']
+            })
 
 print("\n🔹 FILAS NUMÉRICAS (VIP):")
 for row in row_numbers:
@@ -1,15 +1,13 @@
-import pymysql
-import fitz  # PyMuPDF
-import re
-
-# Conexión a la base de datos
-conn = pymysql.connect(
-    host='72.167.60.4',
-    user='boletera_user',
-    password='Cer0un0cer0.com20182417',
-    database='boletera_db',
-    charset='utf8mb4'
-)
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server'))
+from boletera_db import get_pool
+from pdf_spans import load_spans
+
+# Conexión a la base de datos (pool compartido de server/boletera_db.py)
+db = get_pool(host='72.167.60.4')
+conn = db.acquire()
 
 LAYOUT_ID = 'ad44b249-13ad-4c51-b1ff-f73ce9b80c9b'
 
@@ -17,7 +15,7 @@ print("=" * 80)
 print("COMPARACIÓN: PDF vs BASE DE DATOS")
 print("=" * 80)
 
-# Obtener datos de la DB
+# Obtener datos de la DB (columnas indexadas sectionName/rowLabel/posY de Seat)
 cursor = conn.cursor()
 
 # Verificar estado actual de filas en la DB
@@ -29,14 +27,14 @@ print("\n🔹 VIP - Relación Fila vs Posición Y:")
 cursor.execute("""
     SELECT 
         sectionName,
-        `row`,
-        ROUND(AVG(y), 0) as avg_y,
+        rowLabel,
+        ROUND(AVG(posY), 0) as avg_y,
         COUNT(*) as seats
     FROM Seat
-    WHERE layoutId = %s AND zone = 'VIP'
-    GROUP BY sectionName, `row`
+    WHERE layoutId = %s AND sectionName LIKE %s
+    GROUP BY sectionName, rowLabel
     ORDER BY sectionName, avg_y DESC
-""", (LAYOUT_ID,))
+""", (LAYOUT_ID, 'VIP%'))
 for row in cursor.fetchall():
     print(f"  {row[0]:15} | Fila {row[1]:2} | Y={row[2]:6.0f} | {row[3]} asientos")
 
@@ -45,14 +43,14 @@ print("\n🔹 PLUS - Relación Fila vs Posición Y:")
 cursor.execute("""
     SELECT 
         sectionName,
-        `row`,
-        ROUND(AVG(y), 0) as avg_y,
+        rowLabel,
+        ROUND(AVG(posY), 0) as avg_y,
         COUNT(*) as seats
     FROM Seat
-    WHERE layoutId = %s AND zone = 'PLUS'
-    GROUP BY sectionName, `row`
+    WHERE layoutId = %s AND sectionName LIKE %s
+    GROUP BY sectionName, rowLabel
     ORDER BY sectionName, avg_y DESC
-""", (LAYOUT_ID,))
+""", (LAYOUT_ID, 'PLUS%'))
 for row in cursor.fetchall():
     print(f"  {row[0]:15} | Fila {row[1]:2} | Y={row[2]:6.0f} | {row[3]} asientos")
 
@@ -61,14 +59,14 @@ print("\n🔹 PREFERENTE - Relación Fila vs Posición Y:")
 cursor.execute("""
     SELECT 
         sectionName,
-        `row`,
-        ROUND(AVG(y), 0) as avg_y,
+        rowLabel,
+        ROUND(AVG(posY), 0) as avg_y,
         COUNT(*) as seats
     FROM Seat
-    WHERE layoutId = %s AND zone = 'PREFERENTE'
-    GROUP BY sectionName, `row`
+    WHERE layoutId = %s AND sectionName LIKE %s
+    GROUP BY sectionName, rowLabel
     ORDER BY sectionName, avg_y DESC
-""", (LAYOUT_ID,))
+""", (LAYOUT_ID, 'PREFERENTE%'))
 for row in cursor.fetchall():
     print(f"  {row[0]:15} | Fila {row[1]:2} | Y={row[2]:6.0f} | {row[3]} asientos")
 
@@ -77,21 +75,14 @@ print("\n" + "=" * 80)
 print("📄 ANÁLISIS DETALLADO DEL PDF")
 print("=" * 80)
 
-doc = fitz.open(r"C:\Users\Alecs\Desktop\ddu\BOLETERA PROJECT\boletera1\ZONIFICACION RECORTE FINAL TEATRO DE LA CIUDAD.pdf")
-page = doc[0]
-
-# Extraer todo el texto con posiciones
-blocks = page.get_text("dict")["blocks"]
+# Spans del PDF con indice espacial (server/pdf_spans.py; se extraen una vez por PDF)
+spans = load_spans(r"C:\Users\Alecs\Desktop\ddu\BOLETERA PROJECT\boletera1\ZONIFICACION RECORTE FINAL TEATRO DE LA CIUDAD.pdf")
 
 # Encontrar "ESCENARIO" para determinar orientación
 escenario_y = None
-for block in blocks:
-    if "lines" in block:
-        for line in block["lines"]:
-            for span in line["spans"]:
-                if "ESCENARIO" in span["text"].upper():
-                    escenario_y = span["bbox"][1]
-                    print(f"\n📍 ESCENARIO encontrado en Y = {escenario_y:.1f}")
+for t in spans.records(spans.find('ESCENARIO', page=0)):
+    escenario_y = t['y']
+    print(f"\n📍 ESCENARIO encontrado en Y = {escenario_y:.1f}")
 
 # Buscar los números de asientos y sus filas
 print("\n📊 ESTRUCTURA DE FILAS SEGÚN PDF:")
@@ -137,13 +128,13 @@ print("-" * 60)
 # Para VIP Central como ejemplo
 cursor.execute("""
     SELECT 
-        `row`,
-        ROUND(AVG(y), 0) as avg_y
+        rowLabel,
+        ROUND(AVG(posY), 0) as avg_y
     FROM Seat
-    WHERE layoutId = %s AND sectionName = 'VIP Central'
-    GROUP BY `row`
+    WHERE layoutId = %s AND sectionName = %s
+    GROUP BY rowLabel
     ORDER BY avg_y DESC
-""", (LAYOUT_ID,))
+""", (LAYOUT_ID, 'VIP Central'))
 
 vip_rows = cursor.fetchall()
 print("\n VIP Central (ordenado por Y DESC - de mayor a menor Y):")
@@ -168,13 +159,13 @@ if vip_rows:
 # Para PLUS
 cursor.execute("""
     SELECT 
-        `row`,
-        ROUND(AVG(y), 0) as avg_y
+        rowLabel,
+        ROUND(AVG(posY), 0) as avg_y
     FROM Seat
-    WHERE layoutId = %s AND sectionName = 'PLUS Central'
-    GROUP BY `row`
+    WHERE layoutId = %s AND sectionName = %s
+    GROUP BY rowLabel
     ORDER BY avg_y DESC
-""", (LAYOUT_ID,))
+""", (LAYOUT_ID, 'PLUS Central'))
 
 plus_rows = cursor.fetchall()
 print("\n PLUS Central (ordenado por Y DESC):")
@@ -217,5 +208,5 @@ Esta numeración va de IZQUIERDA a DERECHA del espectador
 (que sería de DERECHA a IZQUIERDA viendo desde el escenario)
 """)
 
-conn.close()
+db.release(conn)
 print("\n✅ Análisis completado")
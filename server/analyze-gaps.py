@@ -1,40 +1,21 @@
-import fitz  # PyMuPDF
-import re
+import math
 from collections import defaultdict
 
+from pdf_spans import load_spans
+
 print("=" * 100)
 print("🔍 ANÁLISIS DE GAPS - CABINA Y DISCAPACITADOS")
 print("=" * 100)
 
-doc = fitz.open(r"C:\Users\Alecs\Desktop\ZONIFICACION RECORTE FINAL TEATRO DE LA CIUDAD.pdf")
-page = doc[0]
-
-# Extraer todo el texto con posiciones
-blocks = page.get_text("dict")["blocks"]
-
-all_texts = []
-for block in blocks:
-    if "lines" in block:
-        for line in block["lines"]:
-            for span in line["spans"]:
-                text = span["text"].strip()
-                if text:
-                    bbox = span["bbox"]
-                    all_texts.append({
-                        'text': text,
-                        'x': bbox[0],
-                        'y': bbox[1],
-                        'x2': bbox[2],
-                        'y2': bbox[3],
-                        'size': span.get('size', 0)
-                    })
+# Spans del PDF con indice espacial (pdf_spans.py; se extraen una vez por PDF)
+spans = load_spans(r"C:\Users\Alecs\Desktop\ZONIFICACION RECORTE FINAL TEATRO DE LA CIUDAD.pdf")
+all_texts = spans.records(page=0)
 
 # Buscar CABINA
 print("\n📍 BUSCANDO 'CABINA' EN EL PDF:")
 print("-" * 80)
-for t in all_texts:
-    if 'CABINA' in t['text'].upper():
-        print(f"  Y={t['y']:6.1f} X={t['x']:6.1f} | '{t['text']}'")
+for t in spans.records(spans.find('CABINA', page=0)):
+    print(f"  Y={t['y']:6.1f} X={t['x']:6.1f} | '{t['text']}'")
 
 # Buscar DISCAPACITADOS o silla de ruedas
 print("\n📍 BUSCANDO 'DISCAPACITADOS' O SIMILAR:")
@@ -52,7 +33,7 @@ print("=" * 100)
 # La cabina aparece en Y=261 con "CABINA"
 # Buscar todos los elementos en esa zona Y (255-275)
 print("\nElementos en la zona Y=255-275 (área de cabina):")
-cabina_area = [t for t in all_texts if 255 <= t['y'] <= 275]
+cabina_area = spans.records(spans.rect(-math.inf, 255, math.inf, 275))
 cabina_area.sort(key=lambda x: (round(x['y']), x['x']))
 
 current_y = -1
@@ -76,14 +57,13 @@ print("\nBuscando secuencias de números en PLUS CENTRAL:")
 # La cabina aparece en la mitad
 
 plus_central_nums = []
-for t in all_texts:
-    if 247 <= t['y'] <= 430 and 280 <= t['x'] <= 520:  # Área aproximada de PLUS CENTRAL
-        if t['text'].isdigit():
-            plus_central_nums.append({
-                'num': int(t['text']),
-                'x': t['x'],
-                'y': t['y']
-            })
+for t in spans.records(spans.rect(280, 247, 520, 430)):  # Área aproximada de PLUS CENTRAL
+    if t['text'].isdigit():
+        plus_central_nums.append({
+            'num': int(t['text']),
+            'x': t['x'],
+            'y': t['y']
+        })
 
 # Agrupar por fila Y
 rows = defaultdict(list)
@@ -118,16 +98,15 @@ Los asientos alrededor de la cabina NO existen físicamente.
 print("\n📍 CONTEXTO ALREDEDOR DE LA CABINA (Y=255-270):")
 print("-" * 80)
 
-for t in sorted(all_texts, key=lambda x: (x['y'], x['x'])):
-    if 255 <= t['y'] <= 275:
-        print(f"Y={t['y']:5.0f} X={t['x']:5.0f} | {t['text']}")
+for t in spans.records(spans.rect(-math.inf, 255, math.inf, 275)):
+    print(f"Y={t['y']:5.0f} X={t['x']:5.0f} | {t['text']}")
 
 # Buscar la zona VIP donde podría haber discapacitados
 print("\n" + "=" * 100)
 print("📊 ANÁLISIS DE ZONA VIP (buscando espacios especiales)")
 print("=" * 100)
 
-vip_area = [t for t in all_texts if 480 <= t['y'] <= 550]
+vip_area = spans.records(spans.rect(-math.inf, 480, math.inf, 550))
 vip_area.sort(key=lambda x: (round(x['y']), x['x']))
 
 print("\nElementos en zona VIP (Y=480-550):")
@@ -140,8 +119,6 @@ for t in vip_area:
     if len(t['text']) > 1 or not t['text'].isdigit():  # Mostrar solo textos relevantes
         print(f"    X={t['x']:5.0f} | {t['text']}")
 
-doc.close()
-
 print("\n" + "=" * 100)
 print("📋 RESUMEN DE GAPS ENCONTRADOS")
 print("=" * 100)
@@ -1,42 +1,24 @@
-import fitz  # PyMuPDF
 import re
-from collections import defaultdict
+
+from pdf_spans import load_spans
 
 print("=" * 100)
 print("ANÁLISIS DETALLADO DEL PDF - NUMERACIÓN Y GAPS POR SECCIÓN")
 print("=" * 100)
 
-doc = fitz.open(r"C:\Users\Alecs\Desktop\ZONIFICACION RECORTE FINAL TEATRO DE LA CIUDAD.pdf")
+spans = load_spans(r"C:\Users\Alecs\Desktop\ZONIFICACION RECORTE FINAL TEATRO DE LA CIUDAD.pdf")
 
-print(f"\nPáginas en el PDF: {len(doc)}")
+print(f"\nPáginas en el PDF: {spans.pages}")
 
 # Analizar todas las páginas
-for page_num in range(len(doc)):
-    page = doc[page_num]
+for page_num in range(spans.pages):
     print(f"\n{'='*100}")
     print(f"PÁGINA {page_num + 1}")
     print(f"{'='*100}")
     
-    # Extraer todo el texto con posiciones
-    blocks = page.get_text("dict")["blocks"]
-    
-    all_texts = []
-    for block in blocks:
-        if "lines" in block:
-            for line in block["lines"]:
-                for span in line["spans"]:
-                    text = span["text"].strip()
-                    if text:
-                        bbox = span["bbox"]
-                        all_texts.append({
-                            'text': text,
-                            'x': bbox[0],
-                            'y': bbox[1],
-                            'x2': bbox[2],
-                            'y2': bbox[3],
-                            'size': span.get('size', 0)
-                        })
-    
+    # Spans de la página (pdf_spans.py; se extraen una vez por PDF)
+    all_texts = spans.records(page=page_num)
+
     # Ordenar por Y luego X
     all_texts.sort(key=lambda x: (round(x['y'], 0), x['x']))
     
@@ -84,5 +66,4 @@ for page_num in range(len(doc)):
                                             'DERECHA', 'IZQUIERDA', 'CENTRAL', 'TOTAL', 'CANTIDAD']):
             print(f"  Y={t['y']:5.0f} X={t['x']:5.0f} | {t['text']}")
 
-doc.close()
 print("\n✅ Análisis completado")
@@ -1,6 +1,6 @@
-import fitz
-doc = fitz.open(r'C:\Users\Alecs\Desktop\ZONIFICACION RECORTE FINAL TEATRO DE LA CIUDAD.pdf')
-page = doc[0]
+from pdf_spans import load_spans
+
+spans = load_spans(r'C:\Users\Alecs\Desktop\ZONIFICACION RECORTE FINAL TEATRO DE LA CIUDAD.pdf')
 
 print("=" * 80)
 print("ANÁLISIS DE NUMERACIÓN - PDF ZONIFICACIÓN TEATRO")
@@ -37,22 +37,16 @@ print()
 # Las filas se identifican por letras (A-P para PLUS/PREFERENTE) o números (1-8 para VIP)
 
 # Extraer información de filas
-blocks = page.get_text('dict')['blocks']
 rows_data = {}
 
-for block in blocks:
-    if 'lines' in block:
-        for line in block['lines']:
-            for span in line['spans']:
-                text = span['text'].strip()
-                y = span['bbox'][1]
-                x = span['bbox'][0]
-                
-                # Buscar identificadores de fila (letras sueltas A-P o números 1-8)
-                if len(text) == 1 and (text.isalpha() and text.upper() in 'ABCDEFGHIJKLMNOP'):
-                    if text not in rows_data:
-                        rows_data[text] = []
-                    rows_data[text].append((y, x))
+for t in spans.records(page=0):
+    text = t['text']
+
+    # Buscar identificadores de fila (letras sueltas A-P o números 1-8)
+    if len(text) == 1 and (text.isalpha() and text.upper() in 'ABCDEFGHIJKLMNOP'):
+        if text not in rows_data:
+            rows_data[text] = []
+        rows_data[text].append((t['y'], t['x']))
 
 print("Filas detectadas y sus posiciones Y (de arriba hacia abajo):")
 for row in sorted(rows_data.keys()):
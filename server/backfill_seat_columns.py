@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Llenar las columnas materializadas de Seat (sectionId, sectionName, posX,
+posY) a partir de metadata. Ver la migracion 20261017_add_seat_index_columns.
+
+Recorre la tabla por rangos de id en lotes pequenos, cada lote en su propia
+transaccion, para no bloquear la tabla mientras el sistema esta en linea. Se
+puede correr varias veces: por defecto solo toca asientos con sectionId NULL.
+Solo hace falta para los asientos anteriores a la migracion: desde entonces
+todo INSERT/UPDATE de metadata escribe tambien estas columnas (el servidor con
+src/utils/seatIndex.ts, los generadores, load_seats.py y sync_seats.py).
+
+    python3 backfill_seat_columns.py
+    python3 backfill_seat_columns.py --layout ad44b249-... --all
+"""
+
+import argparse
+import time
+
+from boletera_db import get_pool
+from seat_sinks import SEAT_INDEX_COLUMNS, seat_index_values
+
+CHUNK_SIZE = 1000
+
+
+def iter_chunks(db, layout_id=None, refresh_all=False, chunk_size=CHUNK_SIZE):
+    """Lotes de (id, metadata) en orden de id"""
+    conditions = ['id > %s']
+    params = []
+    if layout_id:
+        conditions.append('layoutId = %s')
+        params.append(layout_id)
+    if not refresh_all:
+        conditions.append('sectionId IS NULL')
+    sql = f"SELECT id, metadata FROM Seat WHERE {' AND '.join(conditions)} ORDER BY id LIMIT %s"
+
+    last_id = ''
+    while True:
+        rows = db.query(sql, (last_id, *params, chunk_size))
+        if not rows:
+            break
+        yield rows
+        last_id = rows[-1][0]
+
+
+def backfill(db, layout_id=None, refresh_all=False, chunk_size=CHUNK_SIZE, pause=0.0):
+    total = 0
+    for rows in iter_chunks(db, layout_id, refresh_all, chunk_size):
+        updates = []
+        for seat_id, metadata in rows:
+            try:
+                values = seat_index_values(metadata)
+            except ValueError:
+                print(f'  metadata invalida en {seat_id}, se omite')
+                continue
+            updates.append(values + (seat_id,))
+        # Un UPDATE unido por lote en lugar de uno por asiento
+        if updates:
+            total += db.update_many('Seat', 'id', SEAT_INDEX_COLUMNS, updates)
+        print(f'  {total} asientos actualizados (hasta {rows[-1][0]})')
+        if pause:
+            time.sleep(pause)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Llenar sectionId/sectionName/posX/posY de Seat desde metadata')
+    parser.add_argument('--layout', help='Solo los asientos de este VenueLayout')
+    parser.add_argument('--all', dest='refresh_all', action='store_true',
+                        help='Recalcular todos los asientos, no solo los que tienen sectionId NULL')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help=f'Asientos por transaccion (default: {CHUNK_SIZE})')
+    parser.add_argument('--pause', type=float, default=0.0,
+                        help='Segundos de espera entre lotes para reducir la carga')
+    args = parser.parse_args()
+
+    db = get_pool(size=1)
+    total = backfill(db, args.layout, args.refresh_all, args.chunk_size, args.pause)
+    print(f'Total: {total} asientos')
+
+
+if __name__ == '__main__':
+    main()
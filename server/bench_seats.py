@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Benchmark del pipeline de asientos con venues sinteticos.
+
+Genera venues de 1k, 10k, 100k y 500k asientos con la misma forma de
+entrada que tangamanga_seats.json y SECTIONS_POLYGONS, y mide por separado:
+carga del JSON del Excel, generate_seats_in_polygon, emision de SQL,
+serializacion del JSON del canvas y el merge de update_layout.py.
+
+Cada etapa corre en un proceso nuevo para que el pico de RSS sea de esa
+etapa. Los resultados se guardan en JSON para comparar contra una corrida
+anterior:
+
+    python3 bench_seats.py --sizes 1000,10000 --output /tmp/bench.json
+    python3 bench_seats.py --baseline /tmp/bench.json --tolerance 0.2
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import string
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+
+import generate_seats_db_v3 as generator
+from seat_sinks import SEAT_INSERT_HEADER, JsonArraySink, SqlInsertSink
+from update_layout import merge_seats
+
+DEFAULT_SIZES = [1000, 10000, 100000, 500000]
+DEFAULT_OUTPUT = '/tmp/seat_bench_results.json'
+
+# Forma de las secciones sinteticas (parecida a PREFERENTE: 16 filas A-P)
+ROWS_PER_SECTION = 16
+SEATS_PER_ROW = 50
+SECTION_WIDTH = 400.0
+SECTION_HEIGHT = 250.0
+SECTION_GAP = 40.0
+
+STAGES = ['excel_load', 'generate', 'sql', 'canvas_json', 'layout_merge']
+
+
+def build_synthetic_venue(num_seats):
+    """
+    Armar un venue sintetico de num_seats asientos.
+    Regresa (excel_data, section_mapping, polygons) con el formato de
+    tangamanga_seats.json, SECTION_MAPPING y SECTIONS_POLYGONS; las secciones
+    se acomodan en una cuadricula.
+    """
+    seats_per_section = ROWS_PER_SECTION * SEATS_PER_ROW
+    num_sections = max(1, -(-num_seats // seats_per_section))
+    cols = int(np.ceil(np.sqrt(num_sections)))
+
+    excel_data = {}
+    section_mapping = {}
+    polygons = {}
+    remaining = num_seats
+    for s in range(num_sections):
+        name = f'SECCION {s + 1}'
+        section_id = f'section-bench-{s + 1}'
+        section_mapping[name] = section_id
+        ox = (s % cols) * (SECTION_WIDTH + SECTION_GAP)
+        oy = (s // cols) * (SECTION_HEIGHT + SECTION_GAP)
+        # Trapecio inclinado como las secciones laterales del teatro
+        polygons[section_id] = [
+            {'x': ox + 20.0, 'y': oy},
+            {'x': ox + SECTION_WIDTH - 20.0, 'y': oy + 10.0},
+            {'x': ox + SECTION_WIDTH, 'y': oy + SECTION_HEIGHT},
+            {'x': ox, 'y': oy + SECTION_HEIGHT - 10.0},
+        ]
+
+        filas = []
+        section_seats = min(remaining, seats_per_section)
+        remaining -= section_seats
+        for r in range(ROWS_PER_SECTION):
+            count = min(SEATS_PER_ROW, section_seats - r * SEATS_PER_ROW)
+            if count <= 0:
+                break
+            filas.append({
+                'fila': string.ascii_uppercase[r],
+                'asientos': count,
+                'direccion': 'IZQ A DERECHA',
+                'numeracion': f'1 a {count}',
+                'seat_numbers': list(range(1, count + 1)),
+            })
+        excel_data[name] = {'total': section_seats, 'filas': filas}
+
+    return excel_data, section_mapping, polygons
+
+
+def section_args(excel_data, venue):
+    """Argumentos de generate_seats_in_polygon para cada seccion del venue sintetico"""
+    for idx, (name, section) in enumerate(excel_data.items()):
+        section_id = venue['mapping'][name]
+        yield venue['polygons'][section_id], section['filas'], section_id, name.title(), '#E69E4C', f'S{idx + 1}'
+
+
+def iter_venue_records(excel_data, venue):
+    for args in section_args(excel_data, venue):
+        yield from generator.iter_seats_in_polygon(*args)
+
+
+def current_rss_kb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * resource.getpagesize() // 1024
+
+
+def run_stage(stage, workdir):
+    """Correr una etapa en el proceso actual y regresar sus mediciones"""
+    excel_path = os.path.join(workdir, 'excel.json')
+    venue_path = os.path.join(workdir, 'venue.json')
+    canvas_path = os.path.join(workdir, 'seats_for_canvas.json')
+
+    # Preparacion (no se mide)
+    if stage != 'excel_load':
+        with open(excel_path, 'r', encoding='utf-8') as f:
+            excel_data = json.load(f)
+        with open(venue_path, 'r', encoding='utf-8') as f:
+            venue = json.load(f)
+    if stage in ('sql', 'canvas_json'):
+        records = list(iter_venue_records(excel_data, venue))
+    if stage == 'layout_merge':
+        sections = [{'type': 'Group', '_customType': 'section', 'name': name} for name in excel_data]
+        with open(canvas_path, 'r', encoding='utf-8') as f:
+            old_seats = json.load(f)
+        layout = {'canvas': {'version': '6.9.0', 'objects': sections + old_seats}}
+        del old_seats
+
+    rss_before = current_rss_kb()
+    start = time.perf_counter()
+    seats = 0
+
+    if stage == 'excel_load':
+        with open(excel_path, 'r', encoding='utf-8') as f:
+            excel_data = json.load(f)
+        seats = sum(fila['asientos'] for s in excel_data.values() for fila in s['filas'])
+    elif stage == 'generate':
+        for args in section_args(excel_data, venue):
+            result = generator.generate_seats_in_polygon(*args)
+            seats += len(result[0])
+    elif stage == 'sql':
+        preamble = f"DELETE FROM Seat WHERE venueId = '{generator.VENUE_ID}';\n\n"
+        with SqlInsertSink(os.path.join(workdir, 'insert_seats.sql'), preamble, SEAT_INSERT_HEADER) as sink:
+            for record in records:
+                sink.write(record)
+        seats = sink.count
+    elif stage == 'canvas_json':
+        with JsonArraySink(canvas_path, 'canvas') as sink:
+            for record in records:
+                sink.write(record)
+        seats = sink.count
+    elif stage == 'layout_merge':
+        with open(canvas_path, 'r', encoding='utf-8') as f:
+            new_seats = json.load(f)
+        merge_seats(layout, new_seats)
+        with open(os.path.join(workdir, 'layout_updated.json'), 'w', encoding='utf-8') as f:
+            json.dump(layout, f, ensure_ascii=False)
+        seats = len(new_seats)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'stage': stage,
+        'seats': seats,
+        'wall_s': round(elapsed, 4),
+        'seats_per_s': round(seats / elapsed) if elapsed else None,
+        'rss_before_kb': rss_before,
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def run_in_child(stage, workdir):
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(run_stage, stage, workdir).result()
+
+
+def bench_size(num_seats, stages):
+    excel_data, section_mapping, polygons = build_synthetic_venue(num_seats)
+    with tempfile.TemporaryDirectory(prefix='seat-bench-') as workdir:
+        with open(os.path.join(workdir, 'excel.json'), 'w', encoding='utf-8') as f:
+            json.dump(excel_data, f, indent=2, ensure_ascii=False)
+        with open(os.path.join(workdir, 'venue.json'), 'w', encoding='utf-8') as f:
+            json.dump({'mapping': section_mapping, 'polygons': polygons}, f)
+        del excel_data, section_mapping, polygons
+
+        results = []
+        for stage in STAGES:
+            # layout_merge necesita el JSON del canvas aunque no se mida esa etapa
+            if stage not in stages and not (stage == 'canvas_json' and 'layout_merge' in stages):
+                continue
+            result = run_in_child(stage, workdir)
+            if stage in stages:
+                result['venue_seats'] = num_seats
+                results.append(result)
+                print(f"  {stage:13} {result['wall_s']:9.3f}s  {result['peak_rss_kb'] / 1024:8.1f} MB pico")
+        return results
+
+
+def compare(results, baseline_path, tolerance):
+    """Comparar contra una corrida anterior; regresa la lista de regresiones"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {(r['venue_seats'], r['stage']): r for r in baseline['results']}
+
+    regressions = []
+    for r in results:
+        old = previous.get((r['venue_seats'], r['stage']))
+        if not old:
+            continue
+        for key in ('wall_s', 'peak_rss_kb'):
+            if old[key] and r[key] > old[key] * (1 + tolerance):
+                regressions.append(f"{r['venue_seats']} asientos / {r['stage']}: {key} {old[key]} -> {r[key]}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del pipeline de asientos')
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help='Tamanos de venue separados por coma (default: 1000,10000,100000,500000)')
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help=f'Etapas a medir (default: {",".join(STAGES)})')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT,
+                        help=f'Archivo JSON de resultados (default: {DEFAULT_OUTPUT})')
+    parser.add_argument('--baseline', help='Resultados anteriores para detectar regresiones')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Regresion permitida contra --baseline (default: 0.2 = 20%%)')
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    stages = [s for s in args.stages.split(',') if s]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f'Etapas desconocidas: {", ".join(sorted(unknown))}')
+
+    results = []
+    for num_seats in sizes:
+        print(f'Venue sintetico de {num_seats} asientos')
+        results.extend(bench_size(num_seats, stages))
+
+    report = {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f'Resultados guardados en {args.output}')
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        for line in regressions:
+            print(f'REGRESION {line}')
+        if regressions:
+            sys.exit(1)
+        print('Sin regresiones contra la corrida anterior')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Sobre comprimido para columnas LongText con JSON repetitivo:
+VenueLayout.layoutJson, Venue.layoutJson, LayoutSection.polygonPoints y
+Seat.metadata.
+
+El valor guardado sigue siendo texto:
+
+    ~bz1<codec>:<base64>
+
+  ~bz       prefijo magico (un JSON nunca empieza con '~')
+  1         version del sobre
+  codec     'z' = zlib
+            'd' = zlib con el diccionario SEAT_METADATA_DICT (valores cortos
+                  como Seat.metadata, que solos no se comprimen)
+
+Un valor sin el prefijo es JSON normal, asi que las columnas pueden tener
+valores de ambos tipos mientras corre la migracion (compress_blobs.py). El
+servidor decodifica con src/utils/blobCodec.ts; el diccionario tiene que ser
+identico en los dos lados.
+"""
+
+import base64
+import codecs
+import json
+import zlib
+
+MAGIC = '~bz'
+ENVELOPE_VERSION = '1'
+HEADER_LEN = len(MAGIC) + 3     # '~bz' + version + codec + ':'
+
+# Diccionario v1 para Seat.metadata: llaves y fragmentos comunes de los
+# asientos generados y de las mesas (ver generate_seats_db_v3.py y
+# POST /api/venues/:venueId/tables/generate). No cambiarlo: los valores
+# guardados con codec 'd' dependen de el; un diccionario nuevo va con otro codec.
+SEAT_METADATA_DICT = (
+    b'{"sectionId": "section-", "sectionName": "", "color": "#", '
+    b'"canvas": {"position": {"x": ., "y": .}, "size": {"width": ., "height": .}, '
+    b'"label": "-"}, "tableId": "", "offsetX": , "offsetY": , "angle": , '
+    b'"shape": "circle", "seatType": "standard"}'
+)
+
+CODEC_ZLIB = 'z'
+CODEC_SEAT_DICT = 'd'
+_DICTS = {CODEC_ZLIB: None, CODEC_SEAT_DICT: SEAT_METADATA_DICT}
+
+# Columnas que se comprimen y con que codec
+BLOB_COLUMNS = {
+    ('VenueLayout', 'layoutJson'): CODEC_ZLIB,
+    ('Venue', 'layoutJson'): CODEC_ZLIB,
+    ('LayoutSection', 'polygonPoints'): CODEC_ZLIB,
+    ('Seat', 'metadata'): CODEC_SEAT_DICT,
+}
+
+
+# Condicion SQL para filas con valor comprimido (JSON_SET/JSON_EXTRACT fallan con ellas)
+ENCODED_SQL = "LEFT({column}, 3) = '~bz'"
+
+
+def is_encoded(value):
+    return isinstance(value, str) and value.startswith(MAGIC)
+
+
+def _compressor(codec, level=9):
+    zdict = _DICTS[codec]
+    if zdict is None:
+        return zlib.compressobj(level)
+    return zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS, 9, zlib.Z_DEFAULT_STRATEGY, zdict)
+
+
+def _decompressor(codec):
+    if codec not in _DICTS:
+        raise ValueError(f'Codec de sobre desconocido: {codec!r}')
+    zdict = _DICTS[codec]
+    return zlib.decompressobj() if zdict is None else zlib.decompressobj(zdict=zdict)
+
+
+def encode_blob(text, codec=CODEC_ZLIB, level=9):
+    """
+    Sobre comprimido de text. Si no resulta mas corto que el original se
+    regresa text tal cual (los dos formatos son validos en la columna).
+    """
+    if text is None or is_encoded(text):
+        return text
+    compressor = _compressor(codec, level)
+    body = compressor.compress(text.encode('utf-8')) + compressor.flush()
+    encoded = f'{MAGIC}{ENVELOPE_VERSION}{codec}:' + base64.b64encode(body).decode('ascii')
+    return encoded if len(encoded) < len(text) else text
+
+
+def _parse_header(value):
+    header = value[:HEADER_LEN]
+    if len(header) < HEADER_LEN or header[-1] != ':':
+        raise ValueError(f'Sobre comprimido invalido: {header!r}')
+    if header[len(MAGIC)] != ENVELOPE_VERSION:
+        raise ValueError(f'Version de sobre no soportada: {header[len(MAGIC)]!r}')
+    return header[len(MAGIC) + 1]
+
+
+def decode_blob(value):
+    """Texto JSON de un valor de la columna (comprimido o no); None pasa igual"""
+    if isinstance(value, bytes):
+        value = value.decode('utf-8')
+    if not is_encoded(value):
+        return value
+    decompressor = _decompressor(_parse_header(value))
+    data = decompressor.decompress(base64.b64decode(value[HEADER_LEN:])) + decompressor.flush()
+    return data.decode('utf-8')
+
+
+def decode_chunks(chunks):
+    """
+    Version incremental de decode_blob para un valor leido por pedazos (p. ej.
+    SUBSTRING en layout_stream.py): produce el texto decodificado por pedazos
+    sin juntar el valor completo.
+    """
+    chunks = iter(chunks)
+    head = ''
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= HEADER_LEN or not head.startswith(MAGIC[:len(head)]):
+            break
+    if not is_encoded(head):
+        if head:
+            yield head
+        yield from chunks
+        return
+
+    decompressor = _decompressor(_parse_header(head))
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    pending = head[HEADER_LEN:]
+    for chunk in chunks:
+        pending += chunk
+        usable = len(pending) - len(pending) % 4
+        if usable:
+            data = decompressor.decompress(base64.b64decode(pending[:usable]))
+            pending = pending[usable:]
+            if data:
+                yield text_decoder.decode(data)
+    data = decompressor.decompress(base64.b64decode(pending)) + decompressor.flush()
+    tail = text_decoder.decode(data, final=True)
+    if tail:
+        yield tail
+
+
+def codec_of(value):
+    """Codec de un valor comprimido, o None si es JSON normal"""
+    return _parse_header(value) if is_encoded(value) else None
+
+
+def rewrite_json_blob(value, update):
+    """
+    Modificar el JSON de un valor de la columna con update(obj) y volver a
+    guardarlo con el mismo formato (comprimido con el mismo codec, o no).
+    Para lo que JSON_SET no puede hacer sobre valores comprimidos.
+    """
+    codec = codec_of(value)
+    obj = json.loads(decode_blob(value) or '{}')
+    update(obj)
+    text = json.dumps(obj, ensure_ascii=False)
+    return encode_blob(text, codec) if codec else text
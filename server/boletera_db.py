@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Acceso compartido a la base de datos para las herramientas de Python.
+Pool de conexiones pymysql, consultas parametrizadas, executemany por lotes
+y cursores de streaming del lado del servidor, en lugar de lanzar el CLI de
+mysql con el SQL (o el layoutJson completo) en la linea de comandos.
+
+La configuracion sigue a src/config/env.ts: DB_HOST, DB_PORT, DB_USER,
+DB_PASSWORD y DB_NAME, o en su defecto DATABASE_URL, del entorno o de
+server/.env (como dotenv, sin reemplazar lo que ya esta en el entorno). Sin
+password configurado no se conecta.
+
+Tambien sirve como reemplazo de `mysql -e` en los scripts .sh:
+    python3 boletera_db.py -e "SELECT COUNT(*) FROM Seat"
+    python3 boletera_db.py -f /tmp/insert_seats.sql
+"""
+
+import argparse
+import os
+import queue
+import sys
+import threading
+from contextlib import contextmanager
+from urllib.parse import unquote, urlparse
+
+import pymysql
+import pymysql.cursors
+
+DEFAULT_CONFIG = {
+    'host': 'localhost',
+    'port': 3306,
+    'user': 'boletera_user',
+    'database': 'boletera_db',
+}
+
+ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
+
+BATCH_SIZE = 1000
+
+
+def load_env_file(path=ENV_FILE):
+    """Cargar KEY=VALUE de un .env al entorno sin pisar lo que ya existe (como dotenv)"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#') or '=' not in line:
+                continue
+            key, value = line.split('=', 1)
+            key = key.strip()
+            if key.startswith('export '):
+                key = key[len('export '):].strip()
+            value = value.strip()
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+                value = value[1:-1]
+            os.environ.setdefault(key, value)
+
+
+def load_config():
+    """Configuracion de conexion desde el entorno o server/.env (igual que env.ts)"""
+    load_env_file()
+    config = dict(DEFAULT_CONFIG)
+    url = os.environ.get('DATABASE_URL')
+    if url:
+        parsed = urlparse(url)
+        config.update({
+            'host': parsed.hostname or config['host'],
+            'port': parsed.port or 3306,
+            'user': unquote(parsed.username or config['user']),
+            'password': unquote(parsed.password or ''),
+            'database': parsed.path.lstrip('/') or config['database'],
+        })
+    for key, env_name in (('host', 'DB_HOST'), ('user', 'DB_USER'),
+                          ('password', 'DB_PASSWORD'), ('database', 'DB_NAME')):
+        if os.environ.get(env_name):
+            config[key] = os.environ[env_name]
+    if os.environ.get('DB_PORT'):
+        config['port'] = int(os.environ['DB_PORT'])
+    return config
+
+
+class ConnectionPool:
+    """Pool de conexiones pymysql (sin autocommit; cada escritura hace commit)"""
+
+    def __init__(self, size=4, **config):
+        self.size = size
+        self.config = {**load_config(), 'charset': 'utf8mb4', 'autocommit': False, **config}
+        if not self.config.get('password'):
+            raise RuntimeError(f'Falta el password de la base de datos: definir DB_PASSWORD o DATABASE_URL (entorno o {ENV_FILE})')
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        return pymysql.connect(**self.config)
+
+    def acquire(self, timeout=None):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if self._created < self.size:
+                    self._created += 1
+                    try:
+                        return self._connect()
+                    except Exception:
+                        self._created -= 1
+                        raise
+            conn = self._idle.get(timeout=timeout)
+        conn.ping(reconnect=True)
+        return conn
+
+    def release(self, conn):
+        if conn.open:
+            # No dejar transacciones abiertas en conexiones reutilizadas
+            conn.rollback()
+            self._idle.put(conn)
+        else:
+            with self._lock:
+                self._created -= 1
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Cursor dentro de una transaccion: commit al salir, rollback si hay error"""
+        with self.connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    yield cursor
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def query(self, sql, params=None):
+        with self.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params)
+                return cursor.fetchall()
+
+    def query_dicts(self, sql, params=None):
+        with self.connection() as conn:
+            with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(sql, params)
+                return cursor.fetchall()
+
+    def query_one(self, sql, params=None):
+        with self.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params)
+                return cursor.fetchone()
+
+    def query_value(self, sql, params=None):
+        row = self.query_one(sql, params)
+        return row[0] if row else None
+
+    def execute(self, sql, params=None, cursor=None):
+        """Ejecutar una sentencia; sin cursor corre en su propia transaccion"""
+        if cursor is None:
+            with self.transaction() as cursor:
+                return self.execute(sql, params, cursor)
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+    def executemany(self, sql, rows, batch_size=BATCH_SIZE, cursor=None):
+        """
+        Ejecutar sql para cada fila en lotes de batch_size. pymysql convierte
+        los INSERT ... VALUES en INSERTs de varias filas; cualquier otra
+        sentencia (UPDATE) sigue siendo un viaje por fila, para eso esta
+        update_many. Si no se pasa cursor, todo corre en una sola transaccion.
+        """
+        if cursor is None:
+            with self.transaction() as cursor:
+                return self.executemany(sql, rows, batch_size, cursor)
+        total = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                cursor.executemany(sql, batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+            total += len(batch)
+        return total
+
+    def update_many(self, table, key, columns, rows, extra=(), batch_size=BATCH_SIZE, cursor=None):
+        """
+        UPDATE de muchas filas sin un viaje por fila: rows son tuplas
+        (*columns, key) que se cargan con INSERTs de varias filas a una tabla
+        temporal (con los tipos de table) y se aplican con un solo UPDATE
+        unido. extra son asignaciones fijas sobre t, p. ej. 't.updatedAt =
+        NOW()'. Regresa cuantas filas se cargaron.
+        """
+        if cursor is None:
+            with self.transaction() as cursor:
+                return self.update_many(table, key, columns, rows, extra, batch_size, cursor)
+        tmp = f'tmp_update_{table}'
+        names = ', '.join((*columns, key))
+        cursor.execute(f'CREATE TEMPORARY TABLE {tmp} SELECT {names} FROM {table} LIMIT 0')
+        cursor.execute(f'ALTER TABLE {tmp} ADD PRIMARY KEY ({key})')
+        try:
+            placeholders = ', '.join(['%s'] * (len(columns) + 1))
+            total = self.executemany(f'INSERT INTO {tmp} ({names}) VALUES ({placeholders})', rows, batch_size, cursor)
+            assignments = ', '.join([f't.{column} = u.{column}' for column in columns] + list(extra))
+            cursor.execute(f'UPDATE {table} t JOIN {tmp} u ON u.{key} = t.{key} SET {assignments}')
+        finally:
+            cursor.execute(f'DROP TEMPORARY TABLE {tmp}')
+        return total
+
+    def stream(self, sql, params=None, batch_size=BATCH_SIZE, dicts=False):
+        """
+        Iterar las filas con un cursor del lado del servidor (SSCursor): no se
+        cargan todas en memoria. La conexion queda ocupada hasta terminar.
+        """
+        cursor_class = pymysql.cursors.SSDictCursor if dicts else pymysql.cursors.SSCursor
+        with self.connection() as conn:
+            with conn.cursor(cursor_class) as cursor:
+                cursor.execute(sql, params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield from rows
+
+    def close(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+
+_pools = {}
+
+
+def get_pool(size=4, **config):
+    """Pool compartido por configuracion (p. ej. get_pool(host='...') para otro servidor)"""
+    key = tuple(sorted(config.items()))
+    if key not in _pools:
+        _pools[key] = ConnectionPool(size, **config)
+    return _pools[key]
+
+
+def iter_sql_file(path):
+    """
+    Sentencias de un archivo .sql como los que escriben los generadores
+    (cada sentencia termina en ';' al final de una linea).
+    """
+    statement = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            stripped = line.strip()
+            if not statement and (not stripped or stripped.startswith('--')):
+                continue
+            statement.append(line)
+            if stripped.endswith(';'):
+                yield ''.join(statement).strip().rstrip(';')
+                statement = []
+    if statement and ''.join(statement).strip():
+        yield ''.join(statement).strip().rstrip(';')
+
+
+def print_result(cursor, headers=True):
+    """Imprimir el resultado como `mysql -e` en modo batch (separado por tabs)"""
+    if cursor.description is None:
+        return
+    if headers:
+        print('\t'.join(col[0] for col in cursor.description))
+    for row in cursor.fetchall():
+        print('\t'.join('NULL' if value is None else str(value) for value in row))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ejecutar SQL con el pool compartido (reemplazo de mysql -e)')
+    parser.add_argument('-e', dest='steps', action='append', type=lambda s: ('sql', s),
+                        help='Sentencia SQL a ejecutar (se puede repetir)')
+    parser.add_argument('-f', dest='steps', action='append', type=lambda s: ('file', s),
+                        help='Archivo .sql a ejecutar (se puede repetir)')
+    parser.add_argument('-N', dest='headers', action='store_false',
+                        help='No imprimir los nombres de columna')
+    args = parser.parse_args()
+
+    if not args.steps:
+        parser.error('Indica al menos una sentencia (-e) o un archivo (-f)')
+
+    pool = get_pool(size=1)
+    try:
+        with pool.transaction() as cursor:
+            for kind, value in args.steps:
+                statements = [value] if kind == 'sql' else iter_sql_file(value)
+                for statement in statements:
+                    cursor.execute(statement)
+                    print_result(cursor, args.headers)
+    except pymysql.err.MySQLError as e:
+        print(f'Error: {e}', file=sys.stderr)
+        sys.exit(1)
+    finally:
+        pool.close()
+
+
+if __name__ == '__main__':
+    main()
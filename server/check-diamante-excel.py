@@ -1,44 +1,28 @@
-import pandas as pd
+from excel_zoning import fila_key, parse_zoning, sheet_rows
 
 excel_path = r'C:\Users\Alecs\Desktop\FINAL CON ZONA DIAMANTE DE TEATRO DE LA CIUDAD TANGAMANGA 1.xlsx'
-df = pd.read_excel(excel_path, sheet_name='FINAL')
+rows = sheet_rows(excel_path, 'FINAL')
+sections = parse_zoning(excel_path, 'final', sheet='FINAL')
 
-print('Columnas del Excel:', df.columns.tolist())
+print('Columnas del Excel:', rows[0] if rows else [])
 print('Primeras filas:')
-print(df.head(10))
+for row in rows[1:11]:
+    print(row)
 print('\n=== DIAMANTE EN EXCEL ===\n')
-
-# Buscar columna de sección
-seccion_col = None
-for col in df.columns:
-    if 'SECC' in str(col).upper() or 'ZONA' in str(col).upper():
-        seccion_col = col
-        break
-
-if not seccion_col:
-    seccion_col = df.columns[0]
-print(f'Columna de sección: {seccion_col}')
-print(f'Valores únicos: {df[seccion_col].unique()}')
+print(f'Valores únicos de SECCION: {list(sections)}')
 
 for seccion in ['DIAMANTE IZQUIERDA', 'DIAMANTE CENTRAL', 'DIAMANTE DERECHA']:
     print(f'\n=== {seccion} ===')
-    data = df[df['SECCION'] == seccion].copy()
-    
-    if len(data) == 0:
+    data = sections.get(seccion)
+
+    if not data:
         print('  NO ENCONTRADA')
         continue
-    
-    print(f'Total asientos: {len(data)}')
-    print(f'Columnas: {data.columns.tolist()}')
-    
-    # Agrupar por fila
-    grouped = data.groupby('FILA').agg({
-        'NUMERO': ['count', 'min', 'max', list]
-    }).reset_index()
-    grouped.columns = ['Fila', 'Cantidad', 'Min', 'Max', 'Numeros']
-    
-    for _, row in grouped.iterrows():
-        nums = sorted(row['Numeros'])
-        print(f"  Fila {row['Fila']}: {row['Cantidad']} asientos, números {int(row['Min'])}-{int(row['Max'])}")
+
+    print(f"Total asientos: {data['total']}")
+
+    for fila in sorted(data['filas'], key=lambda f: fila_key(f['fila'])):
+        nums = fila['seat_numbers']
+        print(f"  Fila {fila['fila']}: {fila['asientos']} asientos, números {min(nums)}-{max(nums)}")
         print(f"    Primeros 5: {nums[:5]}")
         print(f"    Últimos 5: {nums[-5:]}")
@@ -1,38 +1,26 @@
-import pandas as pd
+from excel_zoning import find_cells, sheet_rows
 
 excel_path = r"C:\Users\Alecs\Desktop\FINAL CON ZONA DIAMANTE DE TEATRO DE LA CIUDAD TANGAMANGA 1.xlsx"
-df = pd.read_excel(excel_path, header=None)
+rows = sheet_rows(excel_path)
 
 print("=== PREFERENTE CENTRAL - EXCEL ===\n")
 
 # Buscar PREFERENTE CENTRAL
-found = False
-for row_idx in range(len(df)):
-    for col_idx in range(len(df.columns)):
-        cell = df.iloc[row_idx, col_idx]
-        if pd.notna(cell) and 'PREFERENTE CENTRAL' in str(cell).upper():
-            print(f"Encontrado en fila {row_idx}, columna {col_idx}")
-            print(f"Valor: {cell}\n")
-            
-            # Mostrar las siguientes 25 filas para ver la estructura
-            print("Datos crudos (siguientes 25 filas):")
-            for i in range(row_idx + 1, min(row_idx + 26, len(df))):
-                row_data = df.iloc[i, col_idx:col_idx+6].tolist()
-                # Limpiar NaN
-                row_clean = [str(x) if pd.notna(x) else '' for x in row_data]
-                if any(row_clean):
-                    print(f"  Row {i}: {row_clean}")
-            
-            found = True
-            break
-    if found:
-        break
+matches = find_cells(rows, 'PREFERENTE CENTRAL')
+if matches:
+    row_idx, col_idx, cell = matches[0]
+    print(f"Encontrado en fila {row_idx}, columna {col_idx}")
+    print(f"Valor: {cell}\n")
 
-if not found:
+    # Mostrar las siguientes 25 filas para ver la estructura
+    print("Datos crudos (siguientes 25 filas):")
+    for i in range(row_idx + 1, min(row_idx + 26, len(rows))):
+        row_data = (rows[i] + [None] * (col_idx + 6))[col_idx:col_idx + 6]
+        row_clean = [str(x) if x is not None else '' for x in row_data]
+        if any(row_clean):
+            print(f"  Row {i}: {row_clean}")
+else:
     print("No se encontró PREFERENTE CENTRAL")
     print("\nBuscando todas las secciones PREFERENTE...")
-    for row_idx in range(len(df)):
-        for col_idx in range(len(df.columns)):
-            cell = df.iloc[row_idx, col_idx]
-            if pd.notna(cell) and 'PREFERENTE' in str(cell).upper():
-                print(f"  Fila {row_idx}, Col {col_idx}: {cell}")
+    for row_idx, col_idx, cell in find_cells(rows, 'PREFERENTE'):
+        print(f"  Fila {row_idx}, Col {col_idx}: {cell}")
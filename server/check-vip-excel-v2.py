@@ -1,22 +1,19 @@
-import pandas as pd
+from excel_zoning import sheet_rows
 
 excel_path = r'C:\Users\Alecs\Desktop\FINAL CON ZONA DIAMANTE DE TEATRO DE LA CIUDAD TANGAMANGA 1.xlsx'
-df = pd.read_excel(excel_path, sheet_name='FINAL', header=None)
+rows = sheet_rows(excel_path, 'FINAL')
 
 # Buscar VIP en el Excel
 print('=== BUSCANDO VIP EN EXCEL ===\n')
 
-for idx in range(len(df)):
-    row = df.iloc[idx]
-    values = [str(x) for x in row.values if pd.notna(x) and str(x) != 'nan']
+for idx, row in enumerate(rows):
+    values = [str(x) for x in row if x is not None]
     row_str = ' '.join(values)
     if 'VIP' in row_str.upper() and 'TOTAL' in row_str.upper():
         print(f'\n--- Fila {idx} (encabezado) ---')
         print(row_str[:300])
         # Mostrar las siguientes filas
-        for i in range(1, 8):
-            if idx + i < len(df):
-                next_row = df.iloc[idx + i]
-                next_values = [str(x) for x in next_row.values if pd.notna(x) and str(x) != 'nan']
-                if next_values:
-                    print(f'Fila {idx+i}: {" | ".join(next_values)}')
+        for i in range(idx + 1, min(idx + 8, len(rows))):
+            next_values = [str(x) for x in rows[i] if x is not None]
+            if next_values:
+                print(f'Fila {i}: {" | ".join(next_values)}')
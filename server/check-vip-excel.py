@@ -1,18 +1,14 @@
-import pandas as pd
+from excel_zoning import fila_key, parse_zoning
 
 excel_path = r'C:\Users\Alecs\Desktop\FINAL CON ZONA DIAMANTE DE TEATRO DE LA CIUDAD TANGAMANGA 1.xlsx'
-df = pd.read_excel(excel_path, sheet_name='FINAL')
+sections = parse_zoning(excel_path, 'final', sheet='FINAL')
 
 for seccion in ['VIP DERECHA', 'VIP CENTRAL', 'VIP IZQUIERDA']:
     print(f'\n=== {seccion} (Excel) ===')
-    vip = df[df['SECCION'] == seccion].copy()
-    vip_grouped = vip.groupby('FILA').agg({
-        'NUMERO': ['count', 'min', 'max']
-    }).reset_index()
-    vip_grouped.columns = ['Fila', 'Cantidad', 'Min', 'Max']
-    vip_grouped = vip_grouped.sort_values('Fila', ascending=False)
+    filas = sorted(sections.get(seccion, {}).get('filas', []), key=lambda f: fila_key(f['fila']), reverse=True)
     total = 0
-    for _, row in vip_grouped.iterrows():
-        print(f"Fila {row['Fila']}: {row['Cantidad']} asientos ({int(row['Min'])}-{int(row['Max'])})")
-        total += row['Cantidad']
+    for fila in filas:
+        nums = fila['seat_numbers']
+        print(f"Fila {fila['fila']}: {fila['asientos']} asientos ({min(nums)}-{max(nums)})")
+        total += fila['asientos']
     print(f'TOTAL {seccion}: {total}')
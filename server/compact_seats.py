@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Codificacion compacta de asientos en layoutJson.
+
+Cada asiento en canvas.objects es un Circle de Fabric.js con ~25 llaves, casi
+todas iguales entre asientos. La forma compacta guarda todos los asientos
+en un solo objeto de canvas.objects:
+
+    {
+      "_customType": "compactSeats",
+      "format": 1,
+      "keys": [...],              orden de llaves de cada asiento
+      "template": {...},          llaves comunes (version, originX, stroke, ...)
+      "sections": [               tramos consecutivos de una misma seccion
+        {"sectionId", "section", "fill", "count",
+         "left": [...], "top": [...], "radius": [...], "row": [...],
+         "number": [...], "seatId": [...], "status": [...],
+         "seatIdPrefix": "seat-section-...-"}
+      ],
+      "overrides": {"<indice>": {llave: valor}},   solo si algun asiento difiere
+      "missing": {"<indice>": [llaves]}
+    }
+
+Una columna con el mismo valor en todo el tramo se guarda como escalar, y
+seatId se guarda sin el prefijo comun del tramo (seatIdPrefix). width y
+height se derivan de radius * 2. La decodificacion regresa
+exactamente los mismos objetos, en el mismo orden. El servidor expande el
+bloque al leer el layout (src/utils/layoutJson.ts).
+
+Uso:
+    python3 compact_seats.py encode layout.json layout_compact.json
+    python3 compact_seats.py decode layout_compact.json layout.json
+"""
+
+import json
+import sys
+
+COMPACT_TYPE = 'compactSeats'
+COMPACT_FORMAT = 1
+
+# Columnas por asiento y llaves por tramo de seccion
+COLUMNS = ('left', 'top', 'radius', 'row', 'number', 'seatId', 'status')
+SECTION_KEYS = ('sectionId', 'section', 'fill')
+DERIVED = ('width', 'height')
+
+
+def is_compact_block(obj):
+    return isinstance(obj, dict) and obj.get('_customType') == COMPACT_TYPE
+
+
+def seat_count(obj):
+    """Asientos que representa un objeto de canvas.objects (0, 1 o los de un bloque)"""
+    if is_compact_block(obj):
+        return sum(section['count'] for section in obj['sections'])
+    return 1 if isinstance(obj, dict) and obj.get('_customType') == 'seat' else 0
+
+
+def _same(a, b):
+    # 1 == 1.0 == True en Python, pero no en JSON
+    return type(a) is type(b) and a == b
+
+
+class CompactSeatsEncoder:
+    """Acumula asientos (objetos Circle) y arma el bloque compacto"""
+
+    def __init__(self):
+        self.keys = None
+        self.template = None
+        self.sections = []
+        self.overrides = {}
+        self.missing = {}
+        self.count = 0
+
+    def add(self, seat):
+        if self.keys is None:
+            self.keys = list(seat)
+            self.template = {k: v for k, v in seat.items()
+                             if k not in COLUMNS and k not in SECTION_KEYS and k not in DERIVED}
+
+        section_values = tuple(seat.get(k) for k in SECTION_KEYS)
+        current = self.sections[-1] if self.sections else None
+        if current is None or tuple(current[k] for k in SECTION_KEYS) != section_values:
+            current = dict(zip(SECTION_KEYS, section_values))
+            current.update({column: [] for column in COLUMNS})
+            self.sections.append(current)
+        for column in COLUMNS:
+            current[column].append(seat.get(column))
+
+        # Lo que la decodificacion no reproduce queda como excepcion
+        expected = _build_seat(self.keys, self.template, current, len(current['left']) - 1)
+        extra = {k: v for k, v in seat.items() if k not in expected or not _same(expected[k], v)}
+        if extra:
+            self.overrides[str(self.count)] = extra
+        missing = [k for k in expected if k not in seat]
+        if missing:
+            self.missing[str(self.count)] = missing
+        self.count += 1
+
+    def block(self):
+        block = {
+            '_customType': COMPACT_TYPE,
+            'format': COMPACT_FORMAT,
+            'keys': self.keys or [],
+            'template': self.template or {},
+            'sections': [_pack_section(section) for section in self.sections],
+        }
+        if self.overrides:
+            block['overrides'] = self.overrides
+        if self.missing:
+            block['missing'] = self.missing
+        return block
+
+
+def _pack_section(section):
+    """Columnas constantes como escalar y seatId sin prefijo comun"""
+    packed = {k: section[k] for k in SECTION_KEYS}
+    packed['count'] = len(section['left'])
+    for column in COLUMNS:
+        values = section[column]
+        first = values[0]
+        if all(_same(first, value) for value in values) and not isinstance(first, list):
+            packed[column] = first
+        else:
+            packed[column] = values
+
+    ids = section['seatId']
+    if isinstance(packed['seatId'], list) and all(isinstance(i, str) for i in ids):
+        prefix = ids[0]
+        for seat_id in ids[1:]:
+            while not seat_id.startswith(prefix):
+                prefix = prefix[:-1]
+        # Dejar al menos un caracter propio en cada id
+        prefix = prefix[:min(len(prefix), min(len(i) for i in ids) - 1)]
+        if prefix:
+            packed['seatIdPrefix'] = prefix
+            packed['seatId'] = [seat_id[len(prefix):] for seat_id in ids]
+    return packed
+
+
+def _unpack_section(section):
+    count = section['count']
+    unpacked = {k: section.get(k) for k in SECTION_KEYS}
+    for column in COLUMNS:
+        values = section.get(column)
+        unpacked[column] = values if isinstance(values, list) else [values] * count
+    prefix = section.get('seatIdPrefix')
+    if prefix:
+        unpacked['seatId'] = [prefix + seat_id for seat_id in unpacked['seatId']]
+    return unpacked
+
+
+def _build_seat(keys, template, section, i):
+    seat = {}
+    for key in keys:
+        if key in COLUMNS:
+            seat[key] = section[key][i]
+        elif key in SECTION_KEYS:
+            seat[key] = section[key]
+        elif key in DERIVED:
+            radius = section['radius'][i]
+            seat[key] = radius * 2 if isinstance(radius, (int, float)) else None
+        else:
+            seat[key] = template.get(key)
+    return seat
+
+
+def encode_seats(seats):
+    encoder = CompactSeatsEncoder()
+    for seat in seats:
+        encoder.add(seat)
+    return encoder.block()
+
+
+def decode_block(block):
+    """Asientos (objetos Circle) de un bloque compacto, en orden"""
+    if block.get('format') != COMPACT_FORMAT:
+        raise ValueError(f"Formato de compactSeats no soportado: {block.get('format')}")
+    keys = block['keys']
+    template = block['template']
+    overrides = block.get('overrides', {})
+    missing = block.get('missing', {})
+    index = 0
+    for packed in block['sections']:
+        section = _unpack_section(packed)
+        for i in range(packed['count']):
+            seat = _build_seat(keys, template, section, i)
+            extra = overrides.get(str(index))
+            if extra:
+                seat.update(extra)
+            for key in missing.get(str(index), ()):
+                seat.pop(key, None)
+            yield seat
+            index += 1
+
+
+def expand_objects(objects):
+    """canvas.objects con los bloques compactos expandidos a Circles"""
+    for obj in objects:
+        if is_compact_block(obj):
+            yield from decode_block(obj)
+        else:
+            yield obj
+
+
+def encode_objects(objects):
+    """
+    canvas.objects con todos los asientos en un bloque compacto, ubicado
+    donde estaba el primer asiento (los generadores los ponen juntos al final).
+    """
+    encoder = CompactSeatsEncoder()
+    result = []
+    position = None
+    for obj in expand_objects(objects):
+        if isinstance(obj, dict) and obj.get('_customType') == 'seat':
+            if position is None:
+                position = len(result)
+            encoder.add(obj)
+        else:
+            result.append(obj)
+    if encoder.count:
+        result.insert(position, encoder.block())
+    return result
+
+
+def encode_layout(layout):
+    canvas = layout.get('canvas', {})
+    canvas['objects'] = encode_objects(canvas.get('objects', []))
+    return layout
+
+
+def decode_layout(layout):
+    canvas = layout.get('canvas', {})
+    if any(is_compact_block(obj) for obj in canvas.get('objects', [])):
+        canvas['objects'] = list(expand_objects(canvas['objects']))
+    return layout
+
+
+def main():
+    if len(sys.argv) != 4 or sys.argv[1] not in ('encode', 'decode'):
+        print('Uso: python3 compact_seats.py encode|decode <entrada.json> <salida.json>')
+        return
+
+    with open(sys.argv[2], 'r', encoding='utf-8') as f:
+        layout = json.load(f)
+    if sys.argv[1] == 'encode':
+        encode_layout(layout)
+    else:
+        decode_layout(layout)
+    with open(sys.argv[3], 'w', encoding='utf-8') as f:
+        json.dump(layout, f, ensure_ascii=False)
+    print(f'Layout guardado en {sys.argv[3]}')
+
+
+if __name__ == '__main__':
+    main()
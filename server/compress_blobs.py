@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Comprimir (o descomprimir) los valores existentes de las columnas de
+blob_codec.BLOB_COLUMNS al sobre ~bz1 (ver blob_codec.py).
+
+Recorre cada tabla por rangos de id en lotes pequenos, cada lote en su propia
+transaccion, igual que backfill_seat_columns.py. Cada UPDATE solo aplica si
+el valor no cambio desde que se leyo (SHA2), asi que se puede correr con el
+sistema en linea y volver a correr: los valores ya comprimidos se saltan.
+
+Antes de comprimir Seat.metadata se copia metadata.tableId a la columna
+Seat.tableId (las rutas de mesas filtran por la columna; JSON_EXTRACT no
+puede leer un valor comprimido).
+
+    python3 compress_blobs.py --dry-run
+    python3 compress_blobs.py --column VenueLayout.layoutJson --column Venue.layoutJson
+    python3 compress_blobs.py --decompress
+"""
+
+import argparse
+import hashlib
+import time
+
+from blob_codec import BLOB_COLUMNS, ENCODED_SQL, decode_blob, encode_blob
+from boletera_db import get_pool
+
+# Los layouts pesan megas; los asientos unos cientos de bytes
+CHUNK_SIZES = {'VenueLayout': 20, 'Venue': 20, 'LayoutSection': 500, 'Seat': 2000}
+
+
+def iter_chunks(db, table, column, decompress, chunk_size):
+    """Lotes de (id, valor) pendientes en orden de id"""
+    condition = ENCODED_SQL.format(column=column)
+    if not decompress:
+        condition = f'NOT {condition}'
+    sql = (f'SELECT id, {column} FROM {table} '
+           f'WHERE id > %s AND {column} IS NOT NULL AND {condition} ORDER BY id LIMIT %s')
+    last_id = ''
+    while True:
+        rows = db.query(sql, (last_id, chunk_size))
+        if not rows:
+            break
+        yield rows
+        last_id = rows[-1][0]
+
+
+def backfill_table_ids(db):
+    """Seat.tableId desde metadata.tableId, mientras metadata aun es JSON"""
+    # CASE para no evaluar ->> sobre valores comprimidos o invalidos
+    return db.execute(f"""
+        UPDATE Seat s
+        JOIN VenueTable t ON t.id = CASE
+            WHEN {ENCODED_SQL.format(column='s.metadata')} OR NOT JSON_VALID(s.metadata) THEN NULL
+            ELSE s.metadata->>'$.tableId' END
+        SET s.tableId = t.id
+        WHERE s.tableId IS NULL AND s.metadata IS NOT NULL
+    """)
+
+
+def convert_column(db, table, column, codec, decompress=False, dry_run=False,
+                   chunk_size=None, pause=0.0):
+    """Regresa (valores cambiados, caracteres antes, caracteres despues)"""
+    update_sql = f'UPDATE {table} SET {column} = %s WHERE id = %s AND SHA2({column}, 256) = %s'
+    changed = before = after = 0
+    for rows in iter_chunks(db, table, column, decompress, chunk_size or CHUNK_SIZES[table]):
+        updates = []
+        for row_id, value in rows:
+            new_value = decode_blob(value) if decompress else encode_blob(value, codec)
+            before += len(value)
+            after += len(new_value)
+            if new_value != value:
+                updates.append((new_value, row_id, hashlib.sha256(value.encode('utf-8')).hexdigest()))
+        if not dry_run and updates:
+            db.executemany(update_sql, updates)
+        changed += len(updates)
+        print(f'  {table}.{column}: {changed} valores, {before:,} -> {after:,} caracteres (hasta {rows[-1][0]})')
+        if pause:
+            time.sleep(pause)
+    return changed, before, after
+
+
+def main():
+    names = [f'{table}.{column}' for table, column in BLOB_COLUMNS]
+    parser = argparse.ArgumentParser(description='Comprimir layoutJson, polygonPoints y Seat.metadata existentes')
+    parser.add_argument('--column', action='append', choices=names,
+                        help='Columna a convertir (se puede repetir; default: todas)')
+    parser.add_argument('--decompress', action='store_true', help='Regresar los valores a JSON normal')
+    parser.add_argument('--dry-run', action='store_true', help='Solo medir, sin escribir')
+    parser.add_argument('--chunk-size', type=int, help='Filas por transaccion (default: segun la tabla)')
+    parser.add_argument('--pause', type=float, default=0.0,
+                        help='Segundos de espera entre lotes para reducir la carga')
+    args = parser.parse_args()
+
+    db = get_pool(size=1)
+    for name in args.column or names:
+        table, column = name.split('.')
+        if table == 'Seat' and not args.decompress and not args.dry_run:
+            print(f'Seat.tableId copiado desde metadata: {backfill_table_ids(db)}')
+        changed, before, after = convert_column(
+            db, table, column, BLOB_COLUMNS[(table, column)],
+            args.decompress, args.dry_run, args.chunk_size, args.pause
+        )
+        ratio = before / after if after else 1
+        print(f'{name}: {changed} valores convertidos, {before:,} -> {after:,} caracteres ({ratio:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
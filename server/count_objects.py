@@ -1,17 +1,21 @@
 #!/usr/bin/env python3
 import json
-import subprocess
+
+from blob_codec import decode_blob
+from boletera_db import get_pool
+from compact_seats import decode_layout, is_compact_block
 
 LAYOUT_ID = 'ad44b249-13ad-4c51-b1ff-f73ce9b80c9b'
 
-result = subprocess.run([
-    'mysql', '-u', 'boletera_user', '-pCer0un0cer0.com20182417', 
-    'boletera_db', '-N', '-e',
-    f"SELECT layoutJson FROM VenueLayout WHERE id = '{LAYOUT_ID}'"
-], capture_output=True, text=True)
+layout_json_str = get_pool().query_value(
+    'SELECT layoutJson FROM VenueLayout WHERE id = %s', (LAYOUT_ID,)
+)
+layout = json.loads(decode_blob(layout_json_str))
 
-layout_json_str = result.stdout.strip()
-layout = json.loads(layout_json_str)
+blocks = [obj for obj in layout.get('canvas', {}).get('objects', []) if is_compact_block(obj)]
+if blocks:
+    print('Bloques compactSeats:', len(blocks))
+    decode_layout(layout)
 
 # Verificar estructura
 print('Keys:', list(layout.keys()))
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Lector unico del Excel de zonificacion (tangamanga.xlsx y el "FINAL CON ZONA
+DIAMANTE..."), en modo read_only de openpyxl: las filas se leen una por una
+sin cargar el libro completo en memoria.
+
+El resultado se guarda en CACHE_DIR con llave sha256 del contenido del
+archivo + esquema + hoja, asi que volver a validar contra el mismo libro solo
+cuesta leer un JSON.
+
+Esquemas (todos regresan {seccion: {'total': n, 'filas': [...]}} con filas
+{'fila', 'asientos', 'direccion', 'seat_numbers'}):
+
+  vertical   hoja VERTICAL: B=ZONA ("SECC. ..."), C=TOTAL, D=FILA,
+             E=NO.ASIENTOS, F=DIRECCION, G=NUMERACION ("1 a 22")
+  final      hoja FINAL: un renglon por asiento con encabezados SECCION,
+             FILA y NUMERO; las filas salen en orden numerico (fila_key)
+  sheets     una seccion por hoja: A=fila, B=asientos, C..=numeros de butaca
+
+Para buscar texto en la hoja cruda (lo que hacian los check-*-excel.py con
+pd.read_excel(header=None)) estan sheet_rows() y find_cells().
+
+    python3 excel_zoning.py /tmp/tangamanga.xlsx --output /tmp/tangamanga_seats.json
+    python3 excel_zoning.py libro.xlsx --schema final --sheet FINAL
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+
+from file_cache import atomic_write, file_sha256
+
+# Subir al cambiar el formato de lo que se guarda en cache
+PARSER_VERSION = 2
+CACHE_DIR = os.environ.get('EXCEL_CACHE_DIR', '/tmp/excel_zoning_cache')
+DEFAULT_DIRECTION = 'IZQ A DERECHA'
+
+# Columnas (base 0) de la hoja VERTICAL
+VERTICAL_COLUMNS = {'zona': 1, 'total': 2, 'fila': 3, 'asientos': 4, 'direccion': 5, 'numeracion': 6}
+
+_RANGE_RE = re.compile(r'(\d+)\s*a\s*(\d+)')
+
+
+def _load_cached(key, build, use_cache=True, cache_dir=None):
+    """Regresar lo guardado bajo key, o construirlo con build() y guardarlo"""
+    cache_dir = cache_dir or CACHE_DIR
+    path = os.path.join(cache_dir, f'{key}.json')
+    if use_cache and os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    data = build()
+    if use_cache:
+        os.makedirs(cache_dir, exist_ok=True)
+        with atomic_write(path) as f:
+            json.dump(data, f, ensure_ascii=False, default=str)
+        # Lo que regresa debe ser igual a lo que se lee de cache
+        data = json.loads(json.dumps(data, ensure_ascii=False, default=str))
+    return data
+
+
+def _cache_key(path, schema, sheet):
+    sheet_part = hashlib.sha1(str(sheet).encode('utf-8')).hexdigest()[:8]
+    return f'{file_sha256(path)[:32]}-{schema}-{sheet_part}-v{PARSER_VERSION}'
+
+
+# ---------------------------------------------------------------------------
+# Lectura por filas
+# ---------------------------------------------------------------------------
+
+def iter_sheet_rows(path, sheet=None, min_row=1):
+    """Tuplas de valores de una hoja (sheet=None es la primera), en read_only"""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if sheet else wb.worksheets[0]
+        for row in ws.iter_rows(min_row=min_row, values_only=True):
+            yield row
+    finally:
+        wb.close()
+
+
+def sheet_names(path):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
+
+
+def _trim(row):
+    row = list(row)
+    while row and row[-1] is None:
+        row.pop()
+    return row
+
+
+def sheet_rows(path, sheet=None, use_cache=True, cache_dir=None):
+    """
+    Todas las filas de la hoja como listas (sin las celdas vacias del final);
+    el indice es la fila de Excel - 1, igual que pd.read_excel(header=None).
+    """
+    return _load_cached(
+        _cache_key(path, 'rows', sheet),
+        lambda: [_trim(row) for row in iter_sheet_rows(path, sheet)],
+        use_cache, cache_dir
+    )
+
+
+def find_cells(rows, text):
+    """(fila, columna, valor) de las celdas que contienen text (sin mayusculas)"""
+    text = text.upper()
+    return [(i, j, cell) for i, row in enumerate(rows) for j, cell in enumerate(row)
+            if cell is not None and text in str(cell).upper()]
+
+
+# ---------------------------------------------------------------------------
+# Esquemas
+# ---------------------------------------------------------------------------
+
+def seat_numbers_for(asientos, direccion, numeracion, authority='count'):
+    """
+    Numeros de butaca de una fila en orden de dibujo (de izquierda a derecha).
+
+    authority='count': NO.ASIENTOS manda; la numeracion solo da el inicio y
+    el sentido ("37 a 23" baja desde 37). authority='range': la numeracion
+    manda aunque no coincida con NO.ASIENTOS (lectura original).
+    """
+    match = _RANGE_RE.search(str(numeracion or ''))
+    if not match:
+        numbers = list(range(1, asientos + 1))
+    else:
+        start, end = int(match.group(1)), int(match.group(2))
+        if authority == 'range':
+            numbers = list(range(start, end + 1))
+        elif start <= end:
+            numbers = list(range(start, start + asientos))
+        else:
+            numbers = list(range(start, start - asientos, -1))
+    # Misma prueba que parse_excel_v2.py (los generate_seats_db_* dependen de este orden)
+    direccion = str(direccion or '').upper()
+    if 'DERECHA' in direccion and 'IZQ' in direccion:
+        numbers.reverse()
+    return numbers
+
+
+def _int(value):
+    try:
+        return int(value) if value not in (None, '') else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+def fila_key(fila):
+    """Llave para ordenar filas: numericas por valor (2 antes de 10), luego las de texto"""
+    try:
+        return (0, float(str(fila).strip()), '')
+    except ValueError:
+        return (1, 0.0, str(fila))
+
+
+def _parse_vertical(rows, authority):
+    c = VERTICAL_COLUMNS
+    sections = OrderedDict()
+    current = None
+    for row in rows:
+        row = tuple(row) + (None,) * (c['numeracion'] + 1 - len(row))
+        zona = row[c['zona']]
+        if zona and 'SECC.' in str(zona):
+            name = str(zona).replace('SECC. ', '').replace('SECC.', '').strip()
+            current = sections.setdefault(name, {'total': _int(row[c['total']]), 'filas': []})
+        elif current is None:
+            continue
+        if row[c['fila']] is None:
+            continue
+        asientos = _int(row[c['asientos']])
+        # La primera fila de la seccion va aunque diga 0 asientos (asi la leian los scripts)
+        if asientos <= 0 and current['filas']:
+            continue
+        direccion = str(row[c['direccion']]) if row[c['direccion']] else DEFAULT_DIRECTION
+        current['filas'].append({
+            'fila': row[c['fila']],
+            'asientos': asientos,
+            'direccion': direccion,
+            'seat_numbers': seat_numbers_for(asientos, direccion, row[c['numeracion']], authority),
+        })
+    return OrderedDict((name, data) for name, data in sections.items() if data['filas'])
+
+
+def _parse_final(rows):
+    rows = iter(rows)
+    header = [str(cell).strip().upper() if cell is not None else '' for cell in next(rows, ())]
+    try:
+        col_section, col_row, col_number = (header.index(name) for name in ('SECCION', 'FILA', 'NUMERO'))
+    except ValueError:
+        raise ValueError(f'La hoja no tiene encabezados SECCION, FILA y NUMERO: {header}')
+
+    grouped = OrderedDict()
+    width = max(col_section, col_row, col_number) + 1
+    for row in rows:
+        row = tuple(row) + (None,) * (width - len(row))
+        section, fila, number = row[col_section], row[col_row], row[col_number]
+        if section is None or fila is None or number is None:
+            continue
+        grouped.setdefault(str(section).strip(), OrderedDict()).setdefault(fila, []).append(_int(number))
+
+    sections = OrderedDict()
+    for name, filas in grouped.items():
+        sections[name] = {
+            'total': sum(len(numbers) for numbers in filas.values()),
+            'filas': [{'fila': fila, 'asientos': len(numbers), 'direccion': DEFAULT_DIRECTION,
+                       'seat_numbers': sorted(numbers)}
+                      for fila, numbers in sorted(filas.items(), key=lambda item: fila_key(item[0]))],
+        }
+    return sections
+
+
+def _parse_sheet(rows):
+    filas = []
+    for row in rows:
+        if not row or row[0] is None:
+            continue
+        asientos = _int(row[1]) if len(row) > 1 else 0
+        if asientos <= 0:
+            continue
+        numbers = [n for n in (_int(cell) if isinstance(cell, (int, float, str)) else None
+                               for cell in row[2:] if cell is not None) if n]
+        filas.append({'fila': row[0], 'asientos': asientos, 'direccion': DEFAULT_DIRECTION,
+                      'seat_numbers': numbers or list(range(1, asientos + 1))})
+    return {'total': sum(f['asientos'] for f in filas), 'filas': filas}
+
+
+SCHEMAS = ('vertical', 'final', 'sheets')
+DEFAULT_SHEETS = {'vertical': 'VERTICAL', 'final': 'FINAL', 'sheets': None}
+
+
+def parse_zoning(path, schema='vertical', sheet=None, authority='count', use_cache=True, cache_dir=None):
+    """{seccion: {'total', 'filas'}} del libro segun el esquema (ver el docstring del modulo)"""
+    if schema not in SCHEMAS:
+        raise ValueError(f'Esquema desconocido: {schema}')
+    sheet = sheet or DEFAULT_SHEETS[schema]
+
+    def build():
+        if schema == 'vertical':
+            return _parse_vertical(iter_sheet_rows(path, sheet, min_row=2), authority)
+        if schema == 'final':
+            return _parse_final(iter_sheet_rows(path, sheet))
+        names = [sheet] if sheet else sheet_names(path)
+        return OrderedDict((name, _parse_sheet(iter_sheet_rows(path, name, min_row=2))) for name in names)
+
+    key_schema = f'{schema}-{authority}' if schema == 'vertical' else schema
+    return _load_cached(_cache_key(path, key_schema, sheet), build, use_cache, cache_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Leer el Excel de zonificacion a {seccion: {filas}}')
+    parser.add_argument('path', help='Archivo .xlsx')
+    parser.add_argument('--schema', choices=SCHEMAS, default='vertical', help='Estructura del libro (default: vertical)')
+    parser.add_argument('--sheet', help='Hoja (default: VERTICAL, FINAL o todas segun el esquema)')
+    parser.add_argument('--authority', choices=('count', 'range'), default='count',
+                        help='En vertical: si manda NO.ASIENTOS o el rango de NUMERACION (default: count)')
+    parser.add_argument('--output', help='Guardar el resultado en este JSON')
+    parser.add_argument('--no-cache', action='store_true', help='Leer el libro aunque este en cache')
+    args = parser.parse_args()
+
+    sections = parse_zoning(args.path, args.schema, args.sheet, args.authority, not args.no_cache)
+    total = 0
+    for name, data in sections.items():
+        calc = sum(f['asientos'] for f in data['filas'])
+        total += calc
+        status = '✓' if calc == data['total'] else f"✗ (declarado {data['total']})"
+        print(f"{name}: {calc} asientos en {len(data['filas'])} filas {status}")
+    print(f'TOTAL: {total} asientos')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(sections, f, indent=2, ensure_ascii=False)
+        print(f'JSON guardado en {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Piezas comunes de los caches en disco: la llave por contenido del archivo de
+entrada (excel_zoning.py, pdf_spans.py, pdf_batch.py) y la escritura atomica
+de lo que se guarda, para que un proceso interrumpido o dos procesos a la vez
+nunca dejen un cache a medias.
+"""
+
+import hashlib
+import os
+from contextlib import contextmanager
+
+
+def file_sha256(path):
+    """sha256 del contenido del archivo, leido por bloques"""
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+@contextmanager
+def atomic_write(path, mode='w'):
+    """
+    Abrir un temporal junto a path y moverlo encima con os.replace al salir
+    sin error; si hay error (o se cierra un generador a medias) se borra el
+    temporal y path queda como estaba.
+    """
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp, mode, encoding=None if 'b' in mode else 'utf-8') as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
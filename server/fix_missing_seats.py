@@ -36,7 +36,7 @@ for row, seat_num in vip_central_missing.items():
     label = f'VC-{row}-{seat_num}'
     metadata = '{"sectionId": "' + section_id + '", "sectionName": "VIP Central", "color": "#0EA5E9", "canvas": {"position": {"x": 785, "y": 730}, "size": {"width": 11.36, "height": 11.36}, "label": "' + f'{row}-{seat_num}' + '"}}'
     
-    sql = f"INSERT INTO Seat (id, venueId, layoutId, label, rowLabel, status, metadata, createdAt, updatedAt) VALUES ('{seat_id}', '{venue_id}', '{layout_id}', '{label}', '{row}', 'AVAILABLE', '{metadata}', NOW(), NOW());"
+    sql = f"INSERT INTO Seat (id, venueId, layoutId, label, rowLabel, status, metadata, sectionId, sectionName, posX, posY, createdAt, updatedAt) VALUES ('{seat_id}', '{venue_id}', '{layout_id}', '{label}', '{row}', 'AVAILABLE', '{metadata}', '{section_id}', 'VIP Central', 785, 730, NOW(), NOW());"
     sql_statements.append(sql)
 
 # VIP Derecha
@@ -46,7 +46,7 @@ for row, seat_num in vip_derecha_missing.items():
     label = f'VD-{row}-{seat_num}'
     metadata = '{"sectionId": "' + section_id + '", "sectionName": "VIP Derecha", "color": "#0EA5E9", "canvas": {"position": {"x": 530, "y": 860}, "size": {"width": 8.49, "height": 8.49}, "label": "' + f'{row}-{seat_num}' + '"}}'
     
-    sql = f"INSERT INTO Seat (id, venueId, layoutId, label, rowLabel, status, metadata, createdAt, updatedAt) VALUES ('{seat_id}', '{venue_id}', '{layout_id}', '{label}', '{row}', 'AVAILABLE', '{metadata}', NOW(), NOW());"
+    sql = f"INSERT INTO Seat (id, venueId, layoutId, label, rowLabel, status, metadata, sectionId, sectionName, posX, posY, createdAt, updatedAt) VALUES ('{seat_id}', '{venue_id}', '{layout_id}', '{label}', '{row}', 'AVAILABLE', '{metadata}', '{section_id}', 'VIP Derecha', 530, 860, NOW(), NOW());"
     sql_statements.append(sql)
 
 print('-- SQL para agregar 16 asientos faltantes')
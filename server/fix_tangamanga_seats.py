@@ -2,13 +2,19 @@
 """
 Script para corregir la numeración de asientos de Tangamanga
 usando el JSON corregido como fuente de verdad
+
+Lee todos los asientos del venue en una sola consulta de streaming a un
+SeatStore, los agrupa por (seccion, fila) ordenados por X y aplica los
+cambios con un solo UPDATE unido a una tabla temporal, todo en una
+transaccion.
+Usa las columnas sectionId/sectionName/posX de Seat (los asientos anteriores
+a la migracion se llenan con backfill_seat_columns.py).
 """
 import json
-import mysql.connector
 
-# Cargar JSON corregido
-with open('/tmp/tangamanga_corrected.json') as f:
-    sections = json.load(f)
+from boletera_db import get_pool
+from seat_relabel import apply_label_changes
+from seat_store import SeatStore
 
 # Mapeo de nombres de secciones del Excel a nombres en la BD
 SECTION_MAPPING = {
@@ -23,70 +29,80 @@ SECTION_MAPPING = {
     'PREFERENTE DERECHA': 'PREFERENTE Derecha',
 }
 
-conn = mysql.connector.connect(
-    host='localhost',
-    user='boletera_user',
-    password='Cer0un0cer0.com20182417',
-    database='boletera_db'
-)
-cursor = conn.cursor()
-
-venue_id = '2a8073f3-3b78-4394-8eab-79e7d988542a'
-updates = 0
-errors = 0
-
-for excel_section, data in sections.items():
-    db_section = SECTION_MAPPING.get(excel_section)
-    if not db_section:
-        print(f'Seccion no mapeada: {excel_section}')
-        continue
-    
-    for fila in data['filas']:
-        row_label = str(fila['fila'])
-        seat_numbers = fila['seat_numbers']
-        
-        # Obtener asientos de esta seccion/fila ordenados por posicion X
-        query = """
-            SELECT id, columnNumber, 
-                   JSON_EXTRACT(metadata, '$.canvas.position.x') as posX
-            FROM Seat 
-            WHERE venueId = %s 
-              AND JSON_UNQUOTE(JSON_EXTRACT(metadata, '$.sectionName')) = %s
-              AND rowLabel = %s
-            ORDER BY CAST(JSON_EXTRACT(metadata, '$.canvas.position.x') AS DECIMAL(10,2)) ASC
-        """
-        cursor.execute(query, (venue_id, db_section, row_label))
-        seats = cursor.fetchall()
-        
-        if len(seats) != len(seat_numbers):
-            print(f'ERROR {db_section} Fila {row_label}: BD tiene {len(seats)}, Excel tiene {len(seat_numbers)}')
-            errors += 1
+VENUE_ID = '2a8073f3-3b78-4394-8eab-79e7d988542a'
+
+
+def load_rows(db, venue_id):
+    """
+    Regresa (store, filas): los asientos del venue en un SeatStore y sus
+    indices agrupados por (sectionName, rowLabel), ordenados por X. Usa las
+    columnas materializadas de Seat.
+    """
+    store = SeatStore(venue_id)
+    seats = db.stream("""
+        SELECT id, label, sectionId, sectionName, rowLabel, columnNumber, posX, posY
+        FROM Seat
+        WHERE venueId = %s
+    """, (venue_id,))
+    for seat_id, label, section_id, section_name, row_label, column, pos_x, pos_y in seats:
+        store.append(seat_id, label, section_id, section_name, None, row_label or '',
+                     column or 0, pos_x or 0, pos_y or 0, 0)
+    names = {section_id: section_name for section_id, section_name, _ in store.sections.values}
+    rows = {(names[section_id], row_label): indices
+            for (section_id, row_label), indices in store.group_by_section_row().items()}
+    return store, rows
+
+
+def plan_renumber(sections, store, rows):
+    """
+    Calcular (id, columnNumber, label, canvasLabel) de los asientos cuyo
+    numero cambia. Regresa (cambios, errores).
+    """
+    changes = []
+    errors = 0
+    for excel_section, data in sections.items():
+        db_section = SECTION_MAPPING.get(excel_section)
+        if not db_section:
+            print(f'Seccion no mapeada: {excel_section}')
             continue
-        
-        # Actualizar cada asiento con el numero correcto
-        for i, (seat_id, old_num, _) in enumerate(seats):
-            new_num = seat_numbers[i]
-            if old_num != new_num:
-                update_query = """
-                    UPDATE Seat 
-                    SET columnNumber = %s,
-                        label = CONCAT(
-                            SUBSTRING_INDEX(label, '-', 2),
-                            '-',
-                            %s
-                        ),
-                        metadata = JSON_SET(
-                            metadata,
-                            '$.canvas.label',
-                            CONCAT(%s, '-', %s)
-                        )
-                    WHERE id = %s
-                """
-                cursor.execute(update_query, (new_num, new_num, row_label, new_num, seat_id))
-                updates += 1
-
-conn.commit()
-print(f'Actualizados: {updates} asientos')
-print(f'Errores: {errors}')
-cursor.close()
-conn.close()
+
+        for fila in data['filas']:
+            row_label = str(fila['fila'])
+            seat_numbers = fila['seat_numbers']
+            seats = rows.get((db_section, row_label), [])
+
+            if len(seats) != len(seat_numbers):
+                print(f'ERROR {db_section} Fila {row_label}: BD tiene {len(seats)}, Excel tiene {len(seat_numbers)}')
+                errors += 1
+                continue
+
+            for i, new_num in zip(seats, seat_numbers):
+                seat_id, label = store.ids[i], store.labels[i]
+                if store.number[i] != new_num:
+                    prefix = '-'.join(label.split('-')[:2])
+                    changes.append((seat_id, new_num, f'{prefix}-{new_num}', f'{row_label}-{new_num}'))
+    return changes, errors
+
+
+def apply_renumber(db, changes):
+    return apply_label_changes(db, 'columnNumber', changes)
+
+
+def main():
+    # Cargar JSON corregido
+    with open('/tmp/tangamanga_corrected.json') as f:
+        sections = json.load(f)
+
+    db = get_pool(size=1)
+    store, rows = load_rows(db, VENUE_ID)
+    print(f'Filas en BD: {len(rows)}')
+
+    changes, errors = plan_renumber(sections, store, rows)
+    updated = apply_renumber(db, changes) if changes else 0
+
+    print(f'Actualizados: {updated} asientos')
+    print(f'Errores: {errors}')
+
+
+if __name__ == '__main__':
+    main()
@@ -222,7 +222,10 @@ def main():
                 
                 # SQL INSERT - escapar comillas
                 metadata_json = json.dumps(metadata, ensure_ascii=False).replace("'", "''")
-                sql_inserts.append("('" + seat_id + "', '" + VENUE_ID + "', '" + LAYOUT_ID + "', '" + label + "', '" + fila_label + "', " + str(seat_num) + ", 'AVAILABLE', '" + metadata_json + "', NOW(), NOW())")
+                # Columnas indexadas (sectionId, sectionName, posX, posY), copia de metadata
+                position = metadata['canvas']['position']
+                index_sql = "'" + section_id + "', '" + canvas_name.replace("'", "''") + "', " + repr(position['x']) + ", " + repr(position['y'])
+                sql_inserts.append("('" + seat_id + "', '" + VENUE_ID + "', '" + LAYOUT_ID + "', '" + label + "', '" + fila_label + "', " + str(seat_num) + ", 'AVAILABLE', '" + metadata_json + "', " + index_sql + ", NOW(), NOW())")
 
     print('')
     print('Total asientos generados: ' + str(len(all_seats)))
@@ -237,7 +240,7 @@ def main():
         chunk_size = 100
         for i in range(0, len(sql_inserts), chunk_size):
             chunk = sql_inserts[i:i+chunk_size]
-            f.write('INSERT INTO Seat (id, venueId, layoutId, label, rowLabel, columnNumber, status, metadata, createdAt, updatedAt) VALUES\n')
+            f.write('INSERT INTO Seat (id, venueId, layoutId, label, rowLabel, columnNumber, status, metadata, sectionId, sectionName, posX, posY, createdAt, updatedAt) VALUES\n')
             f.write(',\n'.join(chunk))
             f.write(';\n\n')
 
@@ -4,8 +4,14 @@ Script para generar asientos del Teatro Parque Tangamanga 1
 Version 2: Las filas siguen la inclinacion del poligono
 """
 
+import argparse
 import json
 import math
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+
+from seat_sinks import SEAT_INSERT_HEADER, CompactCanvasSink, JsonArraySink, SeatRecord, SqlInsertSink, seat_index_sql
+from seat_store import SeatStore
 
 # Constantes
 VENUE_ID = '2a8073f3-3b78-4394-8eab-79e7d988542a'
@@ -171,10 +177,9 @@ def generate_seats_in_polygon(polygon, filas_data, section_id, canvas_name, colo
     """
     Generar asientos dentro de un poligono siguiendo su forma.
     Las filas van del lado superior al inferior, siguiendo la inclinacion.
+    Regresa un SeatStore con los asientos de la seccion.
     """
-    seats = []
-    canvas_seats = []
-    sql_inserts = []
+    store = SeatStore(VENUE_ID, LAYOUT_ID)
     
     # Encontrar los 4 lados
     top_edge, bottom_edge, left_edge, right_edge = find_top_bottom_edges(polygon)
@@ -215,121 +220,103 @@ def generate_seats_in_polygon(polygon, filas_data, section_id, canvas_name, colo
             else:
                 seat_num = seat_idx + 1
             
-            seat_id = f'seat-{section_id}-{fila_label}-{seat_num}'
-            label = f'{prefix}-{fila_label}-{seat_num}'
-            display_label = f'{fila_label}-{seat_num}'
-            
-            metadata = {
-                'sectionId': section_id,
-                'sectionName': canvas_name,
-                'color': color,
-                'canvas': {
-                    'position': {'x': round(seat_pos['x'], 2), 'y': round(seat_pos['y'], 2)},
-                    'size': {'width': seat_radius * 2, 'height': seat_radius * 2},
-                    'label': display_label
-                }
-            }
-            
-            seats.append({
-                'id': seat_id,
-                'venueId': VENUE_ID,
-                'layoutId': LAYOUT_ID,
-                'label': label,
-                'rowLabel': fila_label,
-                'columnNumber': seat_num,
-                'status': 'AVAILABLE',
-                'metadata': metadata
-            })
-            
-            canvas_seats.append({
-                "type": "Circle",
-                "version": "6.9.0",
-                "originX": "center",
-                "originY": "center",
-                "left": round(seat_pos['x'], 2),
-                "top": round(seat_pos['y'], 2),
-                "width": seat_radius * 2,
-                "height": seat_radius * 2,
-                "fill": color,
-                "stroke": "#ffffff",
-                "strokeWidth": 1,
-                "radius": seat_radius,
-                "opacity": 1,
-                "visible": True,
-                "selectable": True,
-                "evented": True,
-                "_customType": "seat",
-                "seatId": seat_id,
-                "row": fila_label,
-                "number": str(seat_num),
-                "section": canvas_name,
-                "sectionId": section_id,
-                "status": "available",
-                "price": 0
-            })
-            
-            metadata_json = json.dumps(metadata, ensure_ascii=False).replace("'", "''")
-            sql_inserts.append(f"('{seat_id}', '{VENUE_ID}', '{LAYOUT_ID}', '{label}', '{fila_label}', {seat_num}, 'AVAILABLE', '{metadata_json}', NOW(), NOW())")
+            store.append(
+                f'seat-{section_id}-{fila_label}-{seat_num}',
+                f'{prefix}-{fila_label}-{seat_num}',
+                section_id, canvas_name, color, fila_label, seat_num,
+                round(seat_pos['x'], 2), round(seat_pos['y'], 2), seat_radius * 2,
+                display=f'{fila_label}-{seat_num}',
+            )
+    
+    return store
+
+def seat_records(store):
+    """SeatRecord de cada asiento del almacen, armados uno por uno para los sinks"""
+    for seat, canvas in zip(store.iter_seat_dicts(), store.iter_canvas_dicts()):
+        metadata = seat['metadata']
+        metadata_json = json.dumps(metadata, ensure_ascii=False).replace("'", "''")
+        sql_values = (
+            f"('{seat['id']}', '{VENUE_ID}', '{LAYOUT_ID}', '{seat['label']}', '{seat['rowLabel']}', "
+            f"{seat['columnNumber']}, '{seat['status']}', '{metadata_json}', {seat_index_sql(metadata)}, NOW(), NOW())"
+        )
+        yield SeatRecord(seat, canvas, sql_values)
+
+def generate_section(excel_name, filas_data):
+    """Generar los asientos de una seccion del Excel (se puede ejecutar en otro proceso)"""
+    section_id = SECTION_MAPPING[excel_name]
+    polygon = SECTIONS_POLYGONS[section_id]
+    zone = get_zone_from_section(excel_name)
+    color = ZONE_COLORS.get(zone, '#666666')
+    canvas_name = SECTION_NAMES_CANVAS.get(excel_name, excel_name)
+    prefix = SECTION_PREFIX.get(excel_name, 'XX')
     
-    return seats, canvas_seats, sql_inserts
+    return generate_seats_in_polygon(
+        polygon, filas_data, section_id, canvas_name, color, prefix
+    )
 
 def main():
+    parser = argparse.ArgumentParser(description='Generar asientos del Teatro Parque Tangamanga 1')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Procesos para generar secciones en paralelo (default: 1)')
+    parser.add_argument('--compact', action='store_true',
+                        help='Escribir seats_for_canvas.json como un bloque compactSeats')
+    args = parser.parse_args()
+
     # Cargar datos del Excel
     with open('/tmp/tangamanga_seats.json', 'r') as f:
         excel_data = json.load(f)
 
-    all_seats = []
-    all_canvas_seats = []
-    all_sql_inserts = []
+    # Cada seccion regresa un SeatStore (columnas, baratas de pasar entre
+    # procesos); los dicts y el SQL se arman al escribir, asiento por asiento
+    store = SeatStore(VENUE_ID, LAYOUT_ID)
 
-    for excel_name, section_id in SECTION_MAPPING.items():
+    section_names = []
+    section_filas = []
+    for excel_name in SECTION_MAPPING:
         if excel_name not in excel_data:
             print(f'Seccion no encontrada en Excel: {excel_name}')
             continue
         
         section_data = excel_data[excel_name]
         filas_data = section_data['filas']
-        polygon = SECTIONS_POLYGONS[section_id]
-        zone = get_zone_from_section(excel_name)
-        color = ZONE_COLORS.get(zone, '#666666')
-        canvas_name = SECTION_NAMES_CANVAS.get(excel_name, excel_name)
-        prefix = SECTION_PREFIX.get(excel_name, 'XX')
         
         print(f'Procesando: {excel_name} ({len(filas_data)} filas)')
         
-        seats, canvas_seats, sql_inserts = generate_seats_in_polygon(
-            polygon, filas_data, section_id, canvas_name, color, prefix
-        )
-        
-        all_seats.extend(seats)
-        all_canvas_seats.extend(canvas_seats)
-        all_sql_inserts.extend(sql_inserts)
+        section_names.append(excel_name)
+        section_filas.append(filas_data)
+
+    # Las secciones son independientes; pool.map conserva el orden de
+    # SECTION_MAPPING, asi que la salida es la misma con o sin --jobs
+    if args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            for section_store in pool.map(generate_section, section_names, section_filas):
+                store.extend(section_store)
+    else:
+        for name, filas in zip(section_names, section_filas):
+            store.extend(generate_section(name, filas))
 
-    print(f'\nTotal asientos generados: {len(all_seats)}')
+    print(f'\nTotal asientos generados: {len(store)}')
 
-    # Guardar SQL
-    with open('/tmp/insert_seats.sql', 'w', encoding='utf-8') as f:
-        f.write('-- Eliminar asientos existentes del venue\n')
-        f.write(f"DELETE FROM Seat WHERE venueId = '{VENUE_ID}';\n\n")
-        f.write('-- Insertar nuevos asientos\n')
-        
-        chunk_size = 100
-        for i in range(0, len(all_sql_inserts), chunk_size):
-            chunk = all_sql_inserts[i:i+chunk_size]
-            f.write('INSERT INTO Seat (id, venueId, layoutId, label, rowLabel, columnNumber, status, metadata, createdAt, updatedAt) VALUES\n')
-            f.write(',\n'.join(chunk))
-            f.write(';\n\n')
+    preamble = (
+        '-- Eliminar asientos existentes del venue\n'
+        f"DELETE FROM Seat WHERE venueId = '{VENUE_ID}';\n\n"
+        '-- Insertar nuevos asientos\n'
+    )
+    with ExitStack() as stack:
+        sinks = [
+            stack.enter_context(SqlInsertSink('/tmp/insert_seats.sql', preamble, SEAT_INSERT_HEADER)),
+            stack.enter_context(
+                CompactCanvasSink('/tmp/seats_for_canvas.json', indent=2) if args.compact
+                else JsonArraySink('/tmp/seats_for_canvas.json', 'canvas')
+            ),
+            stack.enter_context(JsonArraySink('/tmp/all_seats_data.json', 'seat')),
+        ]
+        for record in seat_records(store):
+            for sink in sinks:
+                sink.write(record)
 
     print('SQL guardado en /tmp/insert_seats.sql')
-
-    # Guardar asientos para el canvas
-    with open('/tmp/seats_for_canvas.json', 'w', encoding='utf-8') as f:
-        json.dump(all_canvas_seats, f, ensure_ascii=False, indent=2)
     print('Asientos para canvas guardados en /tmp/seats_for_canvas.json')
-    
-    # Guardar datos completos
-    with open('/tmp/all_seats_data.json', 'w', encoding='utf-8') as f:
-        json.dump(all_seats, f, ensure_ascii=False, indent=2)
     print('Datos completos guardados en /tmp/all_seats_data.json')
 
 if __name__ == '__main__':
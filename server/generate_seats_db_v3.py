@@ -4,13 +4,31 @@ Script para generar asientos del Teatro Parque Tangamanga 1
 Version 3: Con numeración correcta del Excel
 """
 
+import argparse
+import hashlib
 import json
 import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+
+from file_cache import atomic_write
+from seat_engine import place_section_seats
+from seat_sinks import SEAT_INSERT_HEADER, CompactCanvasSink, JsonArraySink, SeatRecord, SqlInsertSink, TsvSink, sql_literal
 
 # Constantes
 VENUE_ID = '2a8073f3-3b78-4394-8eab-79e7d988542a'
 LAYOUT_ID = 'ad44b249-13ad-4c51-b1ff-f73ce9b80c9b'
 
+# Cache de huellas por seccion para la regeneracion incremental
+SEAT_CACHE_DIR = '/tmp/seat_cache'
+SEAT_CACHE_VERSION = 1
+SEAT_CACHE_PENDING = os.path.join(SEAT_CACHE_DIR, 'pending.json')
+
+# Archivos para la carga masiva (load_seats.py)
+BULK_TSV_PATH = '/tmp/seats_bulk.tsv'
+BULK_MANIFEST_PATH = '/tmp/seats_bulk.json'
+
 # Mapeo de nombres de secciones del Excel a IDs de LayoutSection
 SECTION_MAPPING = {
     'VIP IZQUIERDA': 'section-1769207137210',
@@ -79,6 +97,10 @@ SECTIONS_POLYGONS = {
     'section-1769208355025': [{"x":598.29,"y":203.35},{"x":665.15,"y":461.47},{"x":394.11,"y":616.67},{"x":265.5,"y":394.17}],        # PREF Der
 }
 
+def json_str(value):
+    """Serializar un string igual que json.dumps(..., ensure_ascii=False)"""
+    return json.dumps(value, ensure_ascii=False)
+
 def distance(p1, p2):
     return math.sqrt((p2['x'] - p1['x'])**2 + (p2['y'] - p1['y'])**2)
 
@@ -149,63 +171,96 @@ def order_edge_points(edge, direction='left_to_right'):
     else:
         return edge[1], edge[0]
 
-def generate_seats_in_polygon(polygon, filas_data, section_id, canvas_name, color, prefix):
+def positions_from_filas(filas_data):
+    """
+    (xs, ys, separacion por fila) de filas que ya traen 'posiciones' en el
+    canvas; la separacion es la mediana entre asientos vecinos (sin vecinos,
+    infinita: el radio queda en el maximo).
+    """
+    xs, ys, row_spacings = [], [], []
+    for fila_info in filas_data:
+        points = [(float(p[0]), float(p[1])) for p in fila_info['posiciones']]
+        xs.extend(round(x, 2) for x, _ in points)
+        ys.extend(round(y, 2) for _, y in points)
+        steps = sorted(distance({'x': a[0], 'y': a[1]}, {'x': b[0], 'y': b[1]}) for a, b in zip(points, points[1:]))
+        row_spacings.append(steps[len(steps) // 2] if steps else math.inf)
+    return xs, ys, row_spacings
+
+def iter_seats_in_polygon(polygon, filas_data, section_id, canvas_name, color, prefix):
     """
     Generar asientos dentro de un poligono siguiendo su forma.
+    Las posiciones se calculan en bloque con seat_engine (o se toman de
+    'posiciones' si todas las filas las traen) y despues se entrega un
+    SeatRecord (Seat, canvas y SQL) por asiento.
     """
-    seats = []
-    canvas_seats = []
-    sql_inserts = []
-    
-    top_edge, bottom_edge, left_edge, right_edge = find_top_bottom_edges(polygon)
-    
-    top_left, top_right = order_edge_points(top_edge)
-    bottom_left, bottom_right = order_edge_points(bottom_edge)
+    # Solo 'posiciones' (canvas, de pdf_register.py); las 'posiciones_pdf' de
+    # pdf_rows.py estan en coordenadas del PDF y aqui se ignoran
+    if all(len(fila_info.get('posiciones') or ()) == fila_info['asientos'] for fila_info in filas_data):
+        xs, ys, row_spacings = positions_from_filas(filas_data)
+    else:
+        top_edge, bottom_edge, left_edge, right_edge = find_top_bottom_edges(polygon)
+        
+        top_left, top_right = order_edge_points(top_edge)
+        bottom_left, bottom_right = order_edge_points(bottom_edge)
+        
+        placed = place_section_seats(
+            top_left, top_right, bottom_left, bottom_right,
+            [fila_info['asientos'] for fila_info in filas_data]
+        )
+        row_lengths = placed['row_length'].tolist()
+        row_spacings = [row_lengths[row_idx] / (fila_info['asientos'] + 1)
+                        for row_idx, fila_info in enumerate(filas_data)]
+        xs = [round(x, 2) for x in placed['x'].tolist()]
+        ys = [round(y, 2) for y in placed['y'].tolist()]
     
-    num_filas = len(filas_data)
-    margin = 0.08
+    # Partes constantes del metadata ya serializadas (mismo formato que json.dumps)
+    meta_head = (
+        '{"sectionId": ' + json_str(section_id)
+        + ', "sectionName": ' + json_str(canvas_name)
+        + ', "color": ' + json_str(color)
+        + ', "canvas": {"position": {"x": '
+    )
     
+    offset = 0
     for row_idx, fila_info in enumerate(filas_data):
         fila_label = str(fila_info['fila'])
         num_asientos = fila_info['asientos']
         # Usar los números de asiento del Excel (ya vienen en el orden correcto)
         seat_numbers = fila_info.get('seat_numbers', list(range(1, num_asientos + 1)))
+        seat_numbers = list(seat_numbers[:num_asientos]) + list(range(len(seat_numbers) + 1, num_asientos + 1))
         
-        t_row = margin + (1 - 2 * margin) * (row_idx + 0.5) / num_filas
+        seat_spacing = row_spacings[row_idx]
+        seat_radius = min(10, seat_spacing * 0.4)
+        seat_size = seat_radius * 2
         
-        row_start = lerp_point(top_left, bottom_left, t_row)
-        row_end = lerp_point(top_right, bottom_right, t_row)
+        meta_tail = (
+            '}, "size": {"width": ' + repr(seat_size) + ', "height": ' + repr(seat_size)
+            + '}, "label": '
+        )
         
-        row_length = distance(row_start, row_end)
-        seat_spacing = row_length / (num_asientos + 1)
-        seat_radius = min(10, seat_spacing * 0.4)
+        # Todo lo que es fijo en la fila se serializa una vez; por asiento solo
+        # quedan concatenaciones sobre columnas ya armadas (sin json.dumps)
+        row_xs = xs[offset:offset + num_asientos]
+        row_ys = ys[offset:offset + num_asientos]
+        numbers = list(map(str, seat_numbers))
+        seat_ids = [f'seat-{section_id}-{fila_label}-' + n for n in numbers]
+        labels = [f'{prefix}-{fila_label}-' + n for n in numbers]
+        display_labels = [fila_label + '-' + n for n in numbers]
+        # json_str(display_label): los numeros y el guion no se escapan
+        meta_label = json_str(fila_label)[:-1] + '-'
+        meta_x = meta_head.replace("'", "''")
+        meta_y_tail = (meta_tail + meta_label).replace("'", "''")
+        sql_head = f"', '{VENUE_ID}', '{LAYOUT_ID}', '"
+        sql_mid = f"', '{fila_label}', "
+        sql_section = f"', {sql_literal(section_id)}, {sql_literal(canvas_name)}, "
+        sql_values = [
+            f"('{seat_id}{sql_head}{label}{sql_mid}{seat_num}, 'AVAILABLE', '{meta_x}{x!r}, \"y\": {y!r}{meta_y_tail}{n}\"}}}}{sql_section}{x!r}, {y!r}, NOW(), NOW())"
+            for seat_id, label, seat_num, n, x, y in zip(seat_ids, labels, seat_numbers, numbers, row_xs, row_ys)
+        ]
         
-        for seat_idx in range(num_asientos):
-            t_seat = (seat_idx + 1) / (num_asientos + 1)
-            seat_pos = lerp_point(row_start, row_end, t_seat)
-            
-            # Usar el número de asiento del Excel
-            if seat_idx < len(seat_numbers):
-                seat_num = seat_numbers[seat_idx]
-            else:
-                seat_num = seat_idx + 1
-            
-            seat_id = f'seat-{section_id}-{fila_label}-{seat_num}'
-            label = f'{prefix}-{fila_label}-{seat_num}'
-            display_label = f'{fila_label}-{seat_num}'
-            
-            metadata = {
-                'sectionId': section_id,
-                'sectionName': canvas_name,
-                'color': color,
-                'canvas': {
-                    'position': {'x': round(seat_pos['x'], 2), 'y': round(seat_pos['y'], 2)},
-                    'size': {'width': seat_radius * 2, 'height': seat_radius * 2},
-                    'label': display_label
-                }
-            }
-            
-            seats.append({
+        for seat_x, seat_y, seat_num, seat_id, label, display_label, number, values in zip(
+                row_xs, row_ys, seat_numbers, seat_ids, labels, display_labels, numbers, sql_values):
+            seat = {
                 'id': seat_id,
                 'venueId': VENUE_ID,
                 'layoutId': LAYOUT_ID,
@@ -213,18 +268,27 @@ def generate_seats_in_polygon(polygon, filas_data, section_id, canvas_name, colo
                 'rowLabel': fila_label,
                 'columnNumber': seat_num,
                 'status': 'AVAILABLE',
-                'metadata': metadata
-            })
+                'metadata': {
+                    'sectionId': section_id,
+                    'sectionName': canvas_name,
+                    'color': color,
+                    'canvas': {
+                        'position': {'x': seat_x, 'y': seat_y},
+                        'size': {'width': seat_size, 'height': seat_size},
+                        'label': display_label
+                    }
+                }
+            }
             
-            canvas_seats.append({
+            canvas_seat = {
                 "type": "Circle",
                 "version": "6.9.0",
                 "originX": "center",
                 "originY": "center",
-                "left": round(seat_pos['x'], 2),
-                "top": round(seat_pos['y'], 2),
-                "width": seat_radius * 2,
-                "height": seat_radius * 2,
+                "left": seat_x,
+                "top": seat_y,
+                "width": seat_size,
+                "height": seat_size,
                 "fill": color,
                 "stroke": "#ffffff",
                 "strokeWidth": 1,
@@ -236,39 +300,190 @@ def generate_seats_in_polygon(polygon, filas_data, section_id, canvas_name, colo
                 "_customType": "seat",
                 "seatId": seat_id,
                 "row": fila_label,
-                "number": str(seat_num),
+                "number": number,
                 "section": canvas_name,
                 "sectionId": section_id,
                 "status": "available",
                 "price": 0
-            })
+            }
             
-            metadata_json = json.dumps(metadata, ensure_ascii=False).replace("'", "''")
-            sql_inserts.append(f"('{seat_id}', '{VENUE_ID}', '{LAYOUT_ID}', '{label}', '{fila_label}', {seat_num}, 'AVAILABLE', '{metadata_json}', NOW(), NOW())")
-    
+            yield SeatRecord(seat, canvas_seat, values)
+        
+        offset += num_asientos
+
+def generate_seats_in_polygon(polygon, filas_data, section_id, canvas_name, color, prefix):
+    """Igual que iter_seats_in_polygon pero regresa las tres listas completas"""
+    seats = []
+    canvas_seats = []
+    sql_inserts = []
+    for record in iter_seats_in_polygon(polygon, filas_data, section_id, canvas_name, color, prefix):
+        seats.append(record.seat)
+        canvas_seats.append(record.canvas)
+        sql_inserts.append(record.sql_values)
     return seats, canvas_seats, sql_inserts
 
+def section_params(excel_name):
+    """Parametros de generacion de una seccion del Excel"""
+    section_id = SECTION_MAPPING[excel_name]
+    polygon = SECTIONS_POLYGONS[section_id]
+    zone = get_zone_from_section(excel_name)
+    color = ZONE_COLORS.get(zone, '#666666')
+    canvas_name = SECTION_NAMES_CANVAS.get(excel_name, excel_name)
+    prefix = SECTION_PREFIX.get(excel_name, 'XX')
+    return polygon, section_id, canvas_name, color, prefix
+
+def generate_section(excel_name, filas_data):
+    """Generar los asientos de una seccion del Excel (se puede ejecutar en otro proceso)"""
+    polygon, section_id, canvas_name, color, prefix = section_params(excel_name)
+    return generate_seats_in_polygon(
+        polygon, filas_data, section_id, canvas_name, color, prefix
+    )
+
+def iter_section(excel_name, filas_data):
+    """Igual que generate_section pero entrega un SeatRecord a la vez"""
+    polygon, section_id, canvas_name, color, prefix = section_params(excel_name)
+    return iter_seats_in_polygon(
+        polygon, filas_data, section_id, canvas_name, color, prefix
+    )
+
+def section_fingerprint(excel_name, filas_data):
+    """
+    Huella de las entradas de una seccion: poligono, filas del Excel, color y
+    prefijo (mas los datos que tambien terminan en cada asiento).
+    """
+    section_id = SECTION_MAPPING[excel_name]
+    payload = {
+        'version': SEAT_CACHE_VERSION,
+        'venueId': VENUE_ID,
+        'layoutId': LAYOUT_ID,
+        'sectionId': section_id,
+        'polygon': SECTIONS_POLYGONS[section_id],
+        'filas': filas_data,
+        'color': ZONE_COLORS.get(get_zone_from_section(excel_name), '#666666'),
+        'prefix': SECTION_PREFIX.get(excel_name, 'XX'),
+        'canvasName': SECTION_NAMES_CANVAS.get(excel_name, excel_name),
+    }
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+def section_cache_path(section_id):
+    return os.path.join(SEAT_CACHE_DIR, f'{section_id}.jsonl')
+
+def load_section_cache(section_id, fingerprint):
+    """
+    Si la huella no cambio, regresar un iterador de SeatRecord (sin SQL)
+    leido del cache; si no, None.
+    El cache es JSON Lines: la huella en la primera linea y un
+    [seat, canvas] por asiento en las siguientes.
+    """
+    path = section_cache_path(section_id)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        header = json.loads(f.readline() or 'null')
+    if not header or header.get('fingerprint') != fingerprint:
+        return None
+    return _read_section_cache(path)
+
+def _read_section_cache(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        f.readline()
+        for line in f:
+            seat, canvas_seat = json.loads(line)
+            yield SeatRecord(seat, canvas_seat, None)
+
+def cache_section(section_id, fingerprint, records):
+    """
+    Pasar los SeatRecord tal cual mientras se escriben al cache pendiente de
+    la seccion; queda valido hasta que commit_section_caches lo aplica.
+    """
+    os.makedirs(SEAT_CACHE_DIR, exist_ok=True)
+    path = section_cache_path(section_id) + '.pending'
+    # Solo un cache completo queda pendiente
+    with atomic_write(path) as f:
+        f.write(json.dumps({'fingerprint': fingerprint}) + '\n')
+        for record in records:
+            f.write(json.dumps([record.seat, record.canvas], ensure_ascii=False) + '\n')
+            yield record
+
+def cached_section_ids():
+    """Secciones con cache ya aplicado a la DB"""
+    if not os.path.isdir(SEAT_CACHE_DIR):
+        return []
+    return sorted(name[:-len('.jsonl')] for name in os.listdir(SEAT_CACHE_DIR) if name.endswith('.jsonl'))
+
+def discard_pending_caches():
+    """Borrar los caches pendientes de una generacion que nunca se aplico"""
+    if not os.path.isdir(SEAT_CACHE_DIR):
+        return
+    for name in os.listdir(SEAT_CACHE_DIR):
+        if name.endswith('.pending') or name == os.path.basename(SEAT_CACHE_PENDING):
+            os.remove(os.path.join(SEAT_CACHE_DIR, name))
+
+def stage_section_caches(written, dropped):
+    """Anotar que caches escribio esta generacion y cuales hay que quitar"""
+    os.makedirs(SEAT_CACHE_DIR, exist_ok=True)
+    with open(SEAT_CACHE_PENDING, 'w', encoding='utf-8') as f:
+        json.dump({'write': written, 'drop': dropped}, f, indent=2)
+
+def commit_section_caches():
+    """
+    Aplicar los caches pendientes de la ultima generacion. Se llama solo
+    despues de que sus asientos quedaron en la DB (load_seats.py,
+    sync_seats.py, regen_seats.sh); una corrida que no se aplico o que fallo
+    no deja huellas validas y la siguiente --incremental la regenera.
+    Regresa (secciones escritas, secciones quitadas).
+    """
+    if not os.path.exists(SEAT_CACHE_PENDING):
+        return [], []
+    with open(SEAT_CACHE_PENDING, 'r', encoding='utf-8') as f:
+        pending = json.load(f)
+    for section_id in pending['write']:
+        path = section_cache_path(section_id)
+        if os.path.exists(path + '.pending'):
+            os.replace(path + '.pending', path)
+    for section_id in pending['drop']:
+        path = section_cache_path(section_id)
+        if os.path.exists(path):
+            os.remove(path)
+    os.remove(SEAT_CACHE_PENDING)
+    return pending['write'], pending['drop']
+
 def main():
+    parser = argparse.ArgumentParser(description='Generar asientos del Teatro Parque Tangamanga 1')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Procesos para generar secciones en paralelo (default: 1)')
+    parser.add_argument('--incremental', action='store_true',
+                        help=f'Regenerar solo las secciones cuya huella cambio (cache en {SEAT_CACHE_DIR})')
+    parser.add_argument('--bulk', action='store_true',
+                        help=f'Escribir {BULK_TSV_PATH} para load_seats.py / sync_seats.py en lugar de insert_seats.sql')
+    parser.add_argument('--compact', action='store_true',
+                        help='Escribir seats_for_canvas.json como un bloque compactSeats')
+    parser.add_argument('--commit-cache', action='store_true',
+                        help='Solo marcar como aplicados los caches de la ultima generacion (despues de cargarla a la DB)')
+    args = parser.parse_args()
+
+    if args.commit_cache:
+        written, dropped = commit_section_caches()
+        print(f'Caches aplicados: {len(written)}, quitados: {len(dropped)}')
+        return
+    discard_pending_caches()
+
     # Cargar datos del Excel
     with open('/tmp/tangamanga_seats.json', 'r') as f:
         excel_data = json.load(f)
 
-    all_seats = []
-    all_canvas_seats = []
-    all_sql_inserts = []
-
-    for excel_name, section_id in SECTION_MAPPING.items():
+    section_names = []
+    section_filas = []
+    cached_sections = {}
+    fingerprints = {}
+    for excel_name in SECTION_MAPPING:
         if excel_name not in excel_data:
             print(f'Seccion no encontrada en Excel: {excel_name}')
             continue
         
         section_data = excel_data[excel_name]
         filas_data = section_data['filas']
-        polygon = SECTIONS_POLYGONS[section_id]
-        zone = get_zone_from_section(excel_name)
-        color = ZONE_COLORS.get(zone, '#666666')
-        canvas_name = SECTION_NAMES_CANVAS.get(excel_name, excel_name)
-        prefix = SECTION_PREFIX.get(excel_name, 'XX')
         
         print(f'Procesando: {excel_name} ({len(filas_data)} filas)')
         
@@ -279,40 +494,94 @@ def main():
             if nums:
                 print(f'  Ejemplo Fila {fila["fila"]}: {nums[0]} ... {nums[-1]}')
         
-        seats, canvas_seats, sql_inserts = generate_seats_in_polygon(
-            polygon, filas_data, section_id, canvas_name, color, prefix
-        )
+        section_id = SECTION_MAPPING[excel_name]
+        fingerprints[excel_name] = section_fingerprint(excel_name, filas_data)
+        if args.incremental:
+            cached = load_section_cache(section_id, fingerprints[excel_name])
+            if cached is not None:
+                print('  Sin cambios, se usa el cache')
+                cached_sections[excel_name] = cached
+                continue
         
-        all_seats.extend(seats)
-        all_canvas_seats.extend(canvas_seats)
-        all_sql_inserts.extend(sql_inserts)
+        section_names.append(excel_name)
+        section_filas.append(filas_data)
 
-    print(f'\nTotal asientos generados: {len(all_seats)}')
+    # Secciones aplicadas antes que ya no estan en SECTION_MAPPING (o en el Excel)
+    current_ids = {SECTION_MAPPING[name] for name in fingerprints}
+    dropped_ids = [section_id for section_id in cached_section_ids() if section_id not in current_ids]
+    changed_ids = [SECTION_MAPPING[name] for name in section_names]
 
-    # Guardar SQL
-    with open('/tmp/insert_seats.sql', 'w', encoding='utf-8') as f:
-        f.write('-- Eliminar asientos existentes del venue\n')
-        f.write(f"DELETE FROM Seat WHERE venueId = '{VENUE_ID}';\n\n")
-        f.write('-- Insertar nuevos asientos\n')
-        
-        chunk_size = 100
-        for i in range(0, len(all_sql_inserts), chunk_size):
-            chunk = all_sql_inserts[i:i+chunk_size]
-            f.write('INSERT INTO Seat (id, venueId, layoutId, label, rowLabel, columnNumber, status, metadata, createdAt, updatedAt) VALUES\n')
-            f.write(',\n'.join(chunk))
-            f.write(';\n\n')
-
-    print('SQL guardado en /tmp/insert_seats.sql')
-
-    # Guardar asientos para el canvas
-    with open('/tmp/seats_for_canvas.json', 'w', encoding='utf-8') as f:
-        json.dump(all_canvas_seats, f, ensure_ascii=False, indent=2)
+    if args.incremental:
+        preamble = '-- Eliminar asientos de las secciones que cambiaron o ya no existen\n'
+        for section_id in changed_ids + dropped_ids:
+            preamble += f"DELETE FROM Seat WHERE venueId = '{VENUE_ID}' AND id LIKE 'seat-{section_id}-%';\n"
+        preamble += '\n'
+    else:
+        preamble = '-- Eliminar asientos existentes del venue\n'
+        preamble += f"DELETE FROM Seat WHERE venueId = '{VENUE_ID}';\n\n"
+    preamble += '-- Insertar nuevos asientos\n'
+
+    # Las secciones son independientes; pool.map conserva el orden de
+    # SECTION_MAPPING, asi que la salida es la misma con o sin --jobs
+    with ExitStack() as stack:
+        built = None
+        if args.jobs > 1 and section_names:
+            pool = stack.enter_context(ProcessPoolExecutor(max_workers=args.jobs))
+            built = pool.map(generate_section, section_names, section_filas)
+
+        if args.bulk:
+            db_sink = stack.enter_context(TsvSink(BULK_TSV_PATH))
+        else:
+            db_sink = stack.enter_context(SqlInsertSink('/tmp/insert_seats.sql', preamble, SEAT_INSERT_HEADER))
+        if args.compact:
+            canvas_sink = stack.enter_context(CompactCanvasSink('/tmp/seats_for_canvas.json'))
+        else:
+            canvas_sink = stack.enter_context(JsonArraySink('/tmp/seats_for_canvas.json', 'canvas'))
+        data_sink = stack.enter_context(JsonArraySink('/tmp/all_seats_data.json', 'seat'))
+        sinks = (db_sink, canvas_sink, data_sink)
+
+        # Los JSON siempre llevan todas las secciones, en el orden de SECTION_MAPPING
+        for excel_name in SECTION_MAPPING:
+            if excel_name in cached_sections:
+                records = cached_sections[excel_name]
+            elif excel_name in fingerprints:
+                if built is not None:
+                    records = map(SeatRecord, *next(built))
+                else:
+                    filas_data = section_filas[section_names.index(excel_name)]
+                    records = iter_section(excel_name, filas_data)
+                records = cache_section(SECTION_MAPPING[excel_name], fingerprints[excel_name], records)
+            else:
+                continue
+            
+            for record in records:
+                for sink in sinks:
+                    sink.write(record)
+
+    print(f'\nTotal asientos generados: {data_sink.count}')
+    if args.incremental:
+        print(f'Secciones regeneradas: {len(section_names)} de {len(fingerprints)}')
+        if dropped_ids:
+            print(f'Secciones eliminadas: {", ".join(dropped_ids)}')
+    stage_section_caches(changed_ids, dropped_ids)
+
+    if args.bulk:
+        # Que borrar antes de cargar: todo el venue o solo las secciones regeneradas
+        manifest = {
+            'file': BULK_TSV_PATH,
+            'venueId': VENUE_ID,
+            'layoutId': LAYOUT_ID,
+            'sectionIds': changed_ids + dropped_ids if args.incremental else None,
+            'rows': db_sink.count,
+        }
+        with open(BULK_MANIFEST_PATH, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        print(f'Archivo de carga masiva guardado en {BULK_TSV_PATH} ({BULK_MANIFEST_PATH})')
+    else:
+        print('SQL guardado en /tmp/insert_seats.sql')
     print('Asientos para canvas guardados en /tmp/seats_for_canvas.json')
-    
-    # Guardar datos completos
-    with open('/tmp/all_seats_data.json', 'w', encoding='utf-8') as f:
-        json.dump(all_seats, f, ensure_ascii=False, indent=2)
     print('Datos completos guardados en /tmp/all_seats_data.json')
+    print('El cache incremental se marca al aplicar (load_seats.py, sync_seats.py o --commit-cache)')
 
 if __name__ == '__main__':
     main()
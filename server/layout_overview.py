@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Imagenes de vista general de un VenueLayout (PNG, WebP y SVG) para mostrar
+el mapa del venue al instante mientras carga el canvas interactivo.
+
+Dibuja los poligonos de las secciones (LayoutSection.polygonPoints, o
+layoutJson.sections si el layout no tiene filas en LayoutSection) y un punto
+por asiento. Los asientos salen de los Circle del canvas (incluyendo bloques
+compactSeats), de layoutJson.sections[].seats o, si no hay, de las columnas
+posX/posY de Seat.
+
+La salida se guarda por hash del contenido del layout, asi que volver a
+correrlo sin cambios no redibuja nada:
+
+    uploads/overviews/<layoutId>/<hash>/overview-<ancho>.png|webp, overview.svg
+    uploads/overviews/<layoutId>/<hash>/index.json
+    uploads/overviews/<layoutId>/latest.json     -> hash y version actuales
+
+El PNG se codifica aqui (numpy + zlib); WebP solo si Pillow esta instalado.
+
+    python3 layout_overview.py --layout ad44b249-...
+    python3 layout_overview.py --file layout-data.json --output /tmp/overviews
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import struct
+import zlib
+
+import numpy as np
+
+from blob_codec import decode_blob
+from boletera_db import get_pool
+from compact_seats import expand_objects
+from layout_stream import iter_layout_chunks
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+WIDTHS = (480, 960, 1920)
+MARGIN = 0.02
+SECTION_ALPHA = 0.25
+DEFAULT_COLOR = (14, 165, 233)
+BACKGROUND = (255, 255, 255)
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads', 'overviews')
+
+_RGB_RE = re.compile(r'rgba?\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)')
+
+
+def parse_color(value, default=DEFAULT_COLOR):
+    """(r, g, b) de '#rgb', '#rrggbb', '#rrggbbaa' o 'rgb(...)'"""
+    if not isinstance(value, str):
+        return default
+    value = value.strip()
+    if value.startswith('#'):
+        digits = value[1:]
+        if len(digits) in (3, 4):
+            digits = ''.join(c * 2 for c in digits[:3])
+        if len(digits) in (6, 8):
+            try:
+                return tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4))
+            except ValueError:
+                return default
+        return default
+    match = _RGB_RE.match(value)
+    return tuple(int(g) for g in match.groups()) if match else default
+
+
+def _points(value):
+    if isinstance(value, str):
+        value = json.loads(decode_blob(value) or '[]')
+    return [(float(p['x']), float(p['y'])) for p in value or [] if 'x' in p and 'y' in p]
+
+
+# ---------------------------------------------------------------------------
+# Datos del layout
+# ---------------------------------------------------------------------------
+
+class Overview:
+    """Secciones (poligonos) y asientos (columnas numpy) a dibujar"""
+
+    def __init__(self, sections, xs, ys, radii, colors, background=BACKGROUND):
+        self.sections = sections        # [{'name', 'color': (r, g, b), 'points': [(x, y)]}]
+        self.xs = np.asarray(xs, dtype=np.float64)
+        self.ys = np.asarray(ys, dtype=np.float64)
+        self.radii = np.asarray(radii, dtype=np.float64)
+        self.colors = np.asarray(colors, dtype=np.uint8).reshape(-1, 3)
+        self.background = background
+
+    def bounds(self):
+        xs = [x for s in self.sections for x, _ in s['points']] + self.xs.tolist()
+        ys = [y for s in self.sections for _, y in s['points']] + self.ys.tolist()
+        if not xs:
+            raise ValueError('El layout no tiene secciones ni asientos')
+        x0, x1, y0, y1 = min(xs), max(xs), min(ys), max(ys)
+        pad = max(x1 - x0, y1 - y0, 1.0) * MARGIN
+        return x0 - pad, y0 - pad, x1 + pad, y1 + pad
+
+
+def build_overview(layout, section_rows=(), seat_rows=()):
+    """
+    Armar el Overview a partir del layoutJson (dict), las filas de
+    LayoutSection y, como ultimo recurso, filas Seat con posX/posY/sectionId.
+    """
+    embedded = layout.get('sections') or []
+    section_rows = list(section_rows) or embedded
+    sections = []
+    color_by_id = {}
+    for row in section_rows:
+        color = parse_color(row.get('color'))
+        color_by_id[row.get('id')] = color
+        points = _points(row.get('polygonPoints') or row.get('points'))
+        if len(points) >= 3:
+            sections.append({'name': row.get('name'), 'color': color, 'points': points})
+
+    xs, ys, radii, colors = [], [], [], []
+    canvas = layout.get('canvas') or {}
+    for obj in expand_objects(canvas.get('objects') or []):
+        if isinstance(obj, dict) and obj.get('_customType') == 'seat':
+            xs.append(obj.get('left', 0))
+            ys.append(obj.get('top', 0))
+            radii.append(obj.get('radius') or (obj.get('width') or 0) / 2)
+            colors.append(parse_color(obj.get('fill'), color_by_id.get(obj.get('sectionId'), DEFAULT_COLOR)))
+    if not xs:
+        for section in embedded:
+            color = parse_color(section.get('color'))
+            for seat in section.get('seats') or []:
+                if 'x' in seat and 'y' in seat:
+                    xs.append(seat['x'])
+                    ys.append(seat['y'])
+                    radii.append(seat.get('radius') or 0)
+                    colors.append(color)
+    if not xs:
+        for pos_x, pos_y, section_id in seat_rows:
+            if pos_x is not None and pos_y is not None:
+                xs.append(pos_x)
+                ys.append(pos_y)
+                radii.append(0)
+                colors.append(color_by_id.get(section_id, DEFAULT_COLOR))
+
+    background = canvas.get('background')
+    return Overview(sections, xs, ys, radii, colors,
+                    parse_color(background, BACKGROUND) if isinstance(background, str) else BACKGROUND)
+
+
+def content_hash(*parts):
+    """Hash corto del contenido que se dibuja (llave del cache)"""
+    sha = hashlib.sha256()
+    for part in parts:
+        sha.update(json.dumps(part, ensure_ascii=False, sort_keys=True, default=str).encode('utf-8'))
+    return sha.hexdigest()[:16]
+
+
+def load_from_db(db, layout_id):
+    """Regresa (Overview, version, hash)"""
+    version = db.query_value('SELECT version FROM VenueLayout WHERE id = %s', (layout_id,))
+    if version is None:
+        raise LookupError(f'No existe el layout {layout_id}')
+    text = ''.join(iter_layout_chunks(db, layout_id))
+    layout = json.loads(text or '{}')
+    section_rows = db.query_dicts(
+        'SELECT id, name, color, polygonPoints FROM LayoutSection '
+        'WHERE parentLayoutId = %s AND isActive = 1 ORDER BY displayOrder, id',
+        (layout_id,)
+    )
+    seat_rows = []
+    if not layout.get('sections') and not any(
+            obj.get('_customType') in ('seat', 'compactSeats')
+            for obj in (layout.get('canvas') or {}).get('objects') or []):
+        seat_rows = db.query('SELECT posX, posY, sectionId FROM Seat WHERE layoutId = %s', (layout_id,))
+    overview = build_overview(layout, section_rows, seat_rows)
+    return overview, version, content_hash(text, section_rows, seat_rows)
+
+
+def load_from_file(path):
+    """Respuesta de layout guardada en JSON (layout-data.json)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    layout = data.get('layoutJson', data)
+    if isinstance(layout, str):
+        layout = json.loads(decode_blob(layout))
+    section_rows = data.get('sections') if 'layoutJson' in data else ()
+    overview = build_overview(layout, section_rows or ())
+    return overview, data.get('version', 1), data.get('id'), content_hash(layout, section_rows)
+
+
+# ---------------------------------------------------------------------------
+# Raster
+# ---------------------------------------------------------------------------
+
+def _fill_polygon(image, points, color, alpha):
+    """Relleno par-impar con mezcla alpha; points ya en pixeles"""
+    height, width, _ = image.shape
+    px = np.array([p[0] for p in points])
+    py = np.array([p[1] for p in points])
+    x0, x1 = max(int(px.min()), 0), min(int(np.ceil(px.max())) + 1, width)
+    y0, y1 = max(int(py.min()), 0), min(int(np.ceil(py.max())) + 1, height)
+    if x0 >= x1 or y0 >= y1:
+        return
+    gx, gy = np.meshgrid(np.arange(x0, x1) + 0.5, np.arange(y0, y1) + 0.5)
+    inside = np.zeros(gx.shape, dtype=bool)
+    for (ax, ay), (bx, by) in zip(points, points[1:] + points[:1]):
+        if ay == by:
+            continue
+        crosses = (ay > gy) != (by > gy)
+        x_cross = ax + (gy - ay) * (bx - ax) / (by - ay)
+        inside ^= crosses & (gx < x_cross)
+    region = image[y0:y1, x0:x1]
+    blended = region * (1 - alpha) + np.array(color) * alpha
+    region[inside] = blended[inside].astype(np.uint8)
+
+
+def _stroke_polygon(image, points, color):
+    height, width, _ = image.shape
+    for (ax, ay), (bx, by) in zip(points, points[1:] + points[:1]):
+        steps = int(max(abs(bx - ax), abs(by - ay)) * 2) + 1
+        t = np.linspace(0, 1, steps)
+        xs = np.clip((ax + (bx - ax) * t).astype(np.int64), 0, width - 1)
+        ys = np.clip((ay + (by - ay) * t).astype(np.int64), 0, height - 1)
+        image[ys, xs] = color
+
+
+def _draw_seats(image, xs, ys, radii, colors):
+    """Un disco por asiento; todos los del mismo radio en pixeles de una vez"""
+    height, width, _ = image.shape
+    for radius in np.unique(radii):
+        mask = radii == radius
+        r = int(radius)
+        offsets = [(dx, dy) for dy in range(-r, r + 1) for dx in range(-r, r + 1)
+                   if dx * dx + dy * dy <= radius * radius + 0.25]
+        cx = np.rint(xs[mask]).astype(np.int64)
+        cy = np.rint(ys[mask]).astype(np.int64)
+        seat_colors = colors[mask]
+        for dx, dy in offsets:
+            px, py = cx + dx, cy + dy
+            ok = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+            image[py[ok], px[ok]] = seat_colors[ok]
+
+
+def render_raster(overview, width):
+    """Arreglo (alto, ancho, 3) uint8 de la vista general"""
+    x0, y0, x1, y1 = overview.bounds()
+    scale = width / (x1 - x0)
+    height = max(int(round((y1 - y0) * scale)), 1)
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    image[:] = overview.background
+
+    for section in overview.sections:
+        points = [((x - x0) * scale, (y - y0) * scale) for x, y in section['points']]
+        _fill_polygon(image, points, section['color'], SECTION_ALPHA)
+        _stroke_polygon(image, points, section['color'])
+
+    if len(overview.xs):
+        # Radio en pixeles: el del asiento, o la mitad de la separacion tipica
+        radii = overview.radii.copy()
+        if not radii.any():
+            radii[:] = _typical_spacing(overview) * 0.4
+        radii_px = np.maximum(np.round(radii * scale * 2) / 2, 0.5)
+        _draw_seats(image, (overview.xs - x0) * scale, (overview.ys - y0) * scale,
+                    radii_px, overview.colors)
+    return image
+
+
+def _typical_spacing(overview):
+    """Mediana de la distancia al vecino siguiente en X (para asientos sin radio)"""
+    order = np.lexsort((overview.xs, np.round(overview.ys)))
+    gaps = np.hypot(np.diff(overview.xs[order]), np.diff(overview.ys[order]))
+    gaps = gaps[gaps > 0]
+    return float(np.median(gaps)) if len(gaps) else 1.0
+
+
+def encode_png(image):
+    """PNG RGB de 8 bits con filtro Sub por fila"""
+    height, width, _ = image.shape
+    raw = image.astype(np.int16)
+    filtered = raw.copy()
+    filtered[:, 1:] -= raw[:, :-1]
+    rows = np.empty((height, width * 3 + 1), dtype=np.uint8)
+    rows[:, 0] = 1
+    rows[:, 1:] = (filtered % 256).astype(np.uint8).reshape(height, -1)
+
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack('>I', len(data)) + body + struct.pack('>I', zlib.crc32(body) & 0xffffffff)
+
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(rows.tobytes(), 9))
+            + chunk(b'IEND', b''))
+
+
+# ---------------------------------------------------------------------------
+# SVG
+# ---------------------------------------------------------------------------
+
+def _hex(color):
+    return '#%02x%02x%02x' % tuple(int(c) for c in color)
+
+
+def render_svg(overview):
+    x0, y0, x1, y1 = overview.bounds()
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{x0:.1f} {y0:.1f} {x1 - x0:.1f} {y1 - y0:.1f}">',
+        f'<rect x="{x0:.1f}" y="{y0:.1f}" width="{x1 - x0:.1f}" height="{y1 - y0:.1f}" fill="{_hex(overview.background)}"/>',
+    ]
+    for section in overview.sections:
+        points = ' '.join(f'{x:.1f},{y:.1f}' for x, y in section['points'])
+        color = _hex(section['color'])
+        name = (section['name'] or '').replace('&', '&amp;').replace('<', '&lt;').replace('"', '&quot;')
+        parts.append(f'<polygon points="{points}" fill="{color}" fill-opacity="{SECTION_ALPHA}" '
+                     f'stroke="{color}" data-name="{name}"/>')
+
+    if len(overview.xs):
+        radii = overview.radii.copy()
+        if not radii.any():
+            radii[:] = _typical_spacing(overview) * 0.4
+        keys = overview.colors.astype(np.int64) @ np.array([65536, 256, 1])
+        for key in np.unique(keys):
+            mask = keys == key
+            parts.append(f'<g fill="{_hex(overview.colors[np.argmax(mask)])}">')
+            parts.extend(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{r:.1f}"/>'
+                         for x, y, r in zip(overview.xs[mask], overview.ys[mask], radii[mask]))
+            parts.append('</g>')
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+
+# ---------------------------------------------------------------------------
+# Cache en disco
+# ---------------------------------------------------------------------------
+
+def render_all(overview, directory, widths=WIDTHS):
+    """Escribir todas las imagenes en directory; regresa la lista de archivos"""
+    os.makedirs(directory, exist_ok=True)
+    files = []
+    for width in widths:
+        image = render_raster(overview, width)
+        name = f'overview-{width}.png'
+        with open(os.path.join(directory, name), 'wb') as f:
+            f.write(encode_png(image))
+        files.append({'file': name, 'width': width, 'height': image.shape[0]})
+        if Image is not None:
+            name = f'overview-{width}.webp'
+            Image.fromarray(image).save(os.path.join(directory, name), 'WEBP', quality=85)
+            files.append({'file': name, 'width': width, 'height': image.shape[0]})
+    with open(os.path.join(directory, 'overview.svg'), 'w', encoding='utf-8') as f:
+        f.write(render_svg(overview))
+    files.append({'file': 'overview.svg'})
+    return files
+
+
+def write_overview(overview, output, layout_id, version, digest, widths=WIDTHS, force=False):
+    """Regresa (index, True si se dibujo / False si ya estaba en cache)"""
+    base = os.path.join(output, layout_id or 'layout')
+    directory = os.path.join(base, digest)
+    index_path = os.path.join(directory, 'index.json')
+    rendered = force or not os.path.exists(index_path)
+    if rendered:
+        index = {
+            'layoutId': layout_id,
+            'version': version,
+            'hash': digest,
+            'bounds': [round(v, 1) for v in overview.bounds()],
+            'sections': len(overview.sections),
+            'seats': int(len(overview.xs)),
+            'files': render_all(overview, directory, widths),
+        }
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+    else:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+
+    with open(os.path.join(base, 'latest.json'), 'w', encoding='utf-8') as f:
+        json.dump({'version': version, 'hash': digest, 'path': digest}, f)
+    return index, rendered
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Imagenes de vista general (PNG/WebP/SVG) de un layout')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--layout', help='Id del VenueLayout en la DB')
+    source.add_argument('--file', help='Respuesta de layout en JSON (p. ej. layout-data.json)')
+    parser.add_argument('--output', default=OUTPUT_DIR, help=f'Directorio base (default: {OUTPUT_DIR})')
+    parser.add_argument('--widths', type=lambda v: tuple(int(w) for w in v.split(',')), default=WIDTHS,
+                        help='Anchos en pixeles separados por coma (default: 480,960,1920)')
+    parser.add_argument('--force', action='store_true', help='Redibujar aunque ya exista en cache')
+    args = parser.parse_args()
+
+    if args.layout:
+        overview, version, digest = load_from_db(get_pool(size=1), args.layout)
+        layout_id = args.layout
+    else:
+        overview, version, layout_id, digest = load_from_file(args.file)
+
+    index, rendered = write_overview(overview, args.output, layout_id, version, digest, args.widths, args.force)
+    status = 'generada' if rendered else 'ya estaba en cache'
+    print(f"Vista general v{version} ({digest}) {status}: {index['sections']} secciones, {index['seats']} asientos")
+    for entry in index['files']:
+        print(f"  {entry['file']}")
+    if Image is None:
+        print('  (sin WebP: Pillow no esta instalado)')
+
+
+if __name__ == '__main__':
+    main()
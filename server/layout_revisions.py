@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Historial de versiones de VenueLayout.layoutJson por deltas (tabla
+LayoutRevision, migracion 20261018_add_layout_revisions).
+
+Cada BASE_INTERVAL versiones se guarda el documento completo (kind = 'base');
+las versiones intermedias guardan solo el JSON Patch (RFC 6902) contra la
+revision anterior (kind = 'delta'). Para reconstruir una version se toma la
+base mas cercana hacia atras y se aplican sus deltas en orden. Cada revision
+guarda el sha256 del documento canonico para verificar la reconstruccion.
+
+VenueLayout.layoutJson sigue siendo la version actual completa (la que lee el
+servidor); este historial reemplaza las copias completas por version. El
+guardado del editor escribe el mismo formato (src/utils/layoutRevisions.ts).
+
+    python3 layout_revisions.py log <layoutId> [--limit 20] [--before 40]
+    python3 layout_revisions.py show <layoutId> <version> [salida.json]
+    python3 layout_revisions.py diff <layoutId> <desde> <hasta>
+    python3 layout_revisions.py save <layoutId> layout.json
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import uuid
+
+from blob_codec import decode_blob
+from boletera_db import get_pool
+
+BASE_INTERVAL = 20
+
+
+# ---------------------------------------------------------------------------
+# JSON Pointer / JSON Patch
+# ---------------------------------------------------------------------------
+
+def _escape(token):
+    return str(token).replace('~', '~0').replace('/', '~1')
+
+
+def _unescape(token):
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def _pointer(path):
+    return ''.join('/' + _escape(token) for token in path)
+
+
+def _parse_pointer(pointer):
+    if pointer == '':
+        return []
+    if not pointer.startswith('/'):
+        raise ValueError(f'JSON Pointer invalido: {pointer!r}')
+    return [_unescape(token) for token in pointer[1:].split('/')]
+
+
+def _same(a, b):
+    # 1 == 1.0 == True en Python, pero no en JSON
+    return type(a) is type(b) and a == b
+
+
+def _diff_value(old, new, path, ops):
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append({'op': 'remove', 'path': _pointer(path + [key])})
+        for key, value in new.items():
+            if key in old:
+                _diff_value(old[key], value, path + [key], ops)
+            else:
+                ops.append({'op': 'add', 'path': _pointer(path + [key]), 'value': value})
+    elif isinstance(old, list) and isinstance(new, list):
+        _diff_list(old, new, path, ops)
+    elif not _same(old, new):
+        ops.append({'op': 'replace', 'path': _pointer(path), 'value': new})
+
+
+def _diff_list(old, new, path, ops):
+    """
+    Prefijo y sufijo comunes quedan fuera del patch; en el tramo que cambia se
+    comparan elemento por elemento y lo que sobra se quita (desde el final,
+    para que los indices sigan validos) o se agrega.
+    """
+    start = 0
+    limit = min(len(old), len(new))
+    while start < limit and _same_tree(old[start], new[start]):
+        start += 1
+    old_end, new_end = len(old), len(new)
+    while old_end > start and new_end > start and _same_tree(old[old_end - 1], new[new_end - 1]):
+        old_end -= 1
+        new_end -= 1
+
+    common = min(old_end, new_end) - start
+    for i in range(start, start + common):
+        _diff_value(old[i], new[i], path + [i], ops)
+    for i in range(old_end - 1, start + common - 1, -1):
+        ops.append({'op': 'remove', 'path': _pointer(path + [i])})
+    for i in range(start + common, new_end):
+        ops.append({'op': 'add', 'path': _pointer(path + [i]), 'value': new[i]})
+
+
+def _same_tree(a, b):
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_same_tree(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_same_tree(x, y) for x, y in zip(a, b))
+    return _same(a, b)
+
+
+def make_patch(old, new):
+    """JSON Patch (lista de operaciones) que convierte old en new"""
+    ops = []
+    _diff_value(old, new, [], ops)
+    return ops
+
+
+def _resolve(doc, tokens):
+    target = doc
+    for token in tokens:
+        if isinstance(target, list):
+            target = target[int(token)]
+        elif isinstance(target, dict):
+            target = target[token]
+        else:
+            raise ValueError(f'Ruta invalida en el patch: {_pointer(tokens)}')
+    return target
+
+
+def _container(doc, pointer):
+    tokens = _parse_pointer(pointer)
+    if not tokens:
+        return None, None
+    return _resolve(doc, tokens[:-1]), tokens[-1]
+
+
+def _get(doc, pointer):
+    try:
+        return _resolve(doc, _parse_pointer(pointer))
+    except (KeyError, IndexError, ValueError) as e:
+        raise ValueError(f'Ruta inexistente en el patch: {pointer}') from e
+
+
+def _add(doc, pointer, value):
+    parent, key = _container(doc, pointer)
+    if parent is None:
+        return value
+    if isinstance(parent, list):
+        index = len(parent) if key == '-' else int(key)
+        if not 0 <= index <= len(parent):
+            raise ValueError(f'Indice fuera de rango en el patch: {pointer}')
+        parent.insert(index, value)
+    else:
+        parent[key] = value
+    return doc
+
+
+def _remove(doc, pointer):
+    parent, key = _container(doc, pointer)
+    if parent is None:
+        raise ValueError('No se puede quitar la raiz del documento')
+    try:
+        if isinstance(parent, list):
+            return parent.pop(int(key))
+        return parent.pop(key)
+    except (KeyError, IndexError) as e:
+        raise ValueError(f'Ruta inexistente en el patch: {pointer}') from e
+
+
+def apply_patch(doc, ops):
+    """
+    Aplicar un JSON Patch sobre doc (se modifica en su lugar) y regresar el
+    documento resultante. Soporta add, remove, replace, move, copy y test.
+    """
+    for op in ops:
+        kind = op['op']
+        path = op['path']
+        if kind == 'add':
+            doc = _add(doc, path, op['value'])
+        elif kind == 'remove':
+            _remove(doc, path)
+        elif kind == 'replace':
+            if path == '':
+                doc = op['value']
+            else:
+                _get(doc, path)
+                _remove(doc, path)
+                doc = _add(doc, path, op['value'])
+        elif kind == 'move':
+            value = _remove(doc, op['from'])
+            doc = _add(doc, path, value)
+        elif kind == 'copy':
+            doc = _add(doc, path, json.loads(json.dumps(_get(doc, op['from']))))
+        elif kind == 'test':
+            if not _same_tree(_get(doc, path), op['value']):
+                raise ValueError(f'Fallo la prueba del patch en {path}')
+        else:
+            raise ValueError(f'Operacion de patch no soportada: {kind}')
+    return doc
+
+
+def canonical_sha(doc):
+    text = json.dumps(doc, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Tabla LayoutRevision
+# ---------------------------------------------------------------------------
+
+def _fetch(db, sql, params, cursor=None):
+    """Filas de sql; con cursor se leen dentro de esa transaccion (ve lo que aun no se confirma)"""
+    if cursor is None:
+        return db.query(sql, params)
+    cursor.execute(sql, params)
+    return cursor.fetchall()
+
+
+def _fetch_one(db, sql, params, cursor=None):
+    rows = _fetch(db, sql, params, cursor)
+    return rows[0] if rows else None
+
+
+def latest_revision(db, layout_id, cursor=None):
+    """(version, kind, baseVersion) de la ultima revision, o None"""
+    return _fetch_one(
+        db,
+        'SELECT version, kind, baseVersion FROM LayoutRevision '
+        'WHERE layoutId = %s ORDER BY version DESC LIMIT 1',
+        (layout_id,), cursor
+    )
+
+
+def list_revisions(db, layout_id, limit=20, before=None):
+    """Pagina de revisiones (sin payload), de la mas nueva a la mas vieja"""
+    sql = ('SELECT id, version, kind, baseVersion, size, sha256, createdBy, createdAt '
+           'FROM LayoutRevision WHERE layoutId = %s')
+    params = [layout_id]
+    if before is not None:
+        sql += ' AND version < %s'
+        params.append(before)
+    sql += ' ORDER BY version DESC LIMIT %s'
+    params.append(limit)
+    return db.query_dicts(sql, params)
+
+
+def reconstruct(db, layout_id, version, verify=True, cursor=None):
+    """Documento layoutJson (dict) de una version"""
+    base = _fetch_one(
+        db,
+        'SELECT version, payload FROM LayoutRevision '
+        "WHERE layoutId = %s AND kind = 'base' AND version <= %s "
+        'ORDER BY version DESC LIMIT 1',
+        (layout_id, version), cursor
+    )
+    if not base:
+        raise LookupError(f'No hay revision base para {layout_id} v{version}')
+    doc = json.loads(base[1])
+
+    sha = None
+    sql = ('SELECT version, payload, sha256 FROM LayoutRevision '
+           "WHERE layoutId = %s AND kind = 'delta' AND version > %s AND version <= %s "
+           'ORDER BY version')
+    params = (layout_id, base[0], version)
+    deltas = db.stream(sql, params) if cursor is None else _fetch(db, sql, params, cursor)
+    last = base[0]
+    for delta_version, payload, sha in deltas:
+        doc = apply_patch(doc, json.loads(payload))
+        last = delta_version
+    if last != version:
+        raise LookupError(f'No existe la revision {version} de {layout_id}')
+
+    if verify:
+        if sha is None:
+            sha = _fetch_one(
+                db,
+                'SELECT sha256 FROM LayoutRevision WHERE layoutId = %s AND version = %s',
+                (layout_id, version), cursor
+            )[0]
+        if canonical_sha(doc) != sha:
+            raise ValueError(f'La reconstruccion de {layout_id} v{version} no coincide con su sha256')
+    return doc
+
+
+def diff_versions(db, layout_id, from_version, to_version):
+    """JSON Patch de from_version a to_version"""
+    return make_patch(reconstruct(db, layout_id, from_version),
+                      reconstruct(db, layout_id, to_version))
+
+
+def _insert_revision(cursor, layout_id, version, kind, base_version, payload, sha, created_by):
+    cursor.execute(
+        'INSERT INTO LayoutRevision (id, layoutId, version, kind, baseVersion, payload, sha256, size, createdBy, createdAt) '
+        'VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(3))',
+        (str(uuid.uuid4()), layout_id, version, kind, base_version, payload, sha, len(payload), created_by)
+    )
+
+
+def ensure_base(db, layout_id, created_by=None, cursor=None):
+    """
+    Si el layout aun no tiene historial, guardar su layoutJson actual como
+    base en su version actual. Regresa la ultima revision. Con cursor todo
+    corre en esa transaccion.
+    """
+    if cursor is None:
+        with db.transaction() as cursor:
+            return ensure_base(db, layout_id, created_by, cursor)
+    latest = latest_revision(db, layout_id, cursor)
+    if latest:
+        return latest
+    row = _fetch_one(db, 'SELECT version, layoutJson FROM VenueLayout WHERE id = %s', (layout_id,), cursor)
+    if not row:
+        raise LookupError(f'No existe el layout {layout_id}')
+    version, text = row
+    doc = json.loads(decode_blob(text) or '{}')
+    _insert_revision(cursor, layout_id, version, 'base', version,
+                     json.dumps(doc, ensure_ascii=False), canonical_sha(doc), created_by)
+    return (version, 'base', version)
+
+
+def save_revision(db, layout_id, doc, created_by=None, base_interval=BASE_INTERVAL, previous=None,
+                  cursor=None):
+    """
+    Registrar doc como nueva version del layout: se guarda solo el delta
+    contra la ultima revision, o una base completa cada base_interval
+    versiones. previous es el documento de la ultima revision si ya se tiene
+    (evita reconstruirlo). Tambien sube VenueLayout.version. Con cursor va
+    en la misma transaccion que el cambio del layoutJson.
+    Regresa (version, kind, tamano del payload).
+    """
+    if cursor is None:
+        with db.transaction() as cursor:
+            return save_revision(db, layout_id, doc, created_by, base_interval, previous, cursor)
+    latest_version, _, base_version = ensure_base(db, layout_id, created_by, cursor)
+    current = _fetch_one(db, 'SELECT version FROM VenueLayout WHERE id = %s FOR UPDATE', (layout_id,), cursor)
+    version = max(latest_version, current[0] if current else 0) + 1
+
+    if version - base_version >= base_interval:
+        kind, base_version = 'base', version
+        payload = json.dumps(doc, ensure_ascii=False)
+    else:
+        if previous is None:
+            previous = reconstruct(db, layout_id, latest_version, cursor=cursor)
+        kind = 'delta'
+        payload = json.dumps(make_patch(previous, doc), ensure_ascii=False)
+
+    _insert_revision(cursor, layout_id, version, kind, base_version, payload,
+                     canonical_sha(doc), created_by)
+    cursor.execute('UPDATE VenueLayout SET version = %s WHERE id = %s', (version, layout_id))
+    return version, kind, len(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Historial de versiones de layoutJson por deltas')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    log = sub.add_parser('log', help='Listar revisiones')
+    log.add_argument('layout')
+    log.add_argument('--limit', type=int, default=20)
+    log.add_argument('--before', type=int, help='Solo versiones menores a esta')
+
+    show = sub.add_parser('show', help='Reconstruir una version')
+    show.add_argument('layout')
+    show.add_argument('version', type=int)
+    show.add_argument('output', nargs='?', help='Archivo de salida (default: stdout)')
+
+    diff = sub.add_parser('diff', help='JSON Patch entre dos versiones')
+    diff.add_argument('layout')
+    diff.add_argument('from_version', type=int)
+    diff.add_argument('to_version', type=int)
+
+    save = sub.add_parser('save', help='Registrar un layout.json como nueva version')
+    save.add_argument('layout')
+    save.add_argument('file')
+    save.add_argument('--created-by')
+
+    args = parser.parse_args()
+    db = get_pool(size=1)
+
+    if args.command == 'log':
+        for row in list_revisions(db, args.layout, args.limit, args.before):
+            print(f"v{row['version']:<5} {row['kind']:5} base v{row['baseVersion']:<5} "
+                  f"{row['size']:>10} chars  {row['createdAt']}  {row['createdBy'] or ''}")
+    elif args.command == 'show':
+        doc = reconstruct(db, args.layout, args.version)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(doc, f, ensure_ascii=False)
+            print(f'Version {args.version} guardada en {args.output}')
+        else:
+            json.dump(doc, sys.stdout, ensure_ascii=False)
+    elif args.command == 'diff':
+        json.dump(diff_versions(db, args.layout, args.from_version, args.to_version),
+                  sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    elif args.command == 'save':
+        with open(args.file, 'r', encoding='utf-8') as f:
+            doc = json.load(f)
+        version, kind, size = save_revision(db, args.layout, doc, args.created_by)
+        print(f'Revision v{version} guardada ({kind}, {size} chars)')
+
+
+if __name__ == '__main__':
+    main()
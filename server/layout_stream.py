@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Lectura y escritura incremental de VenueLayout.layoutJson.
+
+El layoutJson se lee por pedazos (SUBSTRING en la DB o bloques de un
+archivo) y solo se decodifica un objeto de canvas.objects a la vez; el resto
+del documento pasa como texto sin interpretar. Para guardar, la DB arma el
+nuevo valor con SUBSTRING del valor actual para las partes que no cambian,
+asi que al servidor solo se envian los asientos nuevos.
+
+Si el layoutJson esta guardado como sobre comprimido (blob_codec.py) se
+decodifica al vuelo; al guardar se arma el documento localmente y se vuelve
+a comprimir, que pesa menos que los asientos sin comprimir.
+"""
+
+import hashlib
+import io
+import json
+
+from blob_codec import HEADER_LEN, decode_chunks, encode_blob, is_encoded
+from compact_seats import COMPACT_TYPE, seat_count
+
+CHUNK_CHARS = 1 << 20
+OBJECTS_PATH = ('canvas', 'objects')
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+def iter_stored_chunks(db, layout_id, chunk_chars=CHUNK_CHARS):
+    """Pedazos del valor guardado en layoutJson, leidos con SUBSTRING (posiciones en caracteres)"""
+    pos = 1
+    while True:
+        chunk = db.query_value(
+            'SELECT SUBSTRING(layoutJson, %s, %s) FROM VenueLayout WHERE id = %s',
+            (pos, chunk_chars, layout_id)
+        )
+        if not chunk:
+            return
+        yield chunk
+        pos += len(chunk)
+
+
+def iter_layout_chunks(db, layout_id, chunk_chars=CHUNK_CHARS):
+    """Pedazos del layoutJson ya decodificado si esta comprimido"""
+    return decode_chunks(iter_stored_chunks(db, layout_id, chunk_chars))
+
+
+def iter_file_chunks(path, chunk_chars=CHUNK_CHARS):
+    with open(path, 'r', encoding='utf-8') as f:
+        while True:
+            chunk = f.read(chunk_chars)
+            if not chunk:
+                return
+            yield chunk
+
+
+class _Buffer:
+    """Ventana sobre el documento: text empieza en la posicion base"""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.text = ''
+        self.base = 0
+        self.pos = 0        # relativo a text
+        self.eof = False
+        self.sha = hashlib.sha256()
+
+    def more(self, at_least=1):
+        read = 0
+        while read < at_least and not self.eof:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                self.eof = True
+                break
+            self.sha.update(chunk.encode('utf-8'))
+            self.text += chunk
+            read += len(chunk)
+        return read > 0
+
+    def peek(self):
+        self.skip_ws()
+        if self.pos >= len(self.text) and not self.more():
+            raise ValueError('layoutJson incompleto')
+        return self.text[self.pos]
+
+    def skip_ws(self):
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text) or not self.more():
+                return
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f'Se esperaba {char!r} en la posicion {self.offset}')
+        self.pos += 1
+
+    def decode(self):
+        """Decodificar el siguiente valor JSON; regresa (valor, inicio, fin)"""
+        self.skip_ws()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+                # Un numero al final del buffer puede seguir en el siguiente pedazo
+                if end < len(self.text) or self.eof:
+                    start = self.offset
+                    self.pos = end
+                    return value, start, self.offset
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Valor incompleto: leer al menos lo que ya hay para no repetir O(n^2)
+            self.more(max(len(self.text) - self.pos, 1))
+
+    def take(self):
+        """Regresar el texto ya consumido y soltarlo del buffer"""
+        consumed = self.text[:self.pos]
+        self.base += self.pos
+        self.text = self.text[self.pos:]
+        self.pos = 0
+        return consumed
+
+    def drop(self):
+        self.take()
+
+    @property
+    def offset(self):
+        return self.base + self.pos
+
+
+def _find_path(buf, path, out):
+    """Avanzar hasta el '[' del arreglo en path; el texto anterior va a out"""
+    if not path:
+        buf.expect('[')
+        out.append(buf.take())
+        return
+    buf.expect('{')
+    while True:
+        if buf.peek() == '}':
+            raise ValueError(f'No se encontro la llave {path[0]!r} en el JSON')
+        key, _, _ = buf.decode()
+        buf.expect(':')
+        if key == path[0]:
+            _find_path(buf, path[1:], out)
+            return
+        buf.decode()
+        out.append(buf.take())
+        if buf.peek() == ',':
+            buf.pos += 1
+
+
+def iter_layout_events(chunks, path=OBJECTS_PATH):
+    """
+    Recorrer un layoutJson por pedazos. Produce:
+      ('raw', texto)                    texto fuera de los elementos del arreglo
+      ('start', offset)                 inicio del contenido del arreglo (despues de '[')
+      ('item', inicio, fin, texto, obj) cada elemento de canvas.objects
+      ('close', offset)                 posicion del ']' que cierra el arreglo
+      ('done', sha256)                  hash de todo el documento
+    Los offsets son en caracteres desde 0. Los separadores entre elementos
+    no se reportan.
+    """
+    buf = _Buffer(chunks)
+    out = []
+    _find_path(buf, path, out)
+    for text in out:
+        yield ('raw', text)
+    yield ('start', buf.offset)
+
+    if buf.peek() != ']':
+        while True:
+            obj, start, end = buf.decode()
+            yield ('item', start, end, buf.text[buf.pos - (end - start):buf.pos], obj)
+            buf.drop()
+            if buf.peek() != ',':
+                break
+            buf.pos += 1
+            buf.drop()
+    buf.drop()
+    yield ('close', buf.offset)
+    buf.expect(']')
+    yield ('raw', buf.take())
+    while True:
+        if buf.text:
+            yield ('raw', buf.text)
+            buf.base += len(buf.text)
+            buf.text = ''
+        if not buf.more():
+            break
+    yield ('done', buf.sha.hexdigest())
+
+
+def iter_canvas_objects(chunks):
+    """Solo los objetos de canvas.objects, uno por uno"""
+    for event in iter_layout_events(chunks):
+        if event[0] == 'item':
+            yield event[4]
+
+
+def iter_json_array(chunks):
+    """Elementos de un archivo que es un arreglo JSON (p. ej. seats_for_canvas.json)"""
+    for event in iter_layout_events(chunks, path=()):
+        if event[0] == 'item':
+            yield event[4]
+
+
+def is_seat(obj):
+    """Asiento suelto o bloque compactSeats (ver compact_seats.py)"""
+    return isinstance(obj, dict) and obj.get('_customType') in ('seat', COMPACT_TYPE)
+
+
+def seats_json(new_seats):
+    """Texto de los asientos nuevos como elementos de un arreglo (sin corchetes)"""
+    return ', '.join(json.dumps(seat, ensure_ascii=False) for seat in new_seats)
+
+
+def write_merged(chunks, new_seats, f):
+    """
+    Escribir en f el layout con los asientos reemplazados por new_seats, sin
+    cargar el documento completo. Regresa (objetos conservados, asientos
+    quitados, asientos agregados); un bloque compacto cuenta todos sus asientos.
+    """
+    kept = removed = added = 0
+    for event in iter_layout_events(chunks):
+        kind = event[0]
+        if kind == 'raw':
+            f.write(event[1])
+        elif kind == 'item':
+            if is_seat(event[4]):
+                removed += seat_count(event[4])
+                continue
+            f.write((', ' if kept else '') + event[3])
+            kept += 1
+        elif kind == 'close':
+            first = not kept
+            for seat in new_seats:
+                f.write(('' if first else ', ') + json.dumps(seat, ensure_ascii=False))
+                first = False
+                added += seat_count(seat)
+    return kept, removed, added
+
+
+def plan_splice(chunks, keep_objects=False):
+    """
+    Ubicar en el layoutJson los tramos de objetos que no son asientos.
+    Regresa un dict con los offsets (0-based) del contenido del arreglo, los
+    tramos conservados, cuantos asientos habia y el sha256 del documento.
+    Con keep_objects tambien guarda el texto fuera de canvas.objects
+    ('skeleton') y los objetos conservados ('objects'), para armar el nuevo
+    documento con merged_document sin volver a leerlo.
+    """
+    plan = {'start': None, 'end': None, 'runs': [], 'kept': 0, 'seats': 0, 'sha256': None}
+    if keep_objects:
+        plan['skeleton'] = []
+        plan['objects'] = []
+    run = None
+    for event in iter_layout_events(chunks):
+        kind = event[0]
+        if kind == 'raw' and keep_objects:
+            plan['skeleton'].append(event[1])
+        elif kind == 'start':
+            plan['start'] = event[1]
+        elif kind == 'item':
+            _, start, end, _, obj = event
+            if is_seat(obj):
+                plan['seats'] += seat_count(obj)
+                if run:
+                    plan['runs'].append(run)
+                    run = None
+            else:
+                plan['kept'] += 1
+                run = (run[0], end) if run else (start, end)
+                if keep_objects:
+                    plan['objects'].append(obj)
+        elif kind == 'close':
+            if run:
+                plan['runs'].append(run)
+            plan['end'] = event[1]
+        elif kind == 'done':
+            plan['sha256'] = event[1]
+    return plan
+
+
+def merged_document(plan, new_seats):
+    """Documento (dict) del layout con los asientos reemplazados, de un plan con keep_objects"""
+    doc = json.loads(''.join(plan['skeleton']))
+    target = doc
+    for key in OBJECTS_PATH[:-1]:
+        target = target[key]
+    target[OBJECTS_PATH[-1]] = plan['objects'] + list(new_seats)
+    return doc
+
+
+def splice_sql(plan, layout_id, new_seats_text):
+    """
+    UPDATE que arma el nuevo layoutJson en el servidor: prefijo, tramos
+    conservados y sufijo salen del valor actual con SUBSTRING; solo el
+    texto de los asientos nuevos va como parametro. El UPDATE no hace nada
+    si el layout cambio desde que se leyo (sha256 distinto).
+    """
+    parts = ['SUBSTRING(layoutJson, 1, %s)']
+    params = [plan['start']]
+    pieces = []
+    for start, end in plan['runs']:
+        pieces.append(('SUBSTRING(layoutJson, %s, %s)', [start + 1, end - start]))
+    if new_seats_text:
+        pieces.append(('%s', [new_seats_text]))
+    for i, (sql, piece_params) in enumerate(pieces):
+        if i:
+            parts.append("', '")
+        parts.append(sql)
+        params.extend(piece_params)
+    parts.append('SUBSTRING(layoutJson, %s)')
+    params.append(plan['end'] + 1)
+
+    sql = (f"UPDATE VenueLayout SET layoutJson = CONCAT({', '.join(parts)}) "
+           f"WHERE id = %s AND SHA2(layoutJson, 256) = %s")
+    return sql, params + [layout_id, plan['sha256']]
+
+
+def _replace_encoded_seats(db, layout_id, new_seats, cursor=None, document=False):
+    """replace_layout_seats para un layoutJson guardado como sobre comprimido"""
+    stored = ''.join(iter_stored_chunks(db, layout_id))
+    out = io.StringIO()
+    kept, removed, _ = write_merged(decode_chunks([stored]), new_seats, out)
+    sql = 'UPDATE VenueLayout SET layoutJson = %s WHERE id = %s AND SHA2(layoutJson, 256) = %s'
+    params = (encode_blob(out.getvalue()), layout_id, hashlib.sha256(stored.encode('utf-8')).hexdigest())
+    if not db.execute(sql, params, cursor):
+        raise RuntimeError(f'El layout {layout_id} cambio mientras se leia; vuelve a intentar')
+    plan = {'kept': kept, 'seats': removed}
+    if document:
+        plan['document'] = json.loads(out.getvalue())
+    return plan
+
+
+def replace_layout_seats(db, layout_id, new_seats, cursor=None, document=False):
+    """
+    Reemplazar los asientos de canvas.objects en la DB por new_seats. Con
+    cursor el UPDATE va en esa transaccion. Regresa el plan (objetos
+    conservados, asientos anteriores); con document incluye en 'document' el
+    nuevo layoutJson ya decodificado, armado en la misma pasada de lectura.
+    """
+    head = db.query_value('SELECT LEFT(layoutJson, %s) FROM VenueLayout WHERE id = %s', (HEADER_LEN, layout_id))
+    if is_encoded(head):
+        return _replace_encoded_seats(db, layout_id, new_seats, cursor, document)
+    plan = plan_splice(iter_stored_chunks(db, layout_id), keep_objects=document)
+    sql, params = splice_sql(plan, layout_id, seats_json(new_seats))
+    if not db.execute(sql, params, cursor):
+        raise RuntimeError(f'El layout {layout_id} cambio mientras se leia; vuelve a intentar')
+    if document:
+        plan['document'] = merged_document(plan, new_seats)
+        del plan['skeleton'], plan['objects']
+    return plan
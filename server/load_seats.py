@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Carga masiva de asientos generados con generate_seats_db_v3.py --bulk.
+Borra los asientos del venue (o solo de las secciones regeneradas) y carga
+el archivo TSV con LOAD DATA LOCAL INFILE en una sola transaccion. Si el
+servidor o el cliente tienen deshabilitado local_infile, inserta los mismos
+datos con INSERTs parametrizados en lotes. Despues de cargar marca como
+aplicado el cache de --incremental de esa generacion.
+"""
+
+import argparse
+import json
+
+import pymysql
+
+from boletera_db import get_pool
+from generate_seats_db_v3 import commit_section_caches
+from seat_sinks import SEAT_COLUMNS, read_tsv
+
+MANIFEST_PATH = '/tmp/seats_bulk.json'
+
+# Errores de MySQL cuando LOAD DATA LOCAL no esta permitido
+LOCAL_INFILE_DISABLED = {
+    1148,  # ER_NOT_ALLOWED_COMMAND
+    2068,  # CR_LOAD_DATA_LOCAL_INFILE_REJECTED
+    3948,  # ER_CLIENT_LOCAL_FILES_DISABLED
+    3950,  # ER_LOAD_DATA_LOCAL_INFILE_DISABLED (cliente)
+}
+
+COLUMNS_SQL = ', '.join(SEAT_COLUMNS)
+
+
+def delete_existing(cursor, manifest):
+    if manifest.get('sectionIds') is None:
+        cursor.execute('DELETE FROM Seat WHERE venueId = %s', (manifest['venueId'],))
+        return cursor.rowcount
+    deleted = 0
+    for section_id in manifest['sectionIds']:
+        cursor.execute(
+            'DELETE FROM Seat WHERE venueId = %s AND id LIKE %s',
+            (manifest['venueId'], f'seat-{section_id}-%')
+        )
+        deleted += cursor.rowcount
+    return deleted
+
+
+def load_data_infile(cursor, path):
+    cursor.execute(
+        f"LOAD DATA LOCAL INFILE %s INTO TABLE Seat CHARACTER SET utf8mb4 "
+        f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+        f"({COLUMNS_SQL}) SET createdAt = NOW(), updatedAt = NOW()",
+        (path,)
+    )
+    return cursor.rowcount
+
+
+def insert_batches(db, cursor, path):
+    """Alternativa sin LOAD DATA: INSERTs parametrizados por lotes"""
+    placeholders = ', '.join(['%s'] * len(SEAT_COLUMNS))
+    query = f'INSERT INTO Seat ({COLUMNS_SQL}, createdAt, updatedAt) VALUES ({placeholders}, NOW(), NOW())'
+    return db.executemany(query, read_tsv(path), cursor=cursor)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Carga masiva de asientos (LOAD DATA LOCAL INFILE)')
+    parser.add_argument('--manifest', default=MANIFEST_PATH,
+                        help=f'Manifiesto escrito por generate_seats_db_v3.py --bulk (default: {MANIFEST_PATH})')
+    parser.add_argument('--no-infile', action='store_true',
+                        help='No intentar LOAD DATA; usar INSERTs parametrizados')
+    args = parser.parse_args()
+
+    with open(args.manifest, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    path = manifest['file']
+
+    db = get_pool(size=1, local_infile=not args.no_infile)
+    with db.transaction() as cursor:
+        deleted = delete_existing(cursor, manifest)
+        print(f'Asientos eliminados: {deleted}')
+
+        loaded = None
+        if not args.no_infile:
+            try:
+                loaded = load_data_infile(cursor, path)
+                print(f'LOAD DATA LOCAL INFILE: {loaded} asientos')
+            except pymysql.err.MySQLError as e:
+                if not e.args or e.args[0] not in LOCAL_INFILE_DISABLED:
+                    raise
+                print(f'LOAD DATA LOCAL deshabilitado ({e.args[0]}), usando INSERTs por lotes')
+        if loaded is None:
+            loaded = insert_batches(db, cursor, path)
+            print(f'INSERTs por lotes: {loaded} asientos')
+
+        # Un error aqui hace rollback de toda la carga
+        if manifest.get('rows') is not None and loaded != manifest['rows']:
+            raise RuntimeError(f"Se cargaron {loaded} asientos pero el archivo tiene {manifest['rows']}")
+
+    print('Asientos cargados correctamente!')
+    # Hasta ahora las huellas de --incremental corresponden a lo que hay en la DB
+    commit_section_caches()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Extraccion en lote de PDFs de zonificacion: reparte las paginas de todos
+los PDFs de uno o varios directorios entre un pool de procesos y deja el
+indice de cada PDF en el cache de pdf_spans.py (el mismo .npz que arma
+load_spans), asi que despues pdf_rows.py, pdf_register.py y los analyze_*
+ya no llaman a fitz.
+
+Cada tarea es una pagina; el proceso principal junta las paginas de cada
+PDF en cuanto terminan todas y guarda su indice. Se reporta el tiempo de
+cada pagina y el total contra la suma de las paginas (lo que se gano con el
+pool). Los PDFs que ya estan en cache no se vuelven a leer (salvo --force).
+
+    python3 pdf_batch.py planos/ --jobs 8
+    python3 pdf_batch.py arena.pdf teatro.pdf --report /tmp/pdf_batch.json
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from file_cache import file_sha256
+from pdf_spans import CACHE_DIR, SpanIndex, cache_path, extract_spans, merge_spans, page_count
+
+
+def find_pdfs(paths):
+    """PDFs de los argumentos (archivos o directorios, recursivo), sin repetir"""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                found.extend(os.path.join(root, name) for name in sorted(files) if name.lower().endswith('.pdf'))
+        else:
+            found.append(path)
+    seen = set()
+    return [p for p in found if not (os.path.abspath(p) in seen or seen.add(os.path.abspath(p)))]
+
+
+def extract_page(pdf_path, page_num):
+    """(pdf, pagina, columnas, segundos); se ejecuta en el pool"""
+    start = time.perf_counter()
+    arrays = extract_spans(pdf_path, pages=[page_num])
+    return pdf_path, page_num, arrays, time.perf_counter() - start
+
+
+def plan_jobs(pdfs, cache_dir, force=False):
+    """({pdf: (sha, paginas)} a extraer, [pdf en cache])"""
+    pending, cached = {}, []
+    for pdf in pdfs:
+        sha = file_sha256(pdf)
+        if not force and os.path.exists(cache_path(pdf, cache_dir, sha)):
+            cached.append(pdf)
+        else:
+            pending[pdf] = (sha, page_count(pdf))
+    return pending, cached
+
+
+def run_batch(pdfs, jobs=None, cache_dir=None, force=False, progress=print):
+    """
+    Extraer e indexar los PDFs. Regresa el reporte: {'files': [...], 'pages':
+    [{'file', 'page', 'spans', 'seconds'}], 'wall_seconds', 'cpu_seconds'}.
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    os.makedirs(cache_dir, exist_ok=True)
+    jobs = jobs or os.cpu_count() or 1
+    started = time.perf_counter()
+    pending, cached = plan_jobs(pdfs, cache_dir, force)
+    tasks = [(pdf, page) for pdf, (_, pages) in pending.items() for page in range(pages)]
+
+    parts = {pdf: {} for pdf in pending}
+    report = {'files': [], 'pages': [], 'jobs': jobs}
+    for pdf in cached:
+        report['files'].append({'file': pdf, 'cached': True})
+        progress(f'  en cache: {pdf}')
+
+    def finish(pdf, arrays):
+        sha, pages = pending[pdf]
+        spans = SpanIndex(arrays)
+        spans.save(cache_path(pdf, cache_dir, sha))
+        report['files'].append({'file': pdf, 'cached': False, 'pages': pages, 'spans': len(spans)})
+
+    # Sin paginas no hay tareas: se guarda su indice vacio para que quede en
+    # el reporte y no se vuelva a leer en la siguiente corrida
+    for pdf, (_, pages) in pending.items():
+        if not pages:
+            progress(f'  sin paginas: {pdf}')
+            finish(pdf, extract_spans(pdf, pages=[]))
+            del parts[pdf]
+
+    def collect(result):
+        pdf, page, arrays, seconds = result
+        parts[pdf][page] = arrays
+        report['pages'].append({'file': pdf, 'page': page, 'spans': len(arrays['text']),
+                                'seconds': round(seconds, 4)})
+        progress(f'  {os.path.basename(pdf)} p{page + 1}: {len(arrays["text"])} spans en {seconds * 1000:.0f} ms')
+        pages = pending[pdf][1]
+        if len(parts[pdf]) == pages:
+            done = parts.pop(pdf)
+            finish(pdf, merge_spans(done[p] for p in range(pages)))
+
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+            futures = [pool.submit(extract_page, pdf, page) for pdf, page in tasks]
+            for future in as_completed(futures):
+                collect(future.result())
+    else:
+        for pdf, page in tasks:
+            collect(extract_page(pdf, page))
+
+    report['pages'].sort(key=lambda p: (p['file'], p['page']))
+    report['wall_seconds'] = round(time.perf_counter() - started, 4)
+    report['cpu_seconds'] = round(sum(p['seconds'] for p in report['pages']), 4)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Indexar en paralelo las paginas de varios PDFs de zonificacion')
+    parser.add_argument('paths', nargs='+', help='PDFs o directorios con PDFs')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help=f'Procesos (default: {os.cpu_count() or 1}, todos los nucleos)')
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help=f'Directorio del indice (default: {CACHE_DIR})')
+    parser.add_argument('--force', action='store_true', help='Volver a extraer aunque este en cache')
+    parser.add_argument('--report', help='Guardar los tiempos por pagina en este JSON')
+    args = parser.parse_args()
+
+    pdfs = find_pdfs(args.paths)
+    if not pdfs:
+        print('No se encontraron PDFs')
+        return
+    print(f'{len(pdfs)} PDFs, {args.jobs} procesos')
+    report = run_batch(pdfs, args.jobs, args.cache_dir, args.force)
+
+    pages = report['pages']
+    if pages:
+        slowest = max(pages, key=lambda p: p['seconds'])
+        print(f"Paginas: {len(pages)}, spans: {sum(p['spans'] for p in pages)}")
+        print(f"Tiempo: {report['wall_seconds']:.2f} s (suma por pagina {report['cpu_seconds']:.2f} s, "
+              f"x{report['cpu_seconds'] / max(report['wall_seconds'], 1e-9):.1f})")
+        print(f"Pagina mas lenta: {os.path.basename(slowest['file'])} p{slowest['page'] + 1} ({slowest['seconds']:.2f} s)")
+    elif all(f['cached'] for f in report['files']):
+        print('Todo estaba en cache')
+    else:
+        print('No habia paginas que extraer')
+    print(f'Indices en {args.cache_dir}')
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f'Reporte guardado en {args.report}')
+
+
+if __name__ == '__main__':
+    main()
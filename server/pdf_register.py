@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Registro PDF -> canvas: ajusta por minimos cuadrados una transformacion afin
+(6 parametros) o proyectiva (8, homografia) entre las coordenadas del PDF de
+zonificacion y las del canvas, y con ella pasa de una vez todos los asientos
+que detecta pdf_rows.py a coordenadas del canvas. Asi un venue nuevo no
+necesita afinar poligonos a mano para que los asientos caigan en su lugar.
+
+Anclas (pares [x, y] del PDF -> [x, y] del canvas):
+
+  --anchors anclas.json   [[[px, py], [cx, cy]], ...] medidas a mano
+  automaticas             por cada seccion que esta en el PDF y en los
+                          poligonos (nombres sin acentos ni mayusculas, con
+                          tolerancia a erratas como "DERENCHA"): primero un
+                          ajuste con los centroides de cada seccion y despues
+                          las 4 esquinas (primer/ultimo asiento de la primera
+                          y ultima fila) contra donde seat_engine pondria esos
+                          asientos dentro del poligono
+
+El ajuste se repite quitando las anclas con residuo mayor a OUTLIER_FACTOR
+veces la mediana. Los poligonos salen de --polygons (JSON {seccion:
+[{x, y}, ...]}), de LayoutSection con --layout o, por default, de
+SECTIONS_POLYGONS de generate_seats_db_v3.py.
+
+La salida es la de pdf_rows.py con 'posiciones' en el canvas en lugar de
+'posiciones_pdf' y las secciones con el nombre del poligono;
+generate_seats_db_v3.py usa esas posiciones en lugar de interpolar dentro
+del poligono:
+
+    python3 pdf_register.py "ZONIFICACION RECORTE FINAL TEATRO DE LA CIUDAD.pdf" --output /tmp/tangamanga_seats.json
+    python3 pdf_register.py /tmp/pdfrows.json --layout ad44b249-... --kind projective
+"""
+
+import argparse
+import difflib
+import json
+import math
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+from generate_seats_db_v3 import SECTION_MAPPING, SECTIONS_POLYGONS, find_top_bottom_edges, order_edge_points
+from seat_engine import place_section_seats
+
+KINDS = ('affine', 'projective')
+MIN_ANCHORS = {'affine': 3, 'projective': 4}
+OUTLIER_FACTOR = 3.0
+MAX_OUTLIER_PASSES = 3
+NAME_CUTOFF = 0.8
+
+
+# ---------------------------------------------------------------------------
+# Transformaciones
+# ---------------------------------------------------------------------------
+
+def _as_points(points):
+    return np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+
+def _normalizer(points):
+    """Matriz que centra los puntos y deja su distancia media al centro en sqrt(2)"""
+    center = points.mean(axis=0)
+    spread = float(np.mean(np.hypot(*(points - center).T)))
+    scale = math.sqrt(2) / spread if spread > 0 else 1.0
+    return np.array([[scale, 0, -scale * center[0]], [0, scale, -scale * center[1]], [0, 0, 1]])
+
+
+def fit_transform(src, dst, kind='affine'):
+    """
+    Matriz 3x3 que lleva src a dst por minimos cuadrados. affine resuelve
+    [x y 1] A = [u v] con lstsq; projective es la DLT con los puntos
+    normalizados (sin eso la SVD queda mal condicionada con coordenadas en
+    cientos).
+    """
+    src, dst = _as_points(src), _as_points(dst)
+    if kind not in KINDS:
+        raise ValueError(f'Transformacion desconocida: {kind}')
+    if len(src) != len(dst) or len(src) < MIN_ANCHORS[kind]:
+        raise ValueError(f'{kind} necesita al menos {MIN_ANCHORS[kind]} pares de puntos (hay {len(src)})')
+
+    if kind == 'affine':
+        design = np.column_stack([src, np.ones(len(src))])
+        coef = np.linalg.lstsq(design, dst, rcond=None)[0]
+        matrix = np.eye(3)
+        matrix[:2] = coef.T
+        return matrix
+
+    t_src, t_dst = _normalizer(src), _normalizer(dst)
+    x, y = (src @ t_src[:2, :2].T + t_src[:2, 2]).T
+    u, v = (dst @ t_dst[:2, :2].T + t_dst[:2, 2]).T
+    one, zero = np.ones(len(x)), np.zeros(len(x))
+    system = np.vstack([
+        np.column_stack([x, y, one, zero, zero, zero, -u * x, -u * y, -u]),
+        np.column_stack([zero, zero, zero, x, y, one, -v * x, -v * y, -v]),
+    ])
+    # Con 4 pares el sistema es 8x9 y la SVD reducida no incluye el vector
+    # del nucleo; con mas filas basta la reducida (sin la U de 2n x 2n)
+    homography = np.linalg.svd(system, full_matrices=len(system) < 9)[2][-1].reshape(3, 3)
+    matrix = np.linalg.inv(t_dst) @ homography @ t_src
+    return matrix / matrix[2, 2]
+
+
+def apply_transform(matrix, points):
+    """Array (n, 2) con todos los puntos transformados en una operacion"""
+    points = _as_points(points)
+    mapped = points @ matrix[:, :2].T + matrix[:, 2]
+    return mapped[:, :2] / mapped[:, 2:3]
+
+
+def residuals(matrix, src, dst):
+    return np.hypot(*(apply_transform(matrix, src) - _as_points(dst)).T)
+
+
+def fit_robust(src, dst, kind='affine', outlier_factor=OUTLIER_FACTOR):
+    """(matriz, mascara de anclas usadas): ajusta y quita las anclas que no cuadran"""
+    src, dst = _as_points(src), _as_points(dst)
+    used = np.ones(len(src), dtype=bool)
+    matrix = fit_transform(src, dst, kind)
+    for _ in range(MAX_OUTLIER_PASSES):
+        error = residuals(matrix, src, dst)
+        limit = outlier_factor * max(float(np.median(error[used])), 1e-9)
+        keep = error <= limit
+        if keep.sum() < MIN_ANCHORS[kind] or (keep == used).all():
+            break
+        used = keep
+        matrix = fit_transform(src[used], dst[used], kind)
+    return matrix, used
+
+
+# ---------------------------------------------------------------------------
+# Anclas automaticas
+# ---------------------------------------------------------------------------
+
+def normalize_name(name):
+    text = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(text.upper().replace('SECC.', ' ').split())
+
+
+def match_sections(pdf_names, polygon_names, cutoff=NAME_CUTOFF):
+    """[(nombre en el PDF, nombre del poligono)]; primero exactos y luego por parecido"""
+    by_key = OrderedDict((normalize_name(name), name) for name in polygon_names)
+    pairs = []
+    for name in pdf_names:
+        key = normalize_name(name)
+        if key not in by_key:
+            close = difflib.get_close_matches(key, list(by_key), n=1, cutoff=cutoff)
+            if not close:
+                continue
+            key = close[0]
+        pairs.append((name, by_key.pop(key)))
+    return pairs
+
+
+def polygon_centroid(polygon):
+    """Centroide de area (formula del shoelace); el promedio de vertices si es degenerado"""
+    pts = np.array([[p['x'], p['y']] for p in polygon], dtype=np.float64)
+    x, y = pts.T
+    xn, yn = np.roll(x, -1), np.roll(y, -1)
+    cross = x * yn - xn * y
+    area = cross.sum() / 2
+    if abs(area) < 1e-9:
+        return pts.mean(axis=0)
+    return np.array([((x + xn) * cross).sum(), ((y + yn) * cross).sum()]) / (6 * area)
+
+
+def _corner_seats(filas):
+    """Primer y ultimo asiento de la primera y ultima fila, en coordenadas del PDF"""
+    first, last = filas[0]['posiciones_pdf'], filas[-1]['posiciones_pdf']
+    return np.array([first[0], first[-1], last[0], last[-1]], dtype=np.float64)
+
+
+def _expected_corners(polygon, filas):
+    """Donde seat_engine pondria esos mismos cuatro asientos dentro del poligono"""
+    top_edge, bottom_edge, _, _ = find_top_bottom_edges(polygon)
+    top_left, top_right = order_edge_points(top_edge)
+    bottom_left, bottom_right = order_edge_points(bottom_edge)
+    counts = [f['asientos'] for f in filas]
+    placed = place_section_seats(top_left, top_right, bottom_left, bottom_right, counts)
+    last_row = len(placed['x']) - counts[-1]
+    picks = [0, counts[0] - 1, last_row, len(placed['x']) - 1]
+    return np.column_stack([placed['x'][picks], placed['y'][picks]])
+
+
+def section_anchors(sections, polygons):
+    """
+    (src, dst, pares de secciones) con las anclas automaticas: centroides de
+    cada seccion y sus cuatro esquinas. Con suficientes secciones las
+    esquinas se emparejan por cercania despues de un primer ajuste con los
+    centroides (sirve aunque el canvas este girado o volteado respecto al
+    PDF); si no, en el mismo orden.
+    """
+    usable = [name for name, data in sections.items() if not name.startswith('_') and data.get('filas')
+              and all(f.get('posiciones_pdf') for f in data['filas'])]
+    pairs = match_sections(usable, polygons)
+    if not pairs:
+        raise ValueError('Ninguna seccion del PDF coincide con los poligonos')
+
+    centers_pdf = np.array([np.concatenate([f['posiciones_pdf'] for f in sections[pdf]['filas']]).mean(axis=0)
+                            for pdf, _ in pairs])
+    centers_canvas = np.array([polygon_centroid(polygons[canvas]) for _, canvas in pairs])
+    rough = fit_transform(centers_pdf, centers_canvas, 'affine') if len(pairs) >= MIN_ANCHORS['affine'] else None
+
+    src, dst = [centers_pdf], [centers_canvas]
+    for pdf, canvas in pairs:
+        corners = _corner_seats(sections[pdf]['filas'])
+        expected = _expected_corners(polygons[canvas], sections[pdf]['filas'])
+        if rough is not None:
+            mapped = apply_transform(rough, corners)
+            distance = np.hypot(*(mapped[:, None, :] - expected[None, :, :]).transpose(2, 0, 1))
+            expected = expected[np.argmin(distance, axis=1)]
+        src.append(corners)
+        dst.append(expected)
+    return np.vstack(src), np.vstack(dst), pairs
+
+
+# ---------------------------------------------------------------------------
+# Secciones
+# ---------------------------------------------------------------------------
+
+def map_sections(sections, matrix, names=None):
+    """
+    Copia de las secciones de pdf_rows con 'posiciones' en el canvas en
+    lugar de 'posiciones_pdf'. Todas las posiciones se transforman juntas y
+    luego se reparten por fila.
+    names: {nombre en el PDF: nombre en el canvas} para renombrar.
+    """
+    names = names or {}
+    filas = [(name, fila) for name, data in sections.items() if not name.startswith('_')
+             for fila in data['filas']]
+    counts = [len(fila.get('posiciones_pdf') or ()) for _, fila in filas]
+    pdf_points = [p for _, fila in filas for p in fila.get('posiciones_pdf') or ()]
+    mapped = np.round(apply_transform(matrix, pdf_points), 2) if pdf_points else np.zeros((0, 2))
+
+    result = OrderedDict()
+    offset = 0
+    for (name, fila), count in zip(filas, counts):
+        section = result.setdefault(names.get(name, name), {
+            key: value for key, value in sections[name].items() if key != 'filas'})
+        canvas_fila = {key: value for key, value in fila.items() if key != 'posiciones_pdf'}
+        canvas_fila['posiciones'] = mapped[offset:offset + count].tolist()
+        section.setdefault('filas', []).append(canvas_fila)
+        offset += count
+    return result
+
+
+def load_polygons(args):
+    """{nombre: [{x, y}, ...]} segun --polygons, --layout o los de generate_seats_db_v3.py"""
+    if args.polygons:
+        with open(args.polygons, 'r', encoding='utf-8') as f:
+            polygons = json.load(f, object_pairs_hook=OrderedDict)
+        return OrderedDict((name, [{'x': float(p[0]), 'y': float(p[1])} if isinstance(p, (list, tuple)) else p
+                                   for p in points]) for name, points in polygons.items())
+    if args.layout:
+        from blob_codec import decode_blob
+        from boletera_db import get_pool
+
+        rows = get_pool(size=1).query_dicts(
+            'SELECT name, polygonPoints FROM LayoutSection '
+            'WHERE parentLayoutId = %s AND isActive = 1 ORDER BY displayOrder, id',
+            (args.layout,)
+        )
+        polygons = OrderedDict()
+        for row in rows:
+            points = row['polygonPoints']
+            if isinstance(points, str):
+                points = json.loads(decode_blob(points) or '[]')
+            if points and len(points) >= 3:
+                polygons[row['name']] = points
+        return polygons
+    return OrderedDict((name, SECTIONS_POLYGONS[section_id]) for name, section_id in SECTION_MAPPING.items())
+
+
+def load_sections(source, page=0):
+    if source.lower().endswith('.json'):
+        with open(source, 'r', encoding='utf-8') as f:
+            return json.load(f, object_pairs_hook=OrderedDict)
+    from pdf_rows import detect_sections
+    from pdf_spans import load_spans
+
+    return detect_sections(load_spans(source), page)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pasar los asientos del PDF de zonificacion al canvas')
+    parser.add_argument('source', help='PDF de zonificacion o JSON de pdf_rows.py')
+    parser.add_argument('--page', type=int, default=0, help='Pagina del PDF (base 0, default: 0)')
+    parser.add_argument('--kind', choices=KINDS, default='affine', help='Transformacion (default: affine)')
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--polygons', help='JSON {seccion: [{x, y}, ...] o [[x, y], ...]} en coordenadas del canvas')
+    target.add_argument('--layout', help='Id del VenueLayout (poligonos de LayoutSection)')
+    parser.add_argument('--anchors', help='JSON [[[px, py], [cx, cy]], ...] en lugar de las anclas automaticas')
+    parser.add_argument('--output', help='Guardar las secciones con posiciones del canvas en este JSON')
+    args = parser.parse_args()
+
+    sections = load_sections(args.source, args.page)
+    polygons = load_polygons(args)
+    pairs = match_sections([name for name in sections if not name.startswith('_')], polygons)
+    if args.anchors:
+        with open(args.anchors, 'r', encoding='utf-8') as f:
+            anchors = json.load(f)
+        src, dst = [a[0] for a in anchors], [a[1] for a in anchors]
+    else:
+        src, dst, pairs = section_anchors(sections, polygons)
+
+    matrix, used = fit_robust(src, dst, args.kind)
+    error = residuals(matrix, src, dst)
+    for pdf, canvas in pairs:
+        print(f'{pdf} -> {canvas}' if pdf != canvas else pdf)
+    print(f'{args.kind}: {int(used.sum())} de {len(used)} anclas, '
+          f'error RMS {math.sqrt(float(np.mean(error[used] ** 2))):.2f}, max {float(error[used].max()):.2f}')
+    print('Matriz PDF -> canvas:')
+    for row in matrix:
+        print('  ' + '  '.join(f'{value:12.6f}' for value in row))
+
+    mapped = map_sections(sections, matrix, dict(pairs))
+    seats = sum(len(f['posiciones']) for data in mapped.values() for f in data['filas'])
+    print(f'{seats} asientos en {len(mapped)} secciones')
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(mapped, f, indent=2, ensure_ascii=False)
+        print(f'JSON guardado en {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+Deteccion automatica de filas y huecos a partir de los numeros de butaca de
+un PDF de zonificacion (sobre el indice de pdf_spans.py).
+
+Pasos, todos O(n log n) sobre los n numeros de la pagina:
+
+  1. Cada span numerico es un asiento (centro del bbox). El paso entre
+     asientos (pitch) es la mediana de la distancia al vecino mas cercano.
+  2. Los asientos a menos de LINK_FACTOR pitches quedan en el mismo bloque
+     (union-find); con --regions cada region es un bloque.
+  3. La direccion de las filas de cada bloque es la mediana del angulo entre
+     cada asiento y su vecino con numero consecutivo (secciones inclinadas).
+  4. Barrido 1-D: se ordenan los asientos por la coordenada perpendicular a
+     las filas y se corta donde el salto pasa de ROW_TOL pitches. Las filas
+     de menos de MIN_ROW_SEATS asientos (puntas de la seccion vecina que
+     quedaron en el bloque) se pegan a la fila de otro bloque que prolongan.
+  5. En cada fila, un salto mayor a GAP_FACTOR pitches es un hueco:
+       espacio     la numeracion sigue (cabina, columna, pasillo)
+       faltantes   faltan numeros y el hueco mide lo mismo (lugares para
+                   silla de ruedas, asientos retirados)
+       salto       la numeracion brinca sin que el hueco coincida
+     Los numeros de las puntas que no siguen la numeracion son anotaciones:
+     el conteo de la fila o su etiqueta (VIP 1-8); si no hay etiqueta
+     numerica se busca una letra junto a las puntas.
+
+Sale la misma estructura que excel_zoning.py y que usan los
+generate_seats_db_*: {seccion: {'total', 'filas': [{'fila', 'asientos',
+'direccion', 'seat_numbers', 'huecos', 'posiciones_pdf'}]}}, filas de arriba
+hacia abajo y seat_numbers de izquierda a derecha tal como se ven en el PDF.
+posiciones_pdf es el centro [x, y] de cada numero en coordenadas del PDF; los
+generadores no las usan hasta que pdf_register.py las pasa al canvas como
+'posiciones':
+
+    python3 pdf_rows.py "ZONIFICACION RECORTE FINAL TEATRO DE LA CIUDAD.pdf"
+    python3 pdf_rows.py plano.pdf --regions regiones.json --output /tmp/pdfrows.json
+    python3 pdf_register.py /tmp/pdfrows.json --output /tmp/tangamanga_seats.json
+
+regiones.json: {"PLUS CENTRAL": [[x, y], ...], "VIP CENTRAL": [x0, y0, x1, y1]}
+en coordenadas del PDF.
+"""
+
+import argparse
+import bisect
+import json
+import math
+import re
+from collections import OrderedDict
+
+import numpy as np
+
+from pdf_spans import SpanIndex, load_spans
+
+LINK_FACTOR = 2.5
+ROW_TOL = 0.5
+GAP_FACTOR = 1.8
+LABEL_DISTANCE = 3.0
+MIN_ROW_SEATS = 3
+MAX_ROW_ANNOTATIONS = 4
+STRAY_TOL = 0.8
+MAX_SEAT_NUMBER = 999
+HEADER_TOTAL_DISTANCE = 40.0
+
+_HEADER_RE = re.compile(r'^SECC\.?\s*', re.IGNORECASE)
+_NAMED_TOTAL_RE = re.compile(r'^[^\d:]+:\s*\d[\d,]*$')
+_TOTAL_RE = re.compile(r'^TOTAL\s*:?\s*(\d[\d,]*)$', re.IGNORECASE)
+_HEADER_NOISE_RE = re.compile(r'\b(BUTACAS|TOTAL)\b|[/:]', re.IGNORECASE)
+# Solo digitos ASCII: str.isdigit tambien acepta '²' o '٣', que int() no convierte
+_SEAT_NUMBER_RE = re.compile(r'^[0-9]+$')
+
+
+class SeatPoints:
+    """Spans numericos de una pagina como puntos, con su propia rejilla"""
+
+    def __init__(self, spans, indices):
+        self.spans = spans
+        self.span = np.asarray(indices, dtype=np.int64)
+        self.x = (spans.x[self.span] + spans.x2[self.span]) / 2
+        self.y = (spans.y[self.span] + spans.y2[self.span]) / 2
+        self.number = spans.text[self.span].astype(np.int64)
+        self.grid = SpanIndex({'page': np.zeros(len(self.span), dtype=np.int32), 'x': self.x, 'y': self.y,
+                               'x2': self.x, 'y2': self.y, 'size': spans.size[self.span],
+                               'text': spans.text[self.span]})
+
+    def __len__(self):
+        return len(self.span)
+
+
+def inside_polygon(polygon, xs, ys):
+    """Mascara par-impar de los puntos dentro del poligono [(x, y), ...]"""
+    inside = np.zeros(len(xs), dtype=bool)
+    for (ax, ay), (bx, by) in zip(polygon, polygon[1:] + polygon[:1]):
+        if ay == by:
+            continue
+        crosses = (ay > ys) != (by > ys)
+        inside ^= crosses & (xs < ax + (ys - ay) * (bx - ax) / (by - ay))
+    return inside
+
+
+def _region_mask(region, xs, ys):
+    if len(region) == 4 and not isinstance(region[0], (list, tuple)):
+        x0, y0, x1, y1 = region
+        return (xs >= x0) & (xs <= x1) & (ys >= y0) & (ys <= y1)
+    return inside_polygon([tuple(p) for p in region], xs, ys)
+
+
+def seat_points(spans, page=0):
+    texts = spans.text
+    indices = [i for i in np.flatnonzero(spans.page == page)
+               if _SEAT_NUMBER_RE.match(texts[i]) and 1 <= int(texts[i]) <= MAX_SEAT_NUMBER]
+    return SeatPoints(spans, indices)
+
+
+def seat_pitch(points):
+    """Mediana de la distancia de cada asiento a su vecino mas cercano"""
+    distances = []
+    for i in range(len(points)):
+        near = points.grid.nearest(points.x[i], points.y[i], k=2)
+        if len(near) == 2:
+            j = near[1]
+            distances.append(math.hypot(points.x[j] - points.x[i], points.y[j] - points.y[i]))
+    return float(np.median(distances)) if distances else 1.0
+
+
+def group_blocks(points, pitch, link_factor=LINK_FACTOR):
+    """Etiqueta de bloque por asiento (componentes conexas a distancia <= link)"""
+    link = link_factor * pitch
+    parent = np.arange(len(points))
+
+    def root(a):
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    for i in range(len(points)):
+        x, y = points.x[i], points.y[i]
+        for j in points.grid.rect(x - link, y - link, x + link, y + link):
+            if j > i and math.hypot(points.x[j] - x, points.y[j] - y) <= link:
+                parent[root(j)] = root(i)
+    return np.array([root(i) for i in range(len(points))])
+
+
+def row_angle(points, ids, labels=None):
+    """Direccion de las filas (radianes, en (-90, 90]) segun vecinos con numero consecutivo"""
+    angles = []
+    for i in ids:
+        for j in points.grid.nearest(points.x[i], points.y[i], k=5)[1:]:
+            if abs(points.number[j] - points.number[i]) != 1:
+                continue
+            if labels is not None and labels[j] != labels[i]:
+                continue
+            dx, dy = points.x[j] - points.x[i], points.y[j] - points.y[i]
+            if dx < 0 or (dx == 0 and dy < 0):
+                dx, dy = -dx, -dy
+            angles.append(math.atan2(dy, dx))
+            break
+    return float(np.median(angles)) if angles else 0.0
+
+
+def _project(points, ids, angle):
+    """(a lo largo de la fila, perpendicular a la fila)"""
+    c, s = math.cos(angle), math.sin(angle)
+    xs, ys = points.x[ids], points.y[ids]
+    return xs * c + ys * s, -xs * s + ys * c
+
+
+def sweep_rows(points, ids, angle, tol):
+    """Barrido 1-D: grupos de ids (ordenados a lo largo de la fila) de arriba hacia abajo"""
+    ids = np.asarray(ids)
+    if not len(ids):
+        return []
+    along, across = _project(points, ids, angle)
+    order = np.argsort(across, kind='stable')
+    cuts = np.flatnonzero(np.diff(across[order]) > tol) + 1
+    rows = []
+    for group in np.split(order, cuts):
+        rows.append(ids[group[np.argsort(along[group], kind='stable')]])
+    return rows
+
+
+def _attach_strays(points, rows, pitch, tol, gap_factor):
+    """
+    Pegar las filas cortas a la fila (de cualquier bloque) que prolongan.
+    Las filas candidatas de cada asiento suelto son las que tienen un asiento
+    a menos de gap_factor pitches + 2 tol (rejilla de SeatPoints); de cada
+    fila se guardan su proyeccion ordenada y sus extremos, asi que cada
+    prueba no vuelve a proyectar la fila completa.
+    """
+    long_rows = [r for r in rows if len(r['ids']) >= MIN_ROW_SEATS]
+    strays = [i for r in rows if len(r['ids']) < MIN_ROW_SEATS for i in r['ids']]
+    reach_max = gap_factor * pitch
+    radius = reach_max + 2 * tol
+    row_of = np.full(len(points), -1, dtype=np.int64)
+    extents = []
+    for k, row in enumerate(long_rows):
+        row_of[row['ids']] = k
+        along, across = _project(points, row['ids'], row['angle'])
+        extents.append([sorted(across.tolist()), float(along.min()), float(along.max())])
+
+    leftover = []
+    attached = [[] for _ in long_rows]
+    for i in strays:
+        x, y = points.x[i], points.y[i]
+        near = points.grid.rect(x - radius, y - radius, x + radius, y + radius)
+        best = None
+        for k in sorted(set(row_of[near].tolist()) - {-1}):
+            across_sorted, lo, hi = extents[k]
+            along, across = _project(points, [i], long_rows[k]['angle'])
+            mid = len(across_sorted) // 2
+            median = (across_sorted[mid] + across_sorted[~mid]) / 2
+            offset = abs(across[0] - median)
+            reach = max(lo - along[0], along[0] - hi)
+            if offset <= tol and reach <= reach_max and (best is None or offset < best[0]):
+                best = (offset, k, along[0], across[0])
+        if best is None:
+            leftover.append(i)
+            continue
+        _, k, along_i, across_i = best
+        row_of[i] = k
+        attached[k].append(i)
+        extent = extents[k]
+        bisect.insort(extent[0], float(across_i))
+        extent[1], extent[2] = min(extent[1], along_i), max(extent[2], along_i)
+
+    for row, extra in zip(long_rows, attached):
+        if extra:
+            ids = np.append(row['ids'], extra)
+            along, _ = _project(points, ids, row['angle'])
+            row['ids'] = ids[np.argsort(along, kind='stable')]
+    return long_rows, leftover
+
+
+def _row_label(points, ids, angle, pitch):
+    """Letra junto a alguna punta de la fila (spans no numericos de 1-2 caracteres)"""
+    spans = points.spans
+    c, s = math.cos(angle), math.sin(angle)
+    page = int(spans.page[points.span[ids[0]]])
+    for end, sign in ((ids[0], -1), (ids[-1], 1)):
+        x = points.x[end] + sign * c * pitch
+        y = points.y[end] + sign * s * pitch
+        for k in spans.nearest(x, y, k=4, page=page):
+            text = str(spans.text[k])
+            cx, cy = (spans.x[k] + spans.x2[k]) / 2, (spans.y[k] + spans.y2[k]) / 2
+            if len(text) <= 2 and text.isalpha() and math.hypot(cx - x, cy - y) <= LABEL_DISTANCE * pitch:
+                return text
+    return None
+
+
+def analyze_row(points, ids, angle, pitch, gap_factor=GAP_FACTOR):
+    """
+    Separar anotaciones, asientos y huecos de una fila ya ordenada. En las
+    puntas, un numero que no sigue la numeracion de su vecino es una
+    anotacion (tambien si va en sentido contrario): el conteo de la fila
+    (igual al numero de asientos) o la etiqueta de la fila (VIP 1-8; si hay
+    varias se toma la mas alineada).
+    """
+    along, across = _project(points, ids, angle)
+    numbers = points.number[ids]
+    keep = np.ones(len(ids), dtype=bool)
+    annotations = []
+    # Sentido de la numeracion (+1 o -1): un 32 despues de ...33, 31 no la sigue
+    direction = -1 if len(numbers) > 1 and np.median(np.diff(numbers)) < 0 else 1
+    for _ in range(MAX_ROW_ANNOTATIONS):
+        kept = np.flatnonzero(keep)
+        if len(kept) <= MIN_ROW_SEATS:
+            break
+        first, last = kept[0], kept[-1]
+        if numbers[kept[1]] - numbers[first] != direction:
+            keep[first] = False
+            annotations.append(first)
+        elif numbers[last] - numbers[kept[-2]] != direction:
+            keep[last] = False
+            annotations.append(last)
+        else:
+            break
+    seat_count = int(keep.sum())
+    labels = [k for k in annotations if numbers[k] != seat_count]
+    line = float(np.median(across[keep]))
+    label = str(int(numbers[min(labels, key=lambda k: abs(across[k] - line))])) if labels else None
+    ids, along, numbers = ids[keep], along[keep], numbers[keep]
+
+    steps = np.diff(along)
+    row_pitch = float(np.median(steps)) if len(steps) else pitch
+    limit = gap_factor * max(row_pitch, pitch * 0.5)
+    gaps = []
+    for k in np.flatnonzero(steps > limit):
+        width = float(steps[k])
+        jump = abs(int(numbers[k + 1]) - int(numbers[k])) - 1
+        slots = int(round(width / row_pitch)) - 1
+        kind = 'espacio' if jump == 0 else ('faltantes' if abs(jump - slots) <= 1 else 'salto')
+        gaps.append({
+            'despues_de': int(numbers[k]),
+            'antes_de': int(numbers[k + 1]),
+            'tipo': kind,
+            'ancho': round(width, 1),
+            'lugares': slots,
+            'x': round(float(points.x[ids[k]] + points.x[ids[k + 1]]) / 2, 1),
+            'y': round(float(points.y[ids[k]] + points.y[ids[k + 1]]) / 2, 1),
+        })
+    return ids, label, gaps
+
+
+def _header_name(text):
+    name = _HEADER_RE.sub('', text)
+    total = re.search(r'(\d[\d,]*)\s*$', name)
+    name = re.sub(r'[\d,]+\s*$', '', name)
+    name = ' '.join(_HEADER_NOISE_RE.sub(' ', name).split())
+    return name.upper(), int(total.group(1).replace(',', '')) if total else None
+
+
+def section_headers(spans, page=0):
+    """
+    [(nombre, total declarado o None, x, y)] de los encabezados de seccion:
+    'SECC. PLUS CENTRAL TOTAL: 414', o 'PREFERENTE / DERECHA: 631' cuando
+    'SECC.' quedo en otro span. Si el total va en su propio span
+    ('TOTAL 144') se toma el mas cercano.
+    """
+    headers = []
+    totals = []
+    for i in np.flatnonzero(spans.page == page):
+        text = str(spans.text[i]).strip()
+        center = ((spans.x[i] + spans.x2[i]) / 2, (spans.y[i] + spans.y2[i]) / 2)
+        match = _TOTAL_RE.match(text)
+        if match:
+            totals.append((int(match.group(1).replace(',', '')), center))
+        elif _HEADER_RE.match(text) or _NAMED_TOTAL_RE.match(text):
+            name, total = _header_name(text)
+            if name and not name.startswith('ZONA'):
+                headers.append([name, total, *center])
+
+    # Totales sueltos: cada uno al encabezado sin total mas cercano
+    for total, (tx, ty) in totals:
+        missing = [h for h in headers if h[1] is None]
+        if missing:
+            header = min(missing, key=lambda h: math.hypot(h[2] - tx, h[3] - ty))
+            if math.hypot(header[2] - tx, header[3] - ty) <= HEADER_TOTAL_DISTANCE:
+                header[1] = total
+    return [tuple(h) for h in headers]
+
+
+def assign_headers(points, labels, blocks, headers):
+    """
+    {bloque: [encabezados]}. Cada encabezado va al bloque mas cercano que
+    todavia tenga asientos para al menos la mitad de su total declarado;
+    los encabezados mas cercanos a su bloque se asignan primero. Asi un
+    titulo entre dos bloques (PLUS CENTRAL sobre la cabina) no cae en el
+    bloque que ya llenan otros encabezados.
+    """
+    by_block = {block: [] for block in blocks}
+    room = {block: len(ids) for block, ids in blocks.items()}
+    candidates = []
+    for header in headers:
+        name, total, hx, hy = header
+        distances = sorted((float(np.min(np.hypot(points.x[ids] - hx, points.y[ids] - hy))), block)
+                           for block, ids in blocks.items())
+        candidates.append((distances, header))
+    for distances, header in sorted(candidates, key=lambda c: c[0][0][0]):
+        total = header[1]
+        block = next((b for _, b in distances if not total or room[b] >= total / 2), distances[0][1])
+        by_block[block].append(header)
+        room[block] -= total or 0
+    return by_block
+
+
+def _split_stacked(rows, headers):
+    """
+    Repartir las filas (de arriba hacia abajo) de un bloque con varias
+    secciones apiladas: el corte va donde la suma de asientos llega al total
+    declarado de cada encabezado (o a medio camino entre encabezados si no hay total).
+    """
+    parts = []
+    start = 0
+    counts = np.cumsum([len(r['seat_ids']) for r in rows])
+    for k, header in enumerate(headers[:-1]):
+        if all(h[1] is not None for h in headers[:k + 1]):
+            target = sum(h[1] for h in headers[:k + 1])
+            cut = int(np.argmin(np.abs(counts - target))) + 1
+        else:
+            middle = (header[4] + headers[k + 1][4]) / 2
+            cut = sum(1 for r in rows if r['across'] < middle)
+        cut = min(max(cut, start), len(rows))
+        parts.append((header, rows[start:cut]))
+        start = cut
+    parts.append((headers[-1], rows[start:]))
+    return parts
+
+
+def detect_sections(spans, page=0, regions=None, gap_factor=GAP_FACTOR, link_factor=LINK_FACTOR):
+    """
+    {seccion: {'total', 'declarado', 'angulo', 'filas': [...]}} de una pagina.
+
+    Sin regions las secciones son los bloques conexos de asientos; cada
+    encabezado SECC. va a un bloque con assign_headers y un bloque con
+    varios encabezados (secciones apiladas, p. ej. PLUS sobre VIP) se parte
+    con _split_stacked. Los asientos que no quedan en ninguna fila van en
+    '_sueltos'.
+    """
+    points = seat_points(spans, page)
+    if not len(points):
+        return OrderedDict()
+    pitch = seat_pitch(points)
+    tol = ROW_TOL * pitch
+
+    if regions:
+        labels = np.full(len(points), -1)
+        for n, region in enumerate(regions.values()):
+            labels[_region_mask(region, points.x, points.y) & (labels < 0)] = n
+    else:
+        labels = group_blocks(points, pitch, link_factor)
+
+    blocks = OrderedDict((int(b), np.flatnonzero(labels == b)) for b in np.unique(labels[labels >= 0]))
+    rows = []
+    for block, ids in blocks.items():
+        angle = row_angle(points, ids, labels)
+        for row_ids in sweep_rows(points, ids, angle, tol):
+            rows.append({'block': block, 'angle': angle, 'ids': row_ids})
+    rows, leftover = _attach_strays(points, rows, pitch, STRAY_TOL * pitch, gap_factor)
+    for row in rows:
+        row['seat_ids'], row['label'], row['gaps'] = analyze_row(points, row['ids'], row['angle'], pitch, gap_factor)
+        row['across'] = float(np.mean(_project(points, row['ids'], row['angle'])[1]))
+
+    # (encabezado, filas) por seccion
+    parts = []
+    if regions:
+        for n, name in enumerate(regions):
+            parts.append(((name, None), [r for r in rows if r['block'] == n]))
+    else:
+        by_block = assign_headers(points, labels, blocks, section_headers(spans, page))
+        for n, (block, ids) in enumerate(blocks.items(), 1):
+            block_rows = [r for r in rows if r['block'] == block]
+            headers = by_block[block] or [(f'BLOQUE {n}', None, 0.0, 0.0)]
+            angle = block_rows[0]['angle'] if block_rows else 0.0
+            c, s = math.cos(angle), math.sin(angle)
+            headers = sorted((h + (-h[2] * s + h[3] * c,) for h in headers), key=lambda h: h[4])
+            parts.extend(((h[0], h[1]), part) for h, part in _split_stacked(block_rows, headers))
+
+    sections = OrderedDict()
+    for (name, declared), section_rows in parts:
+        if name in sections:
+            name = f'{name} ({sum(1 for other in sections if other.startswith(name)) + 1})'
+        filas = []
+        for n, row in enumerate(section_rows, 1):
+            seat_ids = row['seat_ids']
+            if not len(seat_ids):
+                continue
+            numbers = [int(v) for v in points.number[seat_ids]]
+            filas.append({
+                'fila': row['label'] or _row_label(points, seat_ids, row['angle'], pitch) or str(n),
+                'asientos': len(numbers),
+                'direccion': 'IZQ A DERECHA' if numbers[0] <= numbers[-1] else 'DERECHA A IZQ',
+                'seat_numbers': numbers,
+                'huecos': row['gaps'],
+                'posiciones_pdf': [[round(float(x), 2), round(float(y), 2)]
+                               for x, y in zip(points.x[seat_ids], points.y[seat_ids])],
+            })
+        sections[name] = {
+            'total': sum(f['asientos'] for f in filas),
+            'declarado': declared,
+            'angulo': round(math.degrees(section_rows[0]['angle']), 2) if section_rows else 0.0,
+            'filas': filas,
+        }
+    if leftover:
+        sections['_sueltos'] = {
+            'total': len(leftover), 'declarado': None, 'angulo': 0.0, 'filas': [],
+            'asientos': [{'numero': int(points.number[i]), 'x': round(float(points.x[i]), 1),
+                          'y': round(float(points.y[i]), 1)} for i in leftover],
+        }
+    return sections
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Detectar filas y huecos desde los numeros de butaca de un PDF')
+    parser.add_argument('pdf', help='PDF de zonificacion')
+    parser.add_argument('--page', type=int, default=0, help='Pagina (base 0, default: 0)')
+    parser.add_argument('--regions', help='JSON {seccion: poligono [[x, y], ...] o [x0, y0, x1, y1]}')
+    parser.add_argument('--gap-factor', type=float, default=GAP_FACTOR,
+                        help=f'Separacion minima de un hueco, en pasos de asiento (default: {GAP_FACTOR})')
+    parser.add_argument('--output', help='Guardar {seccion: {filas}} en este JSON')
+    args = parser.parse_args()
+
+    regions = None
+    if args.regions:
+        with open(args.regions, 'r', encoding='utf-8') as f:
+            regions = json.load(f, object_pairs_hook=OrderedDict)
+
+    sections = detect_sections(load_spans(args.pdf), args.page, regions, args.gap_factor)
+    total = 0
+    for name, data in sections.items():
+        total += data['total']
+        declared = data['declarado']
+        status = '' if declared is None else (' ✓' if declared == data['total'] else f' ✗ (declarado {declared})')
+        print(f"{name}: {data['total']} asientos en {len(data['filas'])} filas, angulo {data['angulo']}°{status}")
+        for fila in data['filas']:
+            for gap in fila['huecos']:
+                print(f"  Fila {fila['fila']}: {gap['tipo']} entre {gap['despues_de']} y {gap['antes_de']} "
+                      f"({gap['ancho']} de ancho, ~{gap['lugares']} lugares) en X={gap['x']} Y={gap['y']}")
+    print(f'TOTAL: {total} asientos')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(sections, f, indent=2, ensure_ascii=False)
+        print(f'JSON guardado en {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Indice espacial persistente de los textos (spans) de un PDF de zonificacion.
+
+La extraccion con fitz (page.get_text("dict")) se hace una sola vez por PDF:
+los spans quedan en columnas numpy (page, x, y, x2, y2, size, text) en
+CACHE_DIR/<sha256 del PDF>.npz, junto con una rejilla uniforme por pagina
+ordenada por celda (CSR). Con eso:
+
+  spans.rect(x0, y0, x1, y1)    spans cuya esquina (x, y) cae en el rectangulo
+  spans.nearest(x, y, k)        los k spans mas cercanos a un punto
+  spans.find('CABINA')          busqueda de texto (sin mayusculas)
+  spans.records(indices)        dicts {'text', 'x', 'y', 'x2', 'y2', 'size', 'page'},
+                                los mismos que armaban los analyze_pdf_*.py
+
+Las consultas por rectangulo y vecino revisan solo las celdas que tocan en
+lugar de todos los spans. (x, y) es la esquina superior izquierda del bbox,
+igual que t['x'] y t['y'] en los scripts.
+
+    python3 pdf_spans.py "ZONIFICACION RECORTE FINAL TEATRO DE LA CIUDAD.pdf" --rect 280 247 520 430
+    python3 pdf_spans.py plano.pdf --near 400 260 --k 5
+    python3 pdf_spans.py plano.pdf --find CABINA
+
+Para indexar muchos PDFs o planos de muchas paginas en paralelo: pdf_batch.py.
+"""
+
+import argparse
+import math
+import os
+
+import numpy as np
+
+from file_cache import atomic_write, file_sha256
+
+# Subir al cambiar lo que se guarda en el .npz
+INDEX_VERSION = 1
+CACHE_DIR = os.environ.get('PDF_SPANS_CACHE_DIR', '/tmp/pdf_spans_cache')
+SPANS_PER_CELL = 4
+
+_COLUMNS = ('page', 'x', 'y', 'x2', 'y2', 'size')
+
+
+def _page_spans(page, page_num, columns, texts):
+    for block in page.get_text('dict')['blocks']:
+        for line in block.get('lines', ()):
+            for span in line['spans']:
+                text = span['text'].strip()
+                if not text:
+                    continue
+                x, y, x2, y2 = span['bbox']
+                for name, value in zip(_COLUMNS, (page_num, x, y, x2, y2, span.get('size', 0))):
+                    columns[name].append(value)
+                texts.append(text)
+
+
+def _to_arrays(columns, texts, page_count):
+    arrays = {name: np.asarray(values, dtype=np.int32 if name == 'page' else np.float64)
+              for name, values in columns.items()}
+    arrays['text'] = np.asarray(texts, dtype=str) if texts else np.zeros(0, dtype='<U1')
+    arrays['pages'] = page_count
+    return arrays
+
+
+def extract_spans(pdf_path, pages=None):
+    """Columnas de todos los spans con texto del PDF (todas las paginas, o solo pages)"""
+    import fitz  # PyMuPDF
+
+    columns = {name: [] for name in _COLUMNS}
+    texts = []
+    doc = fitz.open(pdf_path)
+    try:
+        page_count = len(doc)
+        for page_num in (range(page_count) if pages is None else pages):
+            _page_spans(doc[page_num], page_num, columns, texts)
+    finally:
+        doc.close()
+    return _to_arrays(columns, texts, page_count)
+
+
+def page_count(pdf_path):
+    import fitz  # PyMuPDF
+
+    doc = fitz.open(pdf_path)
+    try:
+        return len(doc)
+    finally:
+        doc.close()
+
+
+def merge_spans(parts):
+    """Juntar las columnas de extract_spans(pdf, pages=...) de partes del mismo PDF"""
+    parts = list(parts)
+    arrays = {name: np.concatenate([part[name] for part in parts]) for name in _COLUMNS + ('text',)}
+    arrays['pages'] = max(part['pages'] for part in parts)
+    return arrays
+
+
+class SpanIndex:
+    """Spans en columnas con una rejilla uniforme por pagina"""
+
+    def __init__(self, arrays):
+        self.page = arrays['page']
+        self.x = arrays['x']
+        self.y = arrays['y']
+        self.x2 = arrays['x2']
+        self.y2 = arrays['y2']
+        self.size = arrays['size']
+        self.text = arrays['text']
+        self._upper = None
+        if 'order' in arrays:
+            self.bounds = arrays['bounds']
+            self.shape = tuple(int(v) for v in arrays['shape'])
+            self.order = arrays['order']
+            self.starts = arrays['starts']
+        else:
+            self._build_grid(arrays.get('pages', 1))
+
+    def __len__(self):
+        return len(self.text)
+
+    # -- rejilla -------------------------------------------------------------
+
+    def _build_grid(self, pages):
+        n = len(self)
+        if n:
+            x0, y0 = float(self.x.min()), float(self.y.min())
+            x1, y1 = float(self.x.max()) + 1e-6, float(self.y.max()) + 1e-6
+        else:
+            x0 = y0 = 0.0
+            x1 = y1 = 1.0
+        pages = max(pages, int(self.page.max()) + 1 if n else 1)
+        cells = max(n / pages / SPANS_PER_CELL, 1.0)
+        aspect = (x1 - x0) / max(y1 - y0, 1e-6)
+        nx = max(int(round(math.sqrt(cells * aspect))), 1)
+        ny = max(int(math.ceil(cells / nx)), 1)
+        self.bounds = np.array([x0, y0, x1, y1])
+        self.shape = (pages, ny, nx)
+        keys = self._keys(self.page, self._cell_x(self.x), self._cell_y(self.y))
+        self.order = np.argsort(keys, kind='stable').astype(np.int32)
+        self.starts = np.searchsorted(keys[self.order], np.arange(pages * ny * nx + 1)).astype(np.int32)
+
+    def _cell_x(self, x):
+        x0, _, x1, _ = self.bounds
+        nx = self.shape[2]
+        return np.clip(((np.asarray(x) - x0) / (x1 - x0) * nx).astype(np.int64), 0, nx - 1)
+
+    def _cell_y(self, y):
+        _, y0, _, y1 = self.bounds
+        ny = self.shape[1]
+        return np.clip(((np.asarray(y) - y0) / (y1 - y0) * ny).astype(np.int64), 0, ny - 1)
+
+    def _keys(self, page, cx, cy):
+        _, ny, nx = self.shape
+        return (np.asarray(page, dtype=np.int64) * ny + cy) * nx + cx
+
+    # -- consultas -----------------------------------------------------------
+
+    def rect(self, x0, y0, x1, y1, page=0):
+        """Indices (ordenados por y, x) de los spans con x0 <= x <= x1 y y0 <= y <= y1"""
+        if page >= self.shape[0] or not len(self):
+            return np.zeros(0, dtype=np.int32)
+        bx0, by0, bx1, by1 = self.bounds
+        if x1 < bx0 or x0 > bx1 or y1 < by0 or y0 > by1:
+            return np.zeros(0, dtype=np.int32)
+        # Recortar a la rejilla (acepta -math.inf / math.inf para rangos abiertos)
+        cx0, cx1 = (int(v) for v in self._cell_x([max(x0, bx0), min(x1, bx1)]))
+        cy0, cy1 = (int(v) for v in self._cell_y([max(y0, by0), min(y1, by1)]))
+        chunks = []
+        for cy in range(cy0, cy1 + 1):
+            k0, k1 = (int(k) for k in self._keys(page, np.array([cx0, cx1]), cy))
+            chunks.append(self.order[self.starts[k0]:self.starts[k1 + 1]])
+        candidates = np.concatenate(chunks)
+        xs, ys = self.x[candidates], self.y[candidates]
+        hits = candidates[(xs >= x0) & (xs <= x1) & (ys >= y0) & (ys <= y1)]
+        return hits[np.lexsort((self.x[hits], self.y[hits]))]
+
+    def nearest(self, x, y, k=1, page=0):
+        """Indices de los k spans mas cercanos a (x, y), del mas cercano al mas lejano"""
+        if not len(self):
+            return np.zeros(0, dtype=np.int32)
+        x0, y0, x1, y1 = self.bounds
+        radius = max((x1 - x0) / self.shape[2], (y1 - y0) / self.shape[1])
+        limit = math.hypot(max(abs(x - x0), abs(x - x1)), max(abs(y - y0), abs(y - y1)))
+        while True:
+            # Todo span a distancia <= radius esta dentro del cuadrado
+            hits = self.rect(x - radius, y - radius, x + radius, y + radius, page)
+            dist = np.hypot(self.x[hits] - x, self.y[hits] - y)
+            inside = dist <= radius
+            if inside.sum() >= k or radius >= limit:
+                hits, dist = hits[inside], dist[inside]
+                return hits[np.argsort(dist, kind='stable')[:k]]
+            radius *= 2
+
+    def find(self, text, page=None, exact=False):
+        """Indices (ordenados por y, x) de los spans que contienen text (o son igual a text)"""
+        text = text.upper()
+        if self._upper is None:
+            self._upper = np.char.upper(self.text)
+        upper = self._upper
+        mask = (upper == text) if exact else (np.char.find(upper, text) >= 0)
+        if page is not None:
+            mask &= self.page == page
+        hits = np.flatnonzero(mask)
+        return hits[np.lexsort((self.x[hits], self.y[hits]))]
+
+    def records(self, indices=None, page=None):
+        """Spans como dicts; sin indices, todos los de la pagina (o del PDF) en orden (y, x)"""
+        if indices is None:
+            indices = np.arange(len(self)) if page is None else np.flatnonzero(self.page == page)
+            indices = indices[np.lexsort((self.x[indices], self.y[indices]))]
+        return [{
+            'text': str(self.text[i]),
+            'x': float(self.x[i]),
+            'y': float(self.y[i]),
+            'x2': float(self.x2[i]),
+            'y2': float(self.y2[i]),
+            'size': float(self.size[i]),
+            'page': int(self.page[i]),
+        } for i in indices]
+
+    @property
+    def pages(self):
+        return self.shape[0]
+
+    def save(self, path):
+        with atomic_write(path, 'wb') as f:
+            np.savez(f, page=self.page, x=self.x, y=self.y, x2=self.x2, y2=self.y2, size=self.size,
+                     text=self.text, bounds=self.bounds, shape=np.array(self.shape),
+                     order=self.order, starts=self.starts)
+
+
+def cache_path(pdf_path, cache_dir=None, sha=None):
+    """Archivo .npz del indice de este PDF (por contenido, no por nombre)"""
+    sha = sha or file_sha256(pdf_path)
+    return os.path.join(cache_dir or CACHE_DIR, f'{sha[:32]}-v{INDEX_VERSION}.npz')
+
+
+def load_spans(pdf_path, use_cache=True, cache_dir=None):
+    """SpanIndex del PDF; solo se llama a fitz si no esta en cache"""
+    cache_dir = cache_dir or CACHE_DIR
+    path = cache_path(pdf_path, cache_dir)
+    if use_cache and os.path.exists(path):
+        with np.load(path, allow_pickle=False) as data:
+            return SpanIndex({name: data[name] for name in data.files})
+    spans = SpanIndex(extract_spans(pdf_path))
+    if use_cache:
+        os.makedirs(cache_dir, exist_ok=True)
+        spans.save(path)
+    return spans
+
+
+def _print(spans, indices):
+    for t in spans.records(indices):
+        print(f"  p{t['page']} Y={t['y']:6.1f} X={t['x']:6.1f} | {t['text']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Indice espacial de los textos de un PDF')
+    parser.add_argument('pdf', help='Archivo PDF')
+    parser.add_argument('--page', type=int, default=0, help='Pagina (base 0, default: 0)')
+    parser.add_argument('--rect', type=float, nargs=4, metavar=('X0', 'Y0', 'X1', 'Y1'),
+                        help='Spans con esquina dentro del rectangulo')
+    parser.add_argument('--near', type=float, nargs=2, metavar=('X', 'Y'), help='Spans mas cercanos al punto')
+    parser.add_argument('--k', type=int, default=5, help='Vecinos para --near (default: 5)')
+    parser.add_argument('--find', help='Spans que contienen el texto')
+    parser.add_argument('--no-cache', action='store_true', help='Volver a extraer aunque este en cache')
+    args = parser.parse_args()
+
+    spans = load_spans(args.pdf, use_cache=not args.no_cache)
+    print(f'{len(spans)} spans en {spans.pages} paginas, rejilla {spans.shape[2]}x{spans.shape[1]}')
+    if args.rect:
+        _print(spans, spans.rect(*args.rect, page=args.page))
+    if args.near:
+        _print(spans, spans.nearest(*args.near, k=args.k, page=args.page))
+    if args.find:
+        _print(spans, spans.find(args.find))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+-- Columnas materializadas de Seat.metadata ($.sectionId, $.sectionName,
+-- $.canvas.position.x/y) para filtrar y ordenar con indices en lugar de
+-- JSON_EXTRACT sobre todo el LongText. Se llenan con
+-- server/backfill_seat_columns.py (por lotes, sin bloquear la tabla).
+ALTER TABLE `Seat`
+  ADD COLUMN `sectionId` VARCHAR(191) NULL,
+  ADD COLUMN `sectionName` VARCHAR(191) NULL,
+  ADD COLUMN `posX` DOUBLE NULL,
+  ADD COLUMN `posY` DOUBLE NULL,
+  ALGORITHM=INSTANT;
+
+-- Indices para lecturas por rango: (layout, seccion, fila) ordenado por X
+CREATE INDEX `Seat_layoutId_sectionId_rowLabel_posX_idx` ON `Seat`(`layoutId`, `sectionId`, `rowLabel`, `posX`) ALGORITHM=INPLACE LOCK=NONE;
+CREATE INDEX `Seat_venueId_sectionName_rowLabel_posX_idx` ON `Seat`(`venueId`, `sectionName`, `rowLabel`, `posX`) ALGORITHM=INPLACE LOCK=NONE;
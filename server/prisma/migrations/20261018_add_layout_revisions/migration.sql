@@ -0,0 +1,21 @@
+-- Historial de layoutJson por deltas: cada N versiones se guarda el documento
+-- completo (kind = 'base') y entre ellas el JSON Patch contra la revision
+-- anterior (kind = 'delta'). Lo escribe server/layout_revisions.py.
+CREATE TABLE `LayoutRevision` (
+    `id` VARCHAR(191) NOT NULL,
+    `layoutId` VARCHAR(191) NOT NULL,
+    `version` INTEGER NOT NULL,
+    `kind` VARCHAR(16) NOT NULL,
+    `baseVersion` INTEGER NOT NULL,
+    `payload` LONGTEXT NOT NULL,
+    `sha256` CHAR(64) NOT NULL,
+    `size` INTEGER NOT NULL DEFAULT 0,
+    `createdBy` VARCHAR(191) NULL,
+    `createdAt` DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+
+    UNIQUE INDEX `LayoutRevision_layoutId_version_key`(`layoutId`, `version`),
+    INDEX `LayoutRevision_layoutId_kind_version_idx`(`layoutId`, `kind`, `version`),
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+ALTER TABLE `LayoutRevision` ADD CONSTRAINT `LayoutRevision_layoutId_fkey` FOREIGN KEY (`layoutId`) REFERENCES `VenueLayout`(`id`) ON DELETE CASCADE ON UPDATE CASCADE;
@@ -0,0 +1,11 @@
+-- Las rutas de mesas (borrar, duplicar, listar) filtran por Seat.tableId,
+-- pero POST /tables/generate antes solo guardaba metadata.tableId. Se copia
+-- a la columna para los asientos de mesas ya existentes, igual que
+-- backfill_table_ids en server/compress_blobs.py (el CASE evita evaluar ->>
+-- sobre metadata comprimida o invalida).
+UPDATE `Seat` s
+JOIN `VenueTable` t ON t.`id` = CASE
+    WHEN LEFT(s.`metadata`, 3) = '~bz' OR NOT JSON_VALID(s.`metadata`) THEN NULL
+    ELSE s.`metadata`->>'$.tableId' END
+SET s.`tableId` = t.`id`
+WHERE s.`tableId` IS NULL AND s.`metadata` IS NOT NULL;
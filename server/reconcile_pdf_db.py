@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Conciliacion PDF <-> DB de los asientos de un layout por posicion, en lugar
+de comparar AVG(posY) por fila como compare_pdf_db.py.
+
+  1. Los asientos del PDF salen de pdf_rows.py (seccion, fila, numero y
+     posicion en el PDF).
+  2. Los Seat del layout se leen una sola vez con un cursor del lado del
+     servidor (posX/posY; metadata solo si esas columnas estan vacias).
+  3. Se ajusta la transformacion PDF -> canvas (pdf_register.py) con anclas
+     que no dependen de las etiquetas: mediana de cada seccion contra la
+     de los Seat con el mismo sectionName, y las esquinas de cada seccion
+     contra el Seat mas cercano tras ese primer ajuste. Luego se vuelve a
+     ajustar con todos los asientos emparejados.
+  4. Cada asiento del PDF se empareja con el Seat mas cercano a menos de
+     TOLERANCE_FACTOR pasos de asiento (KD-tree de scipy si esta instalado;
+     si no, una rejilla uniforme de numpy), cada Seat con un solo asiento.
+
+Reporta numeros y filas que no coinciden, asientos del PDF sin Seat
+(faltantes, como los que fix_missing_seats.py agrego a mano) y Seat sin
+asiento en el PDF (sobrantes). Todo es O(n log n), asi que sirve igual para
+un teatro de 4k asientos que para un estadio.
+
+    python3 reconcile_pdf_db.py "ZONIFICACION RECORTE FINAL TEATRO DE LA CIUDAD.pdf" --layout ad44b249-...
+    python3 reconcile_pdf_db.py /tmp/pdfrows.json --layout ad44b249-... --output /tmp/conciliacion.json
+"""
+
+import argparse
+import json
+import math
+import time
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+from boletera_db import get_pool
+from pdf_register import KINDS, apply_transform, fit_robust, fit_transform, load_sections, match_sections, normalize_name
+from seat_sinks import seat_index_values
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+TOLERANCE_FACTOR = 0.5
+MATCH_PASSES = 3
+REPORT_LIMIT = 20
+
+SEAT_SQL = (
+    'SELECT id, label, sectionName, rowLabel, columnNumber, posX, posY, '
+    'CASE WHEN posX IS NULL OR posY IS NULL THEN metadata END '
+    'FROM Seat WHERE layoutId = %s'
+)
+
+
+# ---------------------------------------------------------------------------
+# Asientos en columnas
+# ---------------------------------------------------------------------------
+
+def _columns(**values):
+    return {name: np.asarray(column, dtype=np.float64 if name in ('x', 'y') else object)
+            for name, column in values.items()}
+
+
+def pdf_seats(sections):
+    """Columnas seccion/fila/numero/x/y de las secciones de pdf_rows (posiciones del PDF)"""
+    section, row, number, xs, ys = [], [], [], [], []
+    for name, data in sections.items():
+        if name.startswith('_'):
+            continue
+        for fila in data['filas']:
+            for seat_number, (x, y) in zip(fila['seat_numbers'], fila.get('posiciones_pdf') or ()):
+                section.append(name)
+                row.append(str(fila['fila']))
+                number.append(int(seat_number))
+                xs.append(x)
+                ys.append(y)
+    return _columns(section=section, row=row, number=number, x=xs, y=ys)
+
+
+def _label_number(label):
+    tail = str(label or '').rsplit('-', 1)[-1]
+    return int(tail) if tail.isdigit() else None
+
+
+def db_seats(db, layout_id):
+    """(columnas id/label/seccion/fila/numero/x/y de los Seat, Seat sin posicion)"""
+    ids, labels, section, row, number, xs, ys = [], [], [], [], [], [], []
+    unplaced = []
+    for seat_id, label, section_name, row_label, column, x, y, metadata in db.stream(SEAT_SQL, (layout_id,)):
+        if metadata is not None:
+            try:
+                _, meta_section, x, y = seat_index_values(metadata)
+            except ValueError:
+                x = y = None
+            else:
+                section_name = section_name or meta_section
+        if x is None or y is None:
+            unplaced.append(seat_id)
+            continue
+        ids.append(seat_id)
+        labels.append(label)
+        section.append(section_name or '')
+        row.append(str(row_label or ''))
+        number.append(column if column is not None else _label_number(label))
+        xs.append(x)
+        ys.append(y)
+    return _columns(id=ids, label=labels, section=section, row=row, number=number, x=xs, y=ys), unplaced
+
+
+# ---------------------------------------------------------------------------
+# Vecino mas cercano
+# ---------------------------------------------------------------------------
+
+def _grid_nearest(ref, query, radius):
+    """Como cKDTree.query(k=1, distance_upper_bound=radius) con una rejilla de celdas de lado radius"""
+    origin = np.minimum(ref.min(axis=0), query.min(axis=0))
+    ref_cells = np.floor((ref - origin) / radius).astype(np.int64) + 1
+    query_cells = np.floor((query - origin) / radius).astype(np.int64) + 1
+    width = int(max(ref_cells[:, 0].max(), query_cells[:, 0].max())) + 2
+    keys = ref_cells[:, 1] * width + ref_cells[:, 0]
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+
+    best = np.full(len(query), -1, dtype=np.int64)
+    best_dist = np.full(len(query), np.inf)
+    # Todo punto a distancia <= radius esta en la celda de la consulta o en sus 8 vecinas
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            cell = (query_cells[:, 1] + dy) * width + query_cells[:, 0] + dx
+            lo = np.searchsorted(sorted_keys, cell, 'left')
+            count = np.searchsorted(sorted_keys, cell, 'right') - lo
+            for j in range(int(count.max()) if len(count) else 0):
+                has = np.flatnonzero(count > j)
+                candidates = order[lo[has] + j]
+                dist = np.hypot(*(ref[candidates] - query[has]).T)
+                better = dist < best_dist[has]
+                best[has[better]] = candidates[better]
+                best_dist[has[better]] = dist[better]
+    outside = best_dist > radius
+    best[outside] = -1
+    best_dist[outside] = np.inf
+    return best, best_dist
+
+
+def nearest_within(ref, query, radius):
+    """(indice en ref o -1, distancia) del punto de ref mas cercano a cada consulta, a lo mas radius"""
+    ref, query = np.asarray(ref, dtype=np.float64), np.asarray(query, dtype=np.float64)
+    if not len(ref) or not len(query):
+        return np.full(len(query), -1, dtype=np.int64), np.full(len(query), np.inf)
+    if cKDTree is not None:
+        dist, index = cKDTree(ref).query(query, k=1, distance_upper_bound=radius)
+        found = np.isfinite(dist)
+        return np.where(found, index, -1).astype(np.int64), dist
+    return _grid_nearest(ref, query, radius)
+
+
+def match_points(pdf_xy, db_xy, radius):
+    """
+    Indice del Seat emparejado con cada asiento del PDF (o -1). Si dos
+    asientos caen en el mismo Seat gana el mas cercano y el otro se busca de
+    nuevo entre los Seat libres.
+    """
+    match = np.full(len(pdf_xy), -1, dtype=np.int64)
+    pdf_free = np.arange(len(pdf_xy))
+    db_free = np.arange(len(db_xy))
+    for _ in range(MATCH_PASSES):
+        if not len(pdf_free) or not len(db_free):
+            break
+        index, dist = nearest_within(db_xy[db_free], pdf_xy[pdf_free], radius)
+        found = np.flatnonzero(index >= 0)
+        if not len(found):
+            break
+        found = found[np.argsort(dist[found], kind='stable')]
+        _, first = np.unique(index[found], return_index=True)
+        winners = found[first]
+        match[pdf_free[winners]] = db_free[index[winners]]
+        pdf_free = np.flatnonzero(match < 0)
+        db_free = np.setdiff1d(db_free, match[match >= 0], assume_unique=True)
+    return match
+
+
+# ---------------------------------------------------------------------------
+# Registro
+# ---------------------------------------------------------------------------
+
+def seat_pitch(sections):
+    """Mediana de la distancia entre asientos vecinos de una fila (coordenadas del PDF)"""
+    steps = [math.hypot(b[0] - a[0], b[1] - a[1])
+             for name, data in sections.items() if not name.startswith('_')
+             for fila in data['filas']
+             for a, b in zip(fila.get('posiciones_pdf') or (), (fila.get('posiciones_pdf') or ())[1:])]
+    return float(np.median(steps)) if steps else 1.0
+
+
+def _scale(matrix):
+    return math.sqrt(abs(np.linalg.det(matrix[:2, :2]))) or 1.0
+
+
+def seat_anchors(sections, pdf, db):
+    """
+    Anclas PDF -> canvas a partir de los mismos Seat: la mediana de cada
+    seccion (un asiento fuera de lugar no la mueve, como si al promedio) y,
+    despues de un ajuste con ellas, las esquinas de cada seccion contra el Seat
+    mas cercano de esa seccion.
+    """
+    db_names = list(OrderedDict.fromkeys(db['section']))
+    pairs = match_sections([name for name in sections if not name.startswith('_')], db_names)
+    if len(pairs) < 3:
+        raise ValueError('Se necesitan al menos 3 secciones con el mismo nombre en el PDF y en la DB (o --anchors)')
+    pdf_xy = np.column_stack([pdf['x'], pdf['y']])
+    db_xy = np.column_stack([db['x'], db['y']])
+    masks = [(pdf['section'] == name, db['section'] == db_name) for name, db_name in pairs]
+    src = np.array([np.median(pdf_xy[p], axis=0) for p, _ in masks])
+    dst = np.array([np.median(db_xy[d], axis=0) for _, d in masks])
+    rough = fit_transform(src, dst, 'affine')
+
+    corner_src, corner_dst = [src], [dst]
+    for (name, _), (_, d) in zip(pairs, masks):
+        filas = sections[name]['filas']
+        first, last = filas[0]['posiciones_pdf'], filas[-1]['posiciones_pdf']
+        corners = np.array([first[0], first[-1], last[0], last[-1]], dtype=np.float64)
+        candidates = db_xy[d]
+        mapped = apply_transform(rough, corners)
+        nearest = np.argmin(np.hypot(*(mapped[:, None, :] - candidates[None, :, :]).transpose(2, 0, 1)), axis=1)
+        corner_src.append(corners)
+        corner_dst.append(candidates[nearest])
+    return np.vstack(corner_src), np.vstack(corner_dst), pairs
+
+
+def register(sections, pdf, db, kind='projective', anchors=None, tolerance_factor=TOLERANCE_FACTOR):
+    """
+    (matriz, pares de secciones, tolerancia en el canvas, RMS). El ajuste
+    final usa todos los asientos emparejados con la primera estimacion.
+    """
+    if anchors:
+        src, dst = np.array([a[0] for a in anchors]), np.array([a[1] for a in anchors])
+        pairs = match_sections([name for name in sections if not name.startswith('_')],
+                               list(OrderedDict.fromkeys(db['section'])))
+    else:
+        src, dst, pairs = seat_anchors(sections, pdf, db)
+    matrix, _ = fit_robust(src, dst, kind)
+
+    pdf_xy = np.column_stack([pdf['x'], pdf['y']])
+    db_xy = np.column_stack([db['x'], db['y']])
+    pitch = seat_pitch(sections)
+    match = match_points(apply_transform(matrix, pdf_xy), db_xy, tolerance_factor * pitch * _scale(matrix))
+    used = np.flatnonzero(match >= 0)
+    if len(used) >= 4 * len(src):
+        matrix, keep = fit_robust(pdf_xy[used], db_xy[match[used]], kind)
+        error = np.hypot(*(apply_transform(matrix, pdf_xy[used][keep]) - db_xy[match[used][keep]]).T)
+    else:
+        error = np.hypot(*(apply_transform(matrix, src) - dst).T)
+    rms = math.sqrt(float(np.mean(error ** 2))) if len(error) else 0.0
+    return matrix, pairs, tolerance_factor * pitch * _scale(matrix), rms
+
+
+# ---------------------------------------------------------------------------
+# Conciliacion
+# ---------------------------------------------------------------------------
+
+def reconcile(pdf, db, matrix, tolerance, section_names=None):
+    """Reporte {'resumen', 'numero', 'fila', 'seccion', 'faltantes', 'sobrantes'}"""
+    section_names = section_names or {}
+    pdf_xy = apply_transform(matrix, np.column_stack([pdf['x'], pdf['y']]))
+    db_xy = np.column_stack([db['x'], db['y']])
+    match = match_points(pdf_xy, db_xy, tolerance)
+
+    def pdf_item(i, **extra):
+        return dict({'seccion': section_names.get(pdf['section'][i], pdf['section'][i]), 'fila': pdf['row'][i],
+                     'numero': pdf['number'][i], 'x': round(float(pdf_xy[i, 0]), 2),
+                     'y': round(float(pdf_xy[i, 1]), 2)}, **extra)
+
+    def db_item(j):
+        return {'id': db['id'][j], 'label': db['label'][j], 'seccion': db['section'][j], 'fila': db['row'][j],
+                'numero': db['number'][j], 'x': round(float(db_xy[j, 0]), 2), 'y': round(float(db_xy[j, 1]), 2)}
+
+    report = {'numero': [], 'fila': [], 'seccion': [], 'faltantes': [], 'sobrantes': []}
+    summary = OrderedDict()
+    for i in range(len(match)):
+        name = section_names.get(pdf['section'][i], pdf['section'][i])
+        counts = summary.setdefault(name, Counter())
+        counts['pdf'] += 1
+        j = match[i]
+        if j < 0:
+            counts['faltantes'] += 1
+            report['faltantes'].append(pdf_item(i))
+            continue
+        counts['emparejados'] += 1
+        distance = round(float(np.hypot(*(pdf_xy[i] - db_xy[j]))), 2)
+        differences = [kind for kind, differs in (
+            ('seccion', normalize_name(name) != normalize_name(db['section'][j])),
+            ('fila', normalize_name(pdf['row'][i]) != normalize_name(db['row'][j])),
+            ('numero', db['number'][j] is None or int(db['number'][j]) != pdf['number'][i]),
+        ) if differs]
+        for kind in differences:
+            counts[kind] += 1
+            report[kind].append(pdf_item(i, db=db_item(j), distancia=distance))
+        if not differences:
+            counts['ok'] += 1
+
+    taken = np.zeros(len(db_xy), dtype=bool)
+    taken[match[match >= 0]] = True
+    for j in np.flatnonzero(~taken):
+        summary.setdefault(db['section'][j] or '(sin seccion)', Counter())['sobrantes'] += 1
+        report['sobrantes'].append(db_item(j))
+    report['resumen'] = {name: dict(counts) for name, counts in summary.items()}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Conciliar por posicion los asientos del PDF con los Seat de la DB')
+    parser.add_argument('source', help='PDF de zonificacion o JSON de pdf_rows.py')
+    parser.add_argument('--layout', required=True, help='Id del VenueLayout')
+    parser.add_argument('--page', type=int, default=0, help='Pagina del PDF (base 0, default: 0)')
+    # Con miles de anclas la proyectiva queda bien determinada y absorbe la perspectiva del plano
+    parser.add_argument('--kind', choices=KINDS, default='projective',
+                        help='Transformacion PDF -> canvas (default: projective)')
+    parser.add_argument('--anchors', help='JSON [[[px, py], [cx, cy]], ...] en lugar de las anclas automaticas')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE_FACTOR,
+                        help=f'Distancia maxima para emparejar, en pasos de asiento (default: {TOLERANCE_FACTOR})')
+    parser.add_argument('--limit', type=int, default=REPORT_LIMIT,
+                        help=f'Diferencias a mostrar por tipo (default: {REPORT_LIMIT})')
+    parser.add_argument('--output', help='Guardar el reporte completo en este JSON')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    sections = load_sections(args.source, args.page)
+    pdf = pdf_seats(sections)
+    if not len(pdf['x']):
+        print('El PDF no tiene asientos con posicion (correr pdf_rows.py de nuevo)')
+        return
+    t_pdf = time.perf_counter()
+    db, unplaced = db_seats(get_pool(size=1), args.layout)
+    if not len(db['x']):
+        print(f'El layout {args.layout} no tiene Seat con posicion')
+        return
+    t_db = time.perf_counter()
+
+    anchors = None
+    if args.anchors:
+        with open(args.anchors, 'r', encoding='utf-8') as f:
+            anchors = json.load(f)
+    matrix, pairs, tolerance, rms = register(sections, pdf, db, args.kind, anchors, args.tolerance)
+    report = reconcile(pdf, db, matrix, tolerance, dict(pairs))
+    t_match = time.perf_counter()
+
+    print(f"PDF: {len(pdf['x'])} asientos, DB: {len(db['x'])} Seat ({len(unplaced)} sin posicion)")
+    print(f'{args.kind}: error RMS {rms:.2f}, tolerancia {tolerance:.2f} '
+          f"({'KD-tree' if cKDTree is not None else 'rejilla'})")
+    print(f'\n{"Seccion":24} {"PDF":>6} {"OK":>6} {"Num":>5} {"Fila":>5} {"Secc":>5} {"Falt":>5} {"Sobr":>5}')
+    for name, counts in report['resumen'].items():
+        print(f"{name[:24]:24} {counts.get('pdf', 0):6} {counts.get('ok', 0):6} {counts.get('numero', 0):5} {counts.get('fila', 0):5} "
+              f"{counts.get('seccion', 0):5} {counts.get('faltantes', 0):5} {counts.get('sobrantes', 0):5}")
+
+    for kind, title in (('numero', 'Numero distinto'), ('fila', 'Fila distinta'), ('seccion', 'Seccion distinta')):
+        if report[kind]:
+            print(f'\n{title}: {len(report[kind])}')
+            for item in report[kind][:args.limit]:
+                print(f"  PDF {item['seccion']} {item['fila']}-{item['numero']} -> DB {item['db']['label']} "
+                      f"(fila {item['db']['fila']}, numero {item['db']['numero']}) a {item['distancia']}")
+    if report['faltantes']:
+        print(f"\nFaltantes en la DB: {len(report['faltantes'])}")
+        for item in report['faltantes'][:args.limit]:
+            print(f"  {item['seccion']} fila {item['fila']} asiento {item['numero']} en X={item['x']} Y={item['y']}")
+    if report['sobrantes']:
+        print(f"\nSobrantes en la DB: {len(report['sobrantes'])}")
+        for item in report['sobrantes'][:args.limit]:
+            print(f"  {item['label']} ({item['seccion']}) en X={item['x']} Y={item['y']}")
+
+    print(f'\nTiempo: PDF {t_pdf - started:.2f} s, DB {t_db - t_pdf:.2f} s, conciliacion {t_match - t_db:.2f} s')
+    if args.output:
+        report['transformacion'] = {'tipo': args.kind, 'matriz': matrix.tolist(), 'rms': round(rms, 3),
+                                    'tolerancia': round(tolerance, 3), 'sin_posicion': unplaced}
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+        print(f'Reporte guardado en {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,12 @@
 #!/bin/bash
 # Eliminar asientos existentes y regenerar
 
-mysql -u boletera_user -pCer0un0cer0.com20182417 boletera_db -e "DELETE FROM Seat WHERE layoutSectionId IN (SELECT id FROM LayoutSection WHERE layoutId = (SELECT id FROM VenueLayout WHERE venueId = '2a8073f3-3b78-4394-8eab-79e7d988542a'));"
+# insert_seats.sql trae su propio DELETE (todo el venue, o con --incremental
+# solo las secciones que cambiaron) y corre en una sola transaccion
+python3 "$(dirname "$0")/boletera_db.py" -f /tmp/insert_seats.sql || exit 1
 
-mysql -u boletera_user -pCer0un0cer0.com20182417 boletera_db < /tmp/insert_seats.sql
+# Solo con los asientos ya en la DB las huellas de --incremental son validas
+python3 "$(dirname "$0")/generate_seats_db_v3.py" --commit-cache || exit 1
 
 echo "Asientos regenerados"
-mysql -u boletera_user -pCer0un0cer0.com20182417 boletera_db -e "SELECT layoutSectionId, COUNT(*) as seats FROM Seat WHERE layoutSectionId LIKE 'section-%' GROUP BY layoutSectionId;"
+python3 "$(dirname "$0")/boletera_db.py" -e "SELECT sectionId, COUNT(*) as seats FROM Seat WHERE sectionId LIKE 'section-%' GROUP BY sectionId;"
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Reetiquetar filas de asientos a partir de un mapeo por zona.
+Reemplaza a fix_rows_v2.py, fix_rows_v3.py, fix_row_labels.py y
+fix_rows_complete.py, que generaban decenas de UPDATE con prefijos
+TEMP_/OLD_/SWAP_ filtrando por JSON_EXTRACT(metadata, '$.sectionName').
+
+Los asientos del layout se leen una sola vez a un SeatStore; el nuevo
+rowLabel, el label (PREFIJO-FILA-NUMERO) y metadata.canvas.label se calculan
+en Python y se aplican con un UPDATE unido a una tabla temporal, en una
+transaccion.
+
+La zona de un asiento es la primera palabra de su sectionName (VIP, PLUS,
+PREFERENTE). Por defecto se invierten las filas (1<->8, A<->P), que es lo
+que hacian los scripts anteriores:
+
+    python3 relabel_rows.py --dry-run
+    python3 relabel_rows.py --mapping '{"VIP": {"1": "8", "8": "1"}}'
+"""
+
+import argparse
+import json
+
+from boletera_db import get_pool
+from seat_relabel import apply_label_changes
+from seat_store import SeatStore
+
+LAYOUT_ID = 'ad44b249-13ad-4c51-b1ff-f73ce9b80c9b'
+
+# Las filas estan etiquetadas al reves: fila 1/A tiene Y bajo (arriba) pero
+# deberia ser la mas cercana al escenario (Y alto)
+VIP_FLIP = {str(row): str(9 - row) for row in range(1, 9)}
+ALPHA_FLIP = {chr(ord('A') + i): chr(ord('P') - i) for i in range(16)}
+
+DEFAULT_MAPPING = {
+    'VIP': VIP_FLIP,
+    'PLUS': ALPHA_FLIP,
+    'PREFERENTE': ALPHA_FLIP,
+}
+
+
+def zone_of(section_name):
+    return (section_name or '').split(' ')[0].upper()
+
+
+def relabel_seat(label, canvas_label, new_row):
+    """
+    Nuevo label y canvas label de un asiento con la fila new_row.
+    El label conserva su prefijo y numero: VC-1-23 -> VC-8-23.
+    Regresa None si el label no tiene la forma PREFIJO-FILA-NUMERO.
+    """
+    parts = (label or '').rsplit('-', 2)
+    if len(parts) != 3:
+        return None
+    prefix, _, number = parts
+    canvas_number = (canvas_label or '').rsplit('-', 1)[-1] or number
+    return f'{prefix}-{new_row}-{number}', f'{new_row}-{canvas_number}'
+
+
+def load_seats(db, layout_id):
+    """Asientos del layout en un SeatStore (seccion y canvas label salen del metadata)"""
+    store = SeatStore(layout_id=layout_id)
+    seats = db.stream(
+        'SELECT id, label, rowLabel, columnNumber, metadata FROM Seat WHERE layoutId = %s',
+        (layout_id,), dicts=True
+    )
+    for seat in seats:
+        store.append_seat_row(seat)
+    return store
+
+
+def plan_relabel(store, mapping):
+    """
+    Regresa (cambios, omitidos): la lista de (id, rowLabel, label,
+    canvasLabel) que cambian y los (id, label) que no se pueden reetiquetar
+    porque su label no es PREFIJO-FILA-NUMERO. Verifica que los labels
+    finales no se repitan.
+    """
+    # El mapeo se resuelve una vez por seccion, no por asiento
+    zone_maps = [mapping.get(zone_of(section_name), {}) for _, section_name, _ in store.sections.values]
+    changes = []
+    skipped = []
+    final_labels = {}
+    for i, (seat_id, label) in enumerate(zip(store.ids, store.labels)):
+        row_label = store.rows[store.row[i]]
+        new_row = zone_maps[store.section[i]].get(row_label, row_label)
+        new_label = label
+        if new_row != row_label:
+            relabeled = relabel_seat(label, store.displays[store.display[i]], new_row)
+            if relabeled is None:
+                skipped.append((seat_id, label))
+            else:
+                new_label, new_canvas_label = relabeled
+                changes.append((seat_id, new_row, new_label, new_canvas_label))
+        if new_label in final_labels:
+            raise ValueError(f'Label duplicado despues del cambio: {new_label} ({final_labels[new_label]} y {seat_id})')
+        final_labels[new_label] = seat_id
+    return changes, skipped
+
+
+def apply_relabel(db, changes):
+    return apply_label_changes(db, 'rowLabel', changes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reetiquetar filas de asientos por zona')
+    parser.add_argument('--layout', default=LAYOUT_ID, help=f'Id del VenueLayout (default: {LAYOUT_ID})')
+    parser.add_argument('--mapping', type=json.loads,
+                        help='Mapeo JSON por zona, p. ej. \'{"VIP": {"1": "8"}, "PLUS": {"A": "P"}}\' (default: invertir filas)')
+    parser.add_argument('--dry-run', action='store_true', help='Solo mostrar los cambios')
+    args = parser.parse_args()
+
+    mapping = {zone.upper(): rows for zone, rows in (args.mapping or DEFAULT_MAPPING).items()}
+
+    db = get_pool(size=1)
+    changes, skipped = plan_relabel(load_seats(db, args.layout), mapping)
+    print(f'Asientos a reetiquetar: {len(changes)}')
+    if skipped:
+        print(f'Omitidos (label sin PREFIJO-FILA-NUMERO): {len(skipped)}')
+        for seat_id, label in skipped[:20]:
+            print(f'  {seat_id}: {label!r}')
+
+    if args.dry_run:
+        for seat_id, row_label, label, canvas_label in changes[:20]:
+            print(f'  {seat_id}: fila {row_label}, {label} ({canvas_label})')
+        return
+    if changes:
+        updated = apply_relabel(db, changes)
+        print(f'Actualizados: {updated} asientos')
+
+
+if __name__ == '__main__':
+    main()
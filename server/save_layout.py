@@ -1,39 +1,49 @@
 #!/usr/bin/env python3
 """
-Script para guardar el layoutJson actualizado en la DB
+Script para guardar en la DB los asientos generados dentro del layoutJson
+
+Solo se envian los asientos nuevos: el resto del layoutJson se arma en el
+servidor a partir del valor actual (ver layout_stream.py). Con --compact los
+asientos se guardan como un bloque compactSeats (ver compact_seats.py).
+Cada guardado queda en el historial LayoutRevision como delta contra la
+version anterior (ver layout_revisions.py).
 """
 
-import json
-import subprocess
+import argparse
+
+from boletera_db import get_pool
+from compact_seats import encode_seats, expand_objects, seat_count
+from layout_revisions import ensure_base, save_revision
+from layout_stream import iter_file_chunks, iter_json_array, replace_layout_seats
 
 LAYOUT_ID = 'ad44b249-13ad-4c51-b1ff-f73ce9b80c9b'
 
 def main():
-    # Cargar JSON actualizado
-    with open('/tmp/layout_updated.json', 'r', encoding='utf-8') as f:
-        layout = json.load(f)
-    
-    # Convertir a string JSON y escapar comillas simples para MySQL
-    layout_json_str = json.dumps(layout, ensure_ascii=False).replace("'", "''").replace("\\", "\\\\")
-    
-    # Guardar SQL de update
-    with open('/tmp/update_layout.sql', 'w', encoding='utf-8') as f:
-        f.write(f"UPDATE VenueLayout SET layoutJson = '{layout_json_str}' WHERE id = '{LAYOUT_ID}';\n")
-    
-    print('SQL de actualizacion guardado en /tmp/update_layout.sql')
-    print(f'Tamano del JSON: {len(layout_json_str)} caracteres')
-    
-    # Ejecutar update
-    result = subprocess.run([
-        'mysql', '-u', 'boletera_user', '-pCer0un0cer0.com20182417', 
-        'boletera_db'
-    ], input=f"UPDATE VenueLayout SET layoutJson = '{layout_json_str}' WHERE id = '{LAYOUT_ID}';",
-       capture_output=True, text=True)
-    
-    if result.returncode == 0:
-        print('Layout actualizado en la DB correctamente!')
-    else:
-        print(f'Error: {result.stderr}')
+    parser = argparse.ArgumentParser(description='Guardar los asientos generados en el layoutJson')
+    parser.add_argument('--compact', action='store_true',
+                        help='Guardar los asientos como un bloque compactSeats')
+    args = parser.parse_args()
+
+    new_seats = list(iter_json_array(iter_file_chunks('/tmp/seats_for_canvas.json')))
+    if args.compact:
+        new_seats = [encode_seats(expand_objects(new_seats))]
+    print(f'Asientos a guardar: {sum(seat_count(seat) for seat in new_seats)}')
+
+    db = get_pool()
+    try:
+        # Cambio del layoutJson y revision del historial en una sola transaccion
+        with db.transaction() as cursor:
+            # La version previa debe estar en el historial antes de sobrescribirla
+            ensure_base(db, LAYOUT_ID, cursor=cursor)
+            plan = replace_layout_seats(db, LAYOUT_ID, new_seats, cursor=cursor, document=True)
+            version, kind, size = save_revision(db, LAYOUT_ID, plan['document'], cursor=cursor)
+    except (ValueError, LookupError) as e:
+        print(f'Error: layoutJson invalido o no encontrado ({e})')
+        return
+
+    print(f"Objetos conservados: {plan['kept']}, asientos reemplazados: {plan['seats']}")
+    print(f'Revision v{version} guardada en el historial ({kind}, {size} caracteres)')
+    print('Layout actualizado en la DB correctamente!')
 
 if __name__ == '__main__':
     main()
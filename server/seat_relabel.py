@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Cambios de label de asientos ya guardados en la tabla Seat: renumerar
+(fix_tangamanga_seats.py) o reetiquetar filas (relabel_rows.py) en una sola
+transaccion, incluyendo los asientos con metadata comprimida.
+"""
+
+from blob_codec import ENCODED_SQL, rewrite_json_blob
+
+
+def set_encoded_canvas_labels(db, cursor, table):
+    """
+    Poner metadata.canvas.label a los asientos con metadata comprimida
+    (blob_codec.py), que el JSON_SET de los UPDATE unidos deja sin cambio.
+    table es la tabla temporal con (id, canvasLabel).
+    """
+    cursor.execute(f"""
+        SELECT s.id, s.metadata, r.canvasLabel
+        FROM Seat s JOIN {table} r ON r.id = s.id
+        WHERE {ENCODED_SQL.format(column='s.metadata')}
+    """)
+    updates = []
+    for seat_id, metadata, canvas_label in cursor.fetchall():
+        def set_label(obj, label=canvas_label):
+            obj.setdefault('canvas', {})['label'] = label
+        updates.append((rewrite_json_blob(metadata, set_label), seat_id))
+    if not updates:
+        return 0
+    return db.update_many('Seat', 'id', ('metadata',), updates, cursor=cursor)
+
+
+# Columna que cambia junto con el label en apply_label_changes y su tipo
+LABEL_CHANGE_COLUMNS = {'columnNumber': 'INT', 'rowLabel': 'VARCHAR(191)'}
+
+
+def apply_label_changes(db, column, changes):
+    """
+    Aplicar en una transaccion cambios (id, nuevo valor de column, label,
+    canvasLabel), con column 'columnNumber' (renumerar) o 'rowLabel'
+    (reetiquetar filas): tabla temporal, labels liberados y un solo UPDATE
+    unido. Regresa cuantos asientos se actualizaron.
+    """
+    with db.transaction() as cursor:
+        cursor.execute(f"""
+            CREATE TEMPORARY TABLE seat_label_change (
+                id VARCHAR(191) NOT NULL PRIMARY KEY,
+                {column} {LABEL_CHANGE_COLUMNS[column]} NOT NULL,
+                label VARCHAR(191) NOT NULL,
+                canvasLabel VARCHAR(191) NOT NULL
+            )
+        """)
+        db.executemany(
+            f'INSERT INTO seat_label_change (id, {column}, label, canvasLabel) VALUES (%s, %s, %s, %s)',
+            changes, cursor=cursor
+        )
+        # @@unique([layoutId, label]): al reordenar o intercambiar filas los
+        # labels chocarian, asi que primero se liberan
+        cursor.execute("""
+            UPDATE Seat s JOIN seat_label_change r ON r.id = s.id
+            SET s.label = CONCAT('~relabel~', s.id)
+        """)
+        cursor.execute(f"""
+            UPDATE Seat s JOIN seat_label_change r ON r.id = s.id
+            SET s.{column} = r.{column},
+                s.label = r.label,
+                s.metadata = IF(LEFT(s.metadata, 3) = '~bz', s.metadata,
+                                JSON_SET(s.metadata, '$.canvas.label', r.canvasLabel)),
+                s.updatedAt = NOW()
+        """)
+        updated = cursor.rowcount
+        set_encoded_canvas_labels(db, cursor, 'seat_label_change')
+        cursor.execute('DROP TEMPORARY TABLE seat_label_change')
+    return updated
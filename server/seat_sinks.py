@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Salidas incrementales para los generadores de asientos.
+Cada asiento generado es un SeatRecord que se entrega uno por uno a las
+salidas (SQL, TSV de carga masiva, JSON del canvas, JSON completo), que
+escriben al vuelo en lugar de juntar listas de todo el venue en memoria.
+"""
+
+import json
+import re
+from collections import namedtuple
+
+from blob_codec import decode_blob
+from compact_seats import CompactSeatsEncoder
+
+# seat: dict de la tabla Seat, canvas: objeto Circle de Fabric.js,
+# sql_values: tupla "(...)" para el INSERT (None si el asiento no se inserta)
+SeatRecord = namedtuple('SeatRecord', ['seat', 'canvas', 'sql_values'])
+
+# Columnas materializadas de metadata (indexadas, ver backfill_seat_columns.py)
+SEAT_INDEX_COLUMNS = ('sectionId', 'sectionName', 'posX', 'posY')
+
+# Columnas de Seat en el archivo de carga masiva (createdAt/updatedAt los pone la DB)
+SEAT_DATA_COLUMNS = ('id', 'venueId', 'layoutId', 'label', 'rowLabel', 'columnNumber', 'status', 'metadata')
+SEAT_COLUMNS = SEAT_DATA_COLUMNS + SEAT_INDEX_COLUMNS
+
+# Encabezado de los INSERT de insert_seats.sql (los VALUES siguen SEAT_COLUMNS)
+SEAT_INSERT_HEADER = f"INSERT INTO Seat ({', '.join(SEAT_COLUMNS)}, createdAt, updatedAt) VALUES\n"
+
+_TSV_ESCAPES = {'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r', '\0': '\\0'}
+_TSV_UNESCAPES = {'t': '\t', 'n': '\n', 'r': '\r', '0': '\0', '\\': '\\'}
+_TSV_ESCAPE_RE = re.compile('[\\\\\t\n\r\0]')
+_TSV_UNESCAPE_RE = re.compile(r'\\(.)')
+
+
+def seat_index_values(metadata):
+    """Valores de SEAT_INDEX_COLUMNS a partir de metadata (dict o JSON string)"""
+    if isinstance(metadata, (str, bytes)):
+        metadata = json.loads(decode_blob(metadata))
+    metadata = metadata or {}
+    position = (metadata.get('canvas') or {}).get('position') or {}
+    return (metadata.get('sectionId'), metadata.get('sectionName'), position.get('x'), position.get('y'))
+
+
+def sql_literal(value):
+    """Literal SQL de un valor de las columnas indexadas"""
+    if value is None:
+        return 'NULL'
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def seat_index_sql(metadata):
+    """Valores de SEAT_INDEX_COLUMNS como literales SQL separados por coma"""
+    return ', '.join(sql_literal(value) for value in seat_index_values(metadata))
+
+
+def seat_row(seat):
+    """Tupla con SEAT_COLUMNS para un asiento generado"""
+    values = tuple(seat.get(column) for column in SEAT_DATA_COLUMNS)
+    return values + seat_index_values(seat.get('metadata'))
+
+
+def tsv_escape(value):
+    """
+    Escapar un valor para LOAD DATA con los delimitadores por defecto de
+    MySQL (TAB, salto de linea, escape con backslash, NULL como \\N).
+    """
+    if value is None:
+        return '\\N'
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, ensure_ascii=False)
+    return _TSV_ESCAPE_RE.sub(lambda m: _TSV_ESCAPES[m.group()], str(value))
+
+
+def tsv_unescape(field):
+    if field == '\\N':
+        return None
+    return _TSV_UNESCAPE_RE.sub(lambda m: _TSV_UNESCAPES.get(m.group(1), m.group(1)), field)
+
+
+def read_tsv(path):
+    """Leer un archivo escrito por TsvSink; regresa una tupla por fila"""
+    with open(path, 'r', encoding='utf-8', newline='\n') as f:
+        for line in f:
+            yield tuple(tsv_unescape(field) for field in line.rstrip('\n').split('\t'))
+
+
+class SeatSink:
+    """Base de las salidas: se usan como context manager"""
+
+    def write(self, record):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class SqlInsertSink(SeatSink):
+    """
+    Escribe INSERTs de varias filas en bloques de chunk_size, con el mismo
+    formato que se generaba antes a partir de la lista completa.
+    """
+
+    def __init__(self, path, preamble, insert_header, chunk_size=100):
+        self.path = path
+        self.insert_header = insert_header
+        self.chunk_size = chunk_size
+        self.in_chunk = 0
+        self.count = 0
+        self.f = open(path, 'w', encoding='utf-8')
+        self.f.write(preamble)
+
+    def write(self, record):
+        if record.sql_values is None:
+            return
+        if self.in_chunk == 0:
+            self.f.write(self.insert_header)
+        else:
+            self.f.write(',\n')
+        self.f.write(record.sql_values)
+        self.in_chunk += 1
+        self.count += 1
+        if self.in_chunk == self.chunk_size:
+            self.f.write(';\n\n')
+            self.in_chunk = 0
+
+    def close(self):
+        if self.f.closed:
+            return
+        if self.in_chunk:
+            self.f.write(';\n\n')
+            self.in_chunk = 0
+        self.f.close()
+
+
+class JsonArraySink(SeatSink):
+    """
+    Escribe un arreglo JSON elemento por elemento. La salida es identica a
+    json.dump(lista, f, ensure_ascii=False, indent=2).
+    """
+
+    def __init__(self, path, field, indent=2):
+        self.path = path
+        self.field = field
+        self.indent = indent
+        self.count = 0
+        self.f = open(path, 'w', encoding='utf-8')
+        self.f.write('[')
+
+    def write(self, record):
+        item = getattr(record, self.field)
+        text = json.dumps(item, ensure_ascii=False, indent=self.indent)
+        pad = ' ' * self.indent
+        # Los strings JSON no contienen saltos de linea literales
+        self.f.write((',\n' if self.count else '\n') + pad + text.replace('\n', '\n' + pad))
+        self.count += 1
+
+    def close(self):
+        if self.f.closed:
+            return
+        self.f.write('\n]' if self.count else ']')
+        self.f.close()
+
+
+class TsvSink(SeatSink):
+    """
+    Archivo de carga masiva (tab-separated) para LOAD DATA LOCAL INFILE.
+    Solo incluye los asientos que se van a insertar (sql_values no es None).
+    """
+
+    def __init__(self, path, columns=SEAT_COLUMNS):
+        self.path = path
+        self.columns = columns
+        self.count = 0
+        self.f = open(path, 'w', encoding='utf-8', newline='\n')
+
+    def write(self, record):
+        if record.sql_values is None:
+            return
+        row = dict(zip(SEAT_COLUMNS, seat_row(record.seat)))
+        self.f.write('\t'.join(tsv_escape(row[column]) for column in self.columns) + '\n')
+        self.count += 1
+
+    def close(self):
+        if not self.f.closed:
+            self.f.close()
+
+
+class CompactCanvasSink(SeatSink):
+    """
+    Asientos del canvas como un solo bloque compactSeats (ver
+    compact_seats.py). El archivo es un arreglo JSON con ese bloque, asi que
+    update_layout.py y save_layout.py lo usan igual que seats_for_canvas.json.
+    """
+
+    def __init__(self, path, indent=None):
+        self.path = path
+        self.indent = indent
+        self.encoder = CompactSeatsEncoder()
+
+    @property
+    def count(self):
+        return self.encoder.count
+
+    def write(self, record):
+        self.encoder.add(record.canvas)
+
+    def close(self):
+        if self.path is None:
+            return
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump([self.encoder.block()], f, ensure_ascii=False, indent=self.indent)
+        self.path = None
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Almacen compacto de asientos para las herramientas de Python.
+En lugar de un dict anidado por asiento (y otro para el canvas), guarda las
+coordenadas como columnas float32 y las secciones, filas, estados y labels de
+canvas en tablas internadas. Los dicts solo se arman al serializar.
+
+Lo usan las herramientas que tienen todos los asientos en memoria:
+generate_seats_db_v2.py (cada seccion genera su propio almacen y se unen con
+extend), fix_tangamanga_seats.py, relabel_rows.py y seat_tiles.py.
+generate_seats_db_v3.py no lo necesita porque pasa cada SeatRecord directo a
+los sinks sin juntarlos, y sync_seats.py compara el metadata completo de cada
+asiento.
+
+Uso como auditoria:
+    python3 seat_store.py layout-data.json
+"""
+
+import json
+import sys
+import tracemalloc
+from array import array
+
+import numpy as np
+
+from blob_codec import decode_blob
+from compact_seats import expand_objects
+
+
+class StringTable:
+    """Tabla de strings internados: cada valor distinto se guarda una vez"""
+    __slots__ = ('values', 'index')
+
+    def __init__(self):
+        self.values = []
+        self.index = {}
+
+    def intern(self, value):
+        idx = self.index.get(value)
+        if idx is None:
+            idx = len(self.values)
+            self.index[value] = idx
+            self.values.append(value)
+        return idx
+
+    def __getitem__(self, idx):
+        return self.values[idx]
+
+    def __len__(self):
+        return len(self.values)
+
+
+def _float32_to_py(values):
+    """Convertir float32 a float usando la representacion mas corta (751.04, no 751.0399780273438)"""
+    return [float(s) for s in values.astype(str)]
+
+
+class SeatStore:
+    """
+    Asientos en estructura de arreglos.
+
+    Por asiento solo se guardan el id y el label de la DB (unicos), columnas
+    numericas (x, y en float32; size en float64 porque no va redondeado;
+    numero en int32) e indices a las tablas
+    de secciones (sectionId, sectionName, color), filas, labels de canvas y
+    estados.
+    """
+    __slots__ = (
+        'venue_id', 'layout_id',
+        'ids', 'labels',
+        'x', 'y', 'size', 'number',
+        'section', 'row', 'display', 'status',
+        'sections', 'rows', 'displays', 'statuses',
+    )
+
+    def __init__(self, venue_id=None, layout_id=None):
+        self.venue_id = venue_id
+        self.layout_id = layout_id
+        self.ids = []
+        self.labels = []
+        self.x = array('f')
+        self.y = array('f')
+        self.size = array('d')
+        self.number = array('i')
+        self.section = array('H')
+        self.row = array('H')
+        self.display = array('I')
+        self.status = array('B')
+        self.sections = StringTable()   # valores: (sectionId, sectionName, color)
+        self.rows = StringTable()
+        self.displays = StringTable()
+        self.statuses = StringTable()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def append(self, seat_id, label, section_id, section_name, color, row, number,
+               x, y, size, display=None, status='AVAILABLE'):
+        """Agregar un asiento y regresar su indice"""
+        row = str(row)
+        if display is None:
+            display = f'{row}-{number}'
+        self.ids.append(seat_id)
+        self.labels.append(label)
+        self.x.append(x)
+        self.y.append(y)
+        self.size.append(size)
+        self.number.append(int(number))
+        self.section.append(self.sections.intern((section_id, section_name, color)))
+        self.row.append(self.rows.intern(row))
+        self.display.append(self.displays.intern(display))
+        self.status.append(self.statuses.intern(status))
+        return len(self.ids) - 1
+
+    def extend(self, other):
+        """Agregar al final los asientos de otro almacen (p. ej. el de una seccion)"""
+        def remap(table, other_table, indexes, typecode):
+            mapping = [table.intern(value) for value in other_table.values]
+            return array(typecode, (mapping[i] for i in indexes))
+
+        self.ids.extend(other.ids)
+        self.labels.extend(other.labels)
+        self.x.extend(other.x)
+        self.y.extend(other.y)
+        self.size.extend(other.size)
+        self.number.extend(other.number)
+        self.section.extend(remap(self.sections, other.sections, other.section, 'H'))
+        self.row.extend(remap(self.rows, other.rows, other.row, 'H'))
+        self.display.extend(remap(self.displays, other.displays, other.display, 'I'))
+        self.status.extend(remap(self.statuses, other.statuses, other.status, 'B'))
+
+    def append_seat_row(self, seat):
+        """Agregar un asiento con el formato de la tabla Seat (metadata dict o JSON string)"""
+        metadata = seat.get('metadata') or {}
+        if isinstance(metadata, str):
+            metadata = json.loads(decode_blob(metadata))
+        canvas = metadata.get('canvas') or {}
+        position = canvas.get('position') or {}
+        size = canvas.get('size') or {}
+        return self.append(
+            seat['id'], seat['label'],
+            metadata.get('sectionId'), metadata.get('sectionName'),
+            metadata.get('color') or metadata.get('fill'),
+            seat.get('rowLabel') or '', seat.get('columnNumber') or 0,
+            position.get('x', 0), position.get('y', 0), size.get('width', 0),
+            display=canvas.get('label'), status=seat.get('status') or 'AVAILABLE',
+        )
+
+    def append_canvas_object(self, obj, label=None):
+        """Agregar un asiento a partir de un objeto Circle del canvas (_customType == 'seat')"""
+        number = obj.get('number') or 0
+        row = obj.get('row') or ''
+        return self.append(
+            obj.get('seatId') or obj.get('id'), label or f'{row}-{number}',
+            obj.get('sectionId'), obj.get('section'), obj.get('fill'),
+            row, number, obj.get('left', 0), obj.get('top', 0), obj.get('width', 0),
+            status=(obj.get('status') or 'available').upper(),
+        )
+
+    @classmethod
+    def from_seat_rows(cls, seats, venue_id=None, layout_id=None):
+        store = cls(venue_id, layout_id)
+        for seat in seats:
+            if store.venue_id is None:
+                store.venue_id = seat.get('venueId')
+                store.layout_id = seat.get('layoutId')
+            store.append_seat_row(seat)
+        return store
+
+    @classmethod
+    def from_records(cls, records, venue_id=None, layout_id=None):
+        """Llenar el almacen con los SeatRecord de los generadores"""
+        return cls.from_seat_rows((record.seat for record in records), venue_id, layout_id)
+
+    @classmethod
+    def from_canvas_objects(cls, objects, venue_id=None, layout_id=None):
+        store = cls(venue_id, layout_id)
+        for obj in objects:
+            if obj.get('_customType') == 'seat':
+                store.append_canvas_object(obj)
+        return store
+
+    @classmethod
+    def load(cls, path):
+        """Cargar asientos de un archivo JSON (ver from_json)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_json(json.load(f))
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        Asientos de un JSON ya leido: respuesta de layout (con 'seats' o
+        layoutJson.canvas.objects), lista de filas Seat o lista de objetos
+        del canvas.
+        """
+        if isinstance(data, dict):
+            if data.get('seats'):
+                return cls.from_seat_rows(data['seats'], data.get('venueId'), data.get('id'))
+            layout = data.get('layoutJson', data)
+            if isinstance(layout, str):
+                layout = json.loads(decode_blob(layout))
+            objects = expand_objects(layout.get('canvas', {}).get('objects', []))
+            return cls.from_canvas_objects(objects, data.get('venueId'), data.get('id'))
+        if data and '_customType' in data[0]:
+            return cls.from_canvas_objects(data)
+        return cls.from_seat_rows(data)
+
+    def coords(self):
+        """Arreglo (n, 2) float32 de posiciones, p. ej. para classify_points"""
+        xs = np.frombuffer(self.x, dtype=np.float32)
+        ys = np.frombuffer(self.y, dtype=np.float32)
+        return np.column_stack((xs, ys))
+
+    def group_by_section_row(self):
+        """
+        Agrupar asientos por (sectionId, rowLabel), cada grupo con sus
+        indices ordenados por X.
+        """
+        section = np.frombuffer(self.section, dtype=np.uint16)
+        row = np.frombuffer(self.row, dtype=np.uint16)
+        xs = np.frombuffer(self.x, dtype=np.float32)
+        order = np.lexsort((xs, row, section))
+        keys = section[order].astype(np.int64) * 65536 + row[order]
+        bounds = np.flatnonzero(np.diff(keys)) + 1
+        groups = {}
+        for chunk in np.split(order, bounds):
+            if len(chunk):
+                i = chunk[0]
+                groups[(self.sections[self.section[i]][0], self.rows[self.row[i]])] = chunk
+        return groups
+
+    def iter_seat_dicts(self):
+        """Asientos con el formato de la tabla Seat (igual que los generadores)"""
+        xs = _float32_to_py(np.frombuffer(self.x, dtype=np.float32))
+        ys = _float32_to_py(np.frombuffer(self.y, dtype=np.float32))
+        sizes = self.size.tolist()
+        for i in range(len(self.ids)):
+            section_id, section_name, color = self.sections[self.section[i]]
+            yield {
+                'id': self.ids[i],
+                'venueId': self.venue_id,
+                'layoutId': self.layout_id,
+                'label': self.labels[i],
+                'rowLabel': self.rows[self.row[i]],
+                'columnNumber': self.number[i],
+                'status': self.statuses[self.status[i]],
+                'metadata': {
+                    'sectionId': section_id,
+                    'sectionName': section_name,
+                    'color': color,
+                    'canvas': {
+                        'position': {'x': xs[i], 'y': ys[i]},
+                        'size': {'width': sizes[i], 'height': sizes[i]},
+                        'label': self.displays[self.display[i]]
+                    }
+                }
+            }
+
+    def iter_canvas_dicts(self):
+        """Asientos como objetos Circle de Fabric.js"""
+        xs = _float32_to_py(np.frombuffer(self.x, dtype=np.float32))
+        ys = _float32_to_py(np.frombuffer(self.y, dtype=np.float32))
+        sizes = self.size.tolist()
+        for i in range(len(self.ids)):
+            section_id, section_name, color = self.sections[self.section[i]]
+            yield {
+                "type": "Circle",
+                "version": "6.9.0",
+                "originX": "center",
+                "originY": "center",
+                "left": xs[i],
+                "top": ys[i],
+                "width": sizes[i],
+                "height": sizes[i],
+                "fill": color,
+                "stroke": "#ffffff",
+                "strokeWidth": 1,
+                "radius": sizes[i] / 2,
+                "opacity": 1,
+                "visible": True,
+                "selectable": True,
+                "evented": True,
+                "_customType": "seat",
+                "seatId": self.ids[i],
+                "row": self.rows[self.row[i]],
+                "number": str(self.number[i]),
+                "section": section_name,
+                "sectionId": section_id,
+                "status": self.statuses[self.status[i]].lower(),
+                "price": 0
+            }
+
+
+def main():
+    if len(sys.argv) < 2:
+        print('Uso: python3 seat_store.py <archivo.json>')
+        return
+
+    tracemalloc.start()
+    store = SeatStore.load(sys.argv[1])
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f'Asientos: {len(store)}')
+    print(f'Secciones: {len(store.sections)}, filas distintas: {len(store.rows)}')
+    if len(store):
+        print(f'Memoria retenida: {current / 1024:.0f} KB ({current / len(store):.0f} bytes por asiento)')
+
+    counts = {}
+    for idx in store.section:
+        counts[idx] = counts.get(idx, 0) + 1
+    for idx, count in counts.items():
+        section_id, section_name, _ = store.sections[idx]
+        print(f'  {section_name} ({section_id}): {count}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Teselas de nivel de detalle (LOD) de los asientos de un layout, para que el
+canvas cargue solo lo visible en venues grandes.
+
+Los asientos se reparten en un quadtree sobre el cuadrado que contiene al
+venue: en el nivel z hay 2^z x 2^z teselas. seatZoom es el primer nivel en
+el que ninguna tesela pasa de MAX_SEATS_PER_TILE asientos:
+
+  z < seatZoom    tesela "sections": un agregado por seccion (conteo, caja,
+                  centroide y color), para pintar bloques en lugar de asientos
+  z == seatZoom   tesela "seats": los asientos en columnas por seccion, con
+                  coordenadas enteras relativas a la tesela (1/COORD_SCALE px)
+
+Con mas zoom el cliente sigue usando las teselas de seatZoom. El estado de
+venta no va en las teselas (solo geometria); sale de la disponibilidad del
+evento.
+
+Salida en uploads/tiles/<layoutId>/v<version>/ (el servidor la publica en
+/uploads/): index.json con los limites y la lista de teselas no vacias, y
+<z>/<x>/<y>.json por tesela. Una version nueva del layout va en otra carpeta.
+
+    python3 seat_tiles.py --layout ad44b249-...
+    python3 seat_tiles.py --file layout-data.json --output /tmp/tiles
+"""
+
+import argparse
+import json
+import os
+import shutil
+
+import numpy as np
+
+from boletera_db import get_pool
+from compact_seats import expand_objects
+from layout_stream import iter_canvas_objects, iter_layout_chunks
+from seat_store import SeatStore
+
+TILE_FORMAT = 1
+MAX_SEATS_PER_TILE = 1024
+MAX_ZOOM = 10
+COORD_SCALE = 10
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads', 'tiles')
+
+
+def tile_grid(store):
+    """(x0, y0, lado) del cuadrado que contiene a todos los asientos"""
+    xs = np.frombuffer(store.x, dtype=np.float32)
+    ys = np.frombuffer(store.y, dtype=np.float32)
+    radius = float(np.max(np.frombuffer(store.size, dtype=np.float64))) / 2
+    x0, y0 = float(xs.min()) - radius, float(ys.min()) - radius
+    side = max(float(xs.max()) - x0, float(ys.max()) - y0) + radius
+    return x0, y0, max(side, 1.0)
+
+
+def tile_keys(store, grid, z):
+    """Indice lineal (ty * 2^z + tx) de la tesela de cada asiento en el nivel z"""
+    x0, y0, side = grid
+    n = 1 << z
+    xs = np.frombuffer(store.x, dtype=np.float32).astype(np.float64)
+    ys = np.frombuffer(store.y, dtype=np.float32).astype(np.float64)
+    tx = np.clip(((xs - x0) / side * n).astype(np.int64), 0, n - 1)
+    ty = np.clip(((ys - y0) / side * n).astype(np.int64), 0, n - 1)
+    return ty * n + tx
+
+
+def iter_tiles(keys):
+    """(llave, indices de asientos) por tesela no vacia"""
+    order = np.argsort(keys, kind='stable')
+    bounds = np.flatnonzero(np.diff(keys[order])) + 1
+    for chunk in np.split(order, bounds):
+        if len(chunk):
+            yield int(keys[chunk[0]]), chunk
+
+
+def pick_seat_zoom(store, grid, max_seats=MAX_SEATS_PER_TILE, max_zoom=MAX_ZOOM):
+    for z in range(max_zoom + 1):
+        counts = np.bincount(tile_keys(store, grid, z))
+        if counts.max() <= max_seats:
+            return z
+    return max_zoom
+
+
+def _scalar_or_list(values):
+    return values[0] if all(value == values[0] for value in values) else values
+
+
+def section_aggregates(store, indices):
+    """Un agregado por seccion de los asientos en indices"""
+    xs = np.frombuffer(store.x, dtype=np.float32)[indices]
+    ys = np.frombuffer(store.y, dtype=np.float32)[indices]
+    sections = np.frombuffer(store.section, dtype=np.uint16)[indices]
+    result = []
+    for section in np.unique(sections):
+        mask = sections == section
+        sx, sy = xs[mask], ys[mask]
+        section_id, name, color = store.sections[int(section)]
+        result.append({
+            'sectionId': section_id,
+            'section': name,
+            'fill': color,
+            'count': int(mask.sum()),
+            'bbox': [round(float(sx.min()), 1), round(float(sy.min()), 1),
+                     round(float(sx.max()), 1), round(float(sy.max()), 1)],
+            'center': [round(float(sx.mean()), 1), round(float(sy.mean()), 1)],
+        })
+    return result
+
+
+def seat_batches(store, indices, origin):
+    """Asientos de una tesela en columnas por seccion"""
+    ox, oy = origin
+    sections = np.frombuffer(store.section, dtype=np.uint16)[indices]
+    xs = np.frombuffer(store.x, dtype=np.float32)
+    ys = np.frombuffer(store.y, dtype=np.float32)
+    sizes = np.frombuffer(store.size, dtype=np.float64)
+    result = []
+    for section in np.unique(sections):
+        chunk = indices[sections == section]
+        section_id, name, color = store.sections[int(section)]
+        ids = [store.ids[i] for i in chunk]
+        prefix = os.path.commonprefix(ids)
+        prefix = prefix[:min(len(prefix), min(len(i) for i in ids) - 1)]
+        result.append({
+            'sectionId': section_id,
+            'section': name,
+            'fill': color,
+            'count': len(chunk),
+            'idPrefix': prefix,
+            'id': [seat_id[len(prefix):] for seat_id in ids],
+            'x': np.rint((xs[chunk] - ox) * COORD_SCALE).astype(np.int64).tolist(),
+            'y': np.rint((ys[chunk] - oy) * COORD_SCALE).astype(np.int64).tolist(),
+            'r': _scalar_or_list([round(float(sizes[i]) / 2, 2) for i in chunk]),
+            'row': _scalar_or_list([store.rows[store.row[i]] for i in chunk]),
+            'number': [store.number[i] for i in chunk],
+        })
+    return result
+
+
+def build_tiles(store, max_seats=MAX_SEATS_PER_TILE, max_zoom=MAX_ZOOM):
+    """Regresa (index, {(z, x, y): tesela})"""
+    grid = tile_grid(store)
+    x0, y0, side = grid
+    seat_zoom = pick_seat_zoom(store, grid, max_seats, max_zoom)
+    tiles = {}
+    levels = {}
+    for z in range(seat_zoom + 1):
+        n = 1 << z
+        tile_side = side / n
+        levels[z] = []
+        for key, indices in iter_tiles(tile_keys(store, grid, z)):
+            tx, ty = key % n, key // n
+            origin = (x0 + tx * tile_side, y0 + ty * tile_side)
+            tile = {'format': TILE_FORMAT, 'z': z, 'x': tx, 'y': ty,
+                    'origin': [round(origin[0], 3), round(origin[1], 3)]}
+            if z < seat_zoom:
+                tile['kind'] = 'sections'
+                tile['sections'] = section_aggregates(store, indices)
+            else:
+                tile['kind'] = 'seats'
+                tile['scale'] = COORD_SCALE
+                tile['sections'] = seat_batches(store, indices, origin)
+            tiles[(z, tx, ty)] = tile
+            levels[z].append([tx, ty, len(indices)])
+
+    index = {
+        'format': TILE_FORMAT,
+        'layoutId': store.layout_id,
+        'bounds': [round(x0, 3), round(y0, 3), round(side, 3)],
+        'seatZoom': seat_zoom,
+        'maxSeatsPerTile': max_seats,
+        'seats': len(store),
+        'sections': len(store.sections),
+        # Por nivel: [x, y, asientos] de cada tesela no vacia
+        'levels': {str(z): entries for z, entries in levels.items()},
+    }
+    return index, tiles
+
+
+def write_tiles(index, tiles, directory):
+    """Escribir en un directorio temporal y moverlo al final (los lectores no ven teselas a medias)"""
+    tmp = directory + '.tmp'
+    shutil.rmtree(tmp, ignore_errors=True)
+    total = 0
+    for (z, x, y), tile in tiles.items():
+        path = os.path.join(tmp, str(z), str(x), f'{y}.json')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            text = json.dumps(tile, ensure_ascii=False, separators=(',', ':'))
+            f.write(text)
+            total += len(text)
+    with open(os.path.join(tmp, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+    shutil.rmtree(directory, ignore_errors=True)
+    os.rename(tmp, directory)
+    return total
+
+
+def load_layout_store(db, layout_id):
+    """SeatStore y version de un VenueLayout, leyendo el layoutJson por pedazos"""
+    row = db.query_one('SELECT venueId, version FROM VenueLayout WHERE id = %s', (layout_id,))
+    if not row:
+        raise LookupError(f'No existe el layout {layout_id}')
+    objects = expand_objects(iter_canvas_objects(iter_layout_chunks(db, layout_id)))
+    return SeatStore.from_canvas_objects(objects, row[0], layout_id), row[1]
+
+
+def load_file_store(path):
+    """SeatStore y version (None si el archivo no la trae) de un JSON de layout"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    version = data.get('version') if isinstance(data, dict) else None
+    return SeatStore.from_json(data), version
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generar teselas LOD de asientos de un layout')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--layout', help='Id del VenueLayout en la DB')
+    source.add_argument('--file', help='JSON de layout (ver SeatStore.from_json)')
+    parser.add_argument('--version', type=int, help='Version para --file (default: la del archivo o 1)')
+    parser.add_argument('--output', default=OUTPUT_DIR, help=f'Directorio base (default: {OUTPUT_DIR})')
+    parser.add_argument('--max-seats', type=int, default=MAX_SEATS_PER_TILE,
+                        help=f'Asientos maximos por tesela de asientos (default: {MAX_SEATS_PER_TILE})')
+    args = parser.parse_args()
+
+    if args.layout:
+        store, version = load_layout_store(get_pool(size=1), args.layout)
+    else:
+        store, file_version = load_file_store(args.file)
+        version = args.version or file_version or 1
+    if not len(store):
+        print('El layout no tiene asientos')
+        return
+
+    index, tiles = build_tiles(store, args.max_seats)
+    index['version'] = version
+    directory = os.path.join(args.output, store.layout_id or 'layout', f'v{version}')
+    size = write_tiles(index, tiles, directory)
+
+    print(f'Asientos: {len(store)}, secciones: {len(store.sections)}')
+    print(f"Niveles 0-{index['seatZoom']} (asientos en z={index['seatZoom']}), teselas: {len(tiles)}")
+    for z, entries in index['levels'].items():
+        print(f'  z={z}: {len(entries)} teselas, max {max(e[2] for e in entries)} asientos')
+    print(f'Total {size:,} bytes en {directory}')
+
+
+if __name__ == '__main__':
+    main()
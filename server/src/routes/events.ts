@@ -4,6 +4,9 @@ import { RowDataPacket } from "mysql2";
 import { z } from "zod";
 import { query, withTransaction } from "../lib/db";
 import { ensureUniqueSlug, slugify } from "../utils/slug";
+import { parseBlobJson } from "../utils/blobCodec";
+import { parseLayoutJson } from "../utils/layoutJson";
+import { seatIndexValues } from "../utils/seatIndex";
 import { requireAuth, requireAdmin, requireOperator } from "../lib/authMiddleware";
 
 // Helper function to check if a point is inside a polygon (ray casting algorithm)
@@ -920,9 +923,9 @@ export async function eventRoutes(app: FastifyInstance) {
           for (const seat of templateSeats) {
             const newSeatId = randomUUID();
             await connection.query(
-              `INSERT INTO Seat (id, venueId, layoutId, zoneId, tableId, label, rowLabel, columnNumber, status, metadata, createdAt, updatedAt)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'AVAILABLE', ?, NOW(), NOW())`,
-              [newSeatId, payload.venueId, eventLayoutId, seat.zoneId, seat.tableId, seat.label, seat.rowLabel, seat.columnNumber, seat.metadata],
+              `INSERT INTO Seat (id, venueId, layoutId, zoneId, tableId, label, rowLabel, columnNumber, status, metadata, sectionId, sectionName, posX, posY, createdAt, updatedAt)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'AVAILABLE', ?, ?, ?, ?, ?, NOW(), NOW())`,
+              [newSeatId, payload.venueId, eventLayoutId, seat.zoneId, seat.tableId, seat.label, seat.rowLabel, seat.columnNumber, seat.metadata, ...seatIndexValues(seat.metadata)],
             );
           }
         }
@@ -1420,7 +1423,7 @@ export async function eventRoutes(app: FastifyInstance) {
     // Extract sectionIds from seat metadata
     const sectionIds = seats.map(s => {
       try {
-        const metadata = s.metadata ? JSON.parse(s.metadata) : null;
+        const metadata = s.metadata ? parseBlobJson(s.metadata) : null;
         return metadata?.sectionId;
       } catch { return null; }
     }).filter(Boolean);
@@ -1478,7 +1481,7 @@ export async function eventRoutes(app: FastifyInstance) {
           // Extract sectionId from seat metadata
           let seatSectionId: string | null = null;
           try {
-            const metadata = seat.metadata ? JSON.parse(seat.metadata) : null;
+            const metadata = seat.metadata ? parseBlobJson(seat.metadata) : null;
             seatSectionId = metadata?.sectionId || null;
           } catch {}
 
@@ -1736,7 +1739,7 @@ export async function eventRoutes(app: FastifyInstance) {
     const availability = seats.map((seat) => {
       let metadata = null;
       try {
-        metadata = seat.metadata ? JSON.parse(seat.metadata) : null;
+        metadata = seat.metadata ? parseBlobJson(seat.metadata) : null;
       } catch (e) {
         metadata = seat.metadata;
       }
@@ -1810,7 +1813,7 @@ export async function eventRoutes(app: FastifyInstance) {
     // Get layout dimensions from layoutJson
     let layoutData = null;
     try {
-      layoutData = eventLayout?.layoutJson ? JSON.parse(eventLayout.layoutJson) : null;
+      layoutData = eventLayout?.layoutJson ? parseLayoutJson(eventLayout.layoutJson) : null;
     } catch (e) {
       layoutData = null;
     }
@@ -1956,7 +1959,7 @@ export async function eventRoutes(app: FastifyInstance) {
         venueId: layout.venueId,
         name: layout.name,
         version: layout.version,
-        layoutJson: layout.layoutJson ? JSON.parse(layout.layoutJson) : null,
+        layoutJson: layout.layoutJson ? parseLayoutJson(layout.layoutJson) : null,
         metadata: layout.metadata ? JSON.parse(layout.metadata) : null,
         isDefault: Boolean(layout.isDefault),
         isTemplate: Boolean(layout.isTemplate),
@@ -1976,7 +1979,7 @@ export async function eventRoutes(app: FastifyInstance) {
         updatedAt: toISO(zone.updatedAt),
       })),
       seats: seats.map((seat) => {
-        const parsed = seat.metadata ? JSON.parse(seat.metadata) : {};
+        const parsed = seat.metadata ? parseBlobJson(seat.metadata) : {};
         const ticketInfo = soldSeatMap.get(seat.id);
         return {
           id: seat.id,
@@ -2504,7 +2507,7 @@ export async function eventRoutes(app: FastifyInstance) {
     // Parse layoutJson to check for embedded sections
     let layoutData: any = null;
     try {
-      layoutData = layoutJson ? JSON.parse(layoutJson) : null;
+      layoutData = layoutJson ? parseLayoutJson(layoutJson) : null;
     } catch (e) {
       // Invalid JSON
     }
@@ -2572,7 +2575,7 @@ export async function eventRoutes(app: FastifyInstance) {
       // Get seat position from metadata
       function getSeatPosition(seat: any): { x: number; y: number } | null {
         try {
-          const metadata = seat.metadata ? JSON.parse(seat.metadata) : null;
+          const metadata = seat.metadata ? parseBlobJson(seat.metadata) : null;
           const x = metadata?.canvas?.position?.x ?? metadata?.x;
           const y = metadata?.canvas?.position?.y ?? metadata?.y;
           if (x !== undefined && y !== undefined) {
@@ -2604,7 +2607,7 @@ export async function eventRoutes(app: FastifyInstance) {
           // Check sectionId in metadata first (most reliable)
           let seatSectionId: string | undefined;
           try {
-            const metadata = seat.metadata ? JSON.parse(seat.metadata) : null;
+            const metadata = seat.metadata ? parseBlobJson(seat.metadata) : null;
             seatSectionId = metadata?.sectionId;
           } catch (e) {}
           
@@ -2795,7 +2798,7 @@ export async function eventRoutes(app: FastifyInstance) {
         let metadata = {};
         
         try {
-          polygonPoints = section.polygonPoints ? JSON.parse(section.polygonPoints) : [];
+          polygonPoints = section.polygonPoints ? parseBlobJson(section.polygonPoints) : [];
           labelPosition = section.labelPosition ? JSON.parse(section.labelPosition) : null;
           metadata = section.metadata ? JSON.parse(section.metadata) : {};
         } catch (e) {
@@ -2838,7 +2841,7 @@ export async function eventRoutes(app: FastifyInstance) {
     // Get layout canvas dimensions
     let canvas = { width: 1200, height: 800 };
     try {
-      const layoutData = eventLayout?.layoutJson ? JSON.parse(eventLayout.layoutJson) : null;
+      const layoutData = eventLayout?.layoutJson ? parseLayoutJson(eventLayout.layoutJson) : null;
       if (layoutData?.canvas) {
         canvas = layoutData.canvas;
       }
@@ -2922,7 +2925,7 @@ export async function eventRoutes(app: FastifyInstance) {
       let polygonPoints: Array<{ x: number; y: number }> = [];
       let labelPosition = null;
       try {
-        polygonPoints = dbSection.polygonPoints ? JSON.parse(dbSection.polygonPoints) : [];
+        polygonPoints = dbSection.polygonPoints ? parseBlobJson(dbSection.polygonPoints) : [];
         labelPosition = dbSection.labelPosition ? JSON.parse(dbSection.labelPosition) : null;
       } catch (e) {}
 
@@ -2956,7 +2959,7 @@ export async function eventRoutes(app: FastifyInstance) {
         filteredSeats = allSeats.filter((seat) => {
           let metadata: any = null;
           try {
-            metadata = seat.metadata ? JSON.parse(seat.metadata) : null;
+            metadata = seat.metadata ? parseBlobJson(seat.metadata) : null;
           } catch (e) {}
 
           // Priority 1: Match by sectionId in metadata
@@ -3025,7 +3028,7 @@ export async function eventRoutes(app: FastifyInstance) {
       const seatsList = filteredSeats.map((seat) => {
         let metadata = null;
         try {
-          metadata = seat.metadata ? JSON.parse(seat.metadata) : null;
+          metadata = seat.metadata ? parseBlobJson(seat.metadata) : null;
         } catch (e) {
           metadata = seat.metadata;
         }
@@ -3068,7 +3071,7 @@ export async function eventRoutes(app: FastifyInstance) {
         const layoutSource = childLayout || await query<RowDataPacket[]>(
           `SELECT layoutJson FROM VenueLayout WHERE id = ?`, [eventLayoutId]
         ).then(r => r[0]);
-        const layoutData = layoutSource?.layoutJson ? JSON.parse(layoutSource.layoutJson) : null;
+        const layoutData = layoutSource?.layoutJson ? parseLayoutJson(layoutSource.layoutJson) : null;
         if (layoutData?.canvas) {
           canvas = { width: layoutData.canvas.width || 1200, height: layoutData.canvas.height || 800 };
         }
@@ -3121,7 +3124,7 @@ export async function eventRoutes(app: FastifyInstance) {
 
     let layoutData: any = null;
     try {
-      layoutData = layoutRecord.layoutJson ? JSON.parse(layoutRecord.layoutJson) : null;
+      layoutData = layoutRecord.layoutJson ? parseLayoutJson(layoutRecord.layoutJson) : null;
     } catch (e) {
       return reply.code(500).send({ message: "Error parsing layout JSON" });
     }
@@ -3176,7 +3179,7 @@ export async function eventRoutes(app: FastifyInstance) {
     let seats = allSeats.filter((seat) => {
       let metadata: any = null;
       try {
-        metadata = seat.metadata ? JSON.parse(seat.metadata) : null;
+        metadata = seat.metadata ? parseBlobJson(seat.metadata) : null;
       } catch (e) {
         // Invalid metadata
       }
@@ -3252,7 +3255,7 @@ export async function eventRoutes(app: FastifyInstance) {
     const seatsList = seats.map((seat) => {
       let metadata = null;
       try {
-        metadata = seat.metadata ? JSON.parse(seat.metadata) : null;
+        metadata = seat.metadata ? parseBlobJson(seat.metadata) : null;
       } catch (e) {
         metadata = seat.metadata;
       }
@@ -4,6 +4,7 @@ import { RowDataPacket } from "mysql2";
 import { z } from "zod";
 import { query, withTransaction } from "../lib/db";
 import { requireAdmin, requireOperator } from "../lib/authMiddleware";
+import { decodeBlob } from "../utils/blobCodec";
 
 // Types
 type LayoutSectionRow = RowDataPacket & {
@@ -69,7 +70,8 @@ const toISO = (value: Date | string | null) =>
 const safeParseJson = <T>(value: string | null, fallback: T): T => {
   if (!value) return fallback;
   try {
-    return JSON.parse(value);
+    // polygonPoints puede venir comprimido (server/blob_codec.py)
+    return JSON.parse(decodeBlob(value));
   } catch {
     return fallback;
   }
@@ -4,6 +4,10 @@ import { ResultSetHeader, RowDataPacket } from "mysql2";
 import { z } from "zod";
 import { query, withTransaction } from "../lib/db";
 import { ensureUniqueSlug, slugify } from "../utils/slug";
+import { encodeBlob, parseBlobJson } from "../utils/blobCodec";
+import { parseLayoutJson } from "../utils/layoutJson";
+import { recordLayoutRevision } from "../utils/layoutRevisions";
+import { SeatIndexValues, seatIndexValues } from "../utils/seatIndex";
 import { requireAdmin, requireOperator } from "../lib/authMiddleware";
 
 type VenueListRow = RowDataPacket & {
@@ -312,7 +316,7 @@ const parseSeatMetadata = (metadata: string | null): ParsedSeatMetadata => {
   }
 
   try {
-    const parsed = JSON.parse(metadata) as Record<string, unknown>;
+    const parsed = parseBlobJson(metadata) as Record<string, unknown>;
     const seatType = typeof parsed.seatType === "string" ? parsed.seatType : null;
     const basePrice = typeof parsed.price === "number" ? Number(parsed.price) : null;
     return { data: parsed, seatType, basePrice };
@@ -380,7 +384,7 @@ export async function venueRoutes(app: FastifyInstance) {
           if (layoutRow?.layoutJson) {
             try {
               const layoutData = typeof layoutRow.layoutJson === 'string' 
-                ? JSON.parse(layoutRow.layoutJson) 
+                ? parseLayoutJson(layoutRow.layoutJson) 
                 : layoutRow.layoutJson;
               const objects = layoutData?.canvas?.objects ?? [];
               // Count circles as seats (common pattern in canvas)
@@ -404,7 +408,7 @@ export async function venueRoutes(app: FastifyInstance) {
         postalCode: venue.postalCode,
         capacity: venue.capacity,
         description: venue.description,
-        layoutJson: venue.layoutJson ? JSON.parse(venue.layoutJson) : null,
+        layoutJson: venue.layoutJson ? parseLayoutJson(venue.layoutJson) : null,
         defaultLayoutId: venue.defaultLayoutId ?? null,
         createdAt: toISO(venue.createdAt),
         updatedAt: toISO(venue.updatedAt),
@@ -491,7 +495,7 @@ export async function venueRoutes(app: FastifyInstance) {
       postalCode: venue.postalCode,
       capacity: venue.capacity,
       description: venue.description,
-      layoutJson: venue.layoutJson ? JSON.parse(venue.layoutJson) : null,
+      layoutJson: venue.layoutJson ? parseLayoutJson(venue.layoutJson) : null,
       defaultLayoutId: (venue as VenueRow & { defaultLayoutId?: string }).defaultLayoutId ?? null,
       createdAt: toISO(venue.createdAt),
       updatedAt: toISO(venue.updatedAt),
@@ -618,8 +622,8 @@ export async function venueRoutes(app: FastifyInstance) {
           const serializedSeatMetadata = Object.keys(seatMetadata).length > 0 ? JSON.stringify(seatMetadata) : null;
 
           await connection.query(
-            `INSERT INTO Seat (id, venueId, layoutId, zoneId, label, rowLabel, columnNumber, status, metadata, createdAt, updatedAt)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NOW(), NOW())`,
+            `INSERT INTO Seat (id, venueId, layoutId, zoneId, label, rowLabel, columnNumber, status, metadata, sectionId, sectionName, posX, posY, createdAt, updatedAt)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NOW(), NOW())`,
             [
               seatId,
               venueId,
@@ -630,6 +634,7 @@ export async function venueRoutes(app: FastifyInstance) {
               seat.columnNumber ?? null,
               seat.status ?? "AVAILABLE",
               serializedSeatMetadata,
+              ...seatIndexValues(seatMetadata),
             ],
           );
         }
@@ -960,7 +965,7 @@ export async function venueRoutes(app: FastifyInstance) {
     // También extraer secciones del layoutJson si existen
     let embeddedSections: any[] = [];
     try {
-      const layoutData = layout.layoutJson ? JSON.parse(layout.layoutJson) : null;
+      const layoutData = layout.layoutJson ? parseLayoutJson(layout.layoutJson) : null;
       if (layoutData?.sections && Array.isArray(layoutData.sections)) {
         embeddedSections = layoutData.sections;
       }
@@ -975,7 +980,7 @@ export async function venueRoutes(app: FastifyInstance) {
         description: s.description,
         color: s.color,
         zoneId: s.zoneId,
-        polygonPoints: s.polygonPoints ? JSON.parse(s.polygonPoints) : [],
+        polygonPoints: s.polygonPoints ? parseBlobJson(s.polygonPoints) : [],
         labelPosition: s.labelPosition ? JSON.parse(s.labelPosition) : null,
         metadata: s.metadata ? JSON.parse(s.metadata) : null,
         seatCount: seats.filter(seat => {
@@ -1006,7 +1011,7 @@ export async function venueRoutes(app: FastifyInstance) {
       venueId: layout.venueId,
       name: layout.name,
       version: layout.version,
-      layoutJson: layout.layoutJson ? JSON.parse(layout.layoutJson) : null,
+      layoutJson: layout.layoutJson ? parseLayoutJson(layout.layoutJson) : null,
       metadata: layout.metadata ? JSON.parse(layout.metadata) : null,
       isDefault: Boolean(layout.isDefault),
       publishedAt: layout.publishedAt ? toISO(layout.publishedAt) : null,
@@ -1087,7 +1092,7 @@ export async function venueRoutes(app: FastifyInstance) {
       if (layout.layoutJson) {
         try {
           const parsed = typeof layout.layoutJson === 'string' 
-            ? JSON.parse(layout.layoutJson) 
+            ? parseLayoutJson(layout.layoutJson) 
             : layout.layoutJson;
           const objects = parsed?.canvas?.objects || [];
           jsonSeatCount = objects.filter((o: any) => 
@@ -1235,9 +1240,9 @@ export async function venueRoutes(app: FastifyInstance) {
       for (const seat of sourceSeats) {
         const newSeatId = randomUUID();
         await query(
-          `INSERT INTO Seat (id, venueId, layoutId, zoneId, tableId, label, rowLabel, columnNumber, status, metadata, createdAt, updatedAt)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'AVAILABLE', ?, NOW(), NOW())`,
-          [newSeatId, venue.id, newLayoutId, seat.zoneId, seat.tableId, seat.label, seat.rowLabel, seat.columnNumber, seat.metadata],
+          `INSERT INTO Seat (id, venueId, layoutId, zoneId, tableId, label, rowLabel, columnNumber, status, metadata, sectionId, sectionName, posX, posY, createdAt, updatedAt)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'AVAILABLE', ?, ?, ?, ?, ?, NOW(), NOW())`,
+          [newSeatId, venue.id, newLayoutId, seat.zoneId, seat.tableId, seat.label, seat.rowLabel, seat.columnNumber, seat.metadata, ...seatIndexValues(seat.metadata)],
         );
       }
 
@@ -1395,7 +1400,8 @@ export async function venueRoutes(app: FastifyInstance) {
     const zonesPayload = payload.zones ?? [];
     const seatsPayload = payload.seats ?? [];
     const tablesPayload = payload.tables ?? [];
-    const layoutJsonString = JSON.stringify(payload.layoutJson ?? {});
+    // Se guarda como sobre comprimido (ver utils/blobCodec.ts); los lectores lo expanden
+    const layoutJsonString = encodeBlob(JSON.stringify(payload.layoutJson ?? {}));
     const metadataString = payload.metadata ? JSON.stringify(payload.metadata) : null;
 
     // Version control: check If-Match header
@@ -1475,9 +1481,14 @@ export async function venueRoutes(app: FastifyInstance) {
         sections: { synced: 0 }, // Track sections synced
       };
 
-      await withTransaction(async (connection) => {
-        // 1. Update layout JSON and version
-        const newVersion = currentVersion + 1;
+      const savedVersion = await withTransaction(async (connection) => {
+        // 1. Record the revision (LayoutRevision, stores only the delta) and update layout JSON and version
+        const newVersion = await recordLayoutRevision(
+          connection,
+          layoutId,
+          payload.layoutJson ?? {},
+          (request.headers["x-user-id"] as string | undefined) ?? null,
+        );
         const [layoutUpdateResult] = await connection.query<ResultSetHeader>(
           `UPDATE VenueLayout SET layoutJson = ?, metadata = ?, version = ?, updatedAt = NOW() WHERE id = ? AND venueId = ?`,
           [layoutJsonString, metadataString, newVersion, payload.layoutId, venueId],
@@ -1750,8 +1761,8 @@ export async function venueRoutes(app: FastifyInstance) {
         const seenLabels = new Set<string>();
         let skippedDuplicates = 0;
         let skippedProtected = 0;
-        const seatsToInsert: Array<[string, string, string, string | null, string | null, string, string | null, number | null, string, string]> = [];
-        const seatsToUpdate: Array<{ id: string; zoneId: string | null; metadata: string }> = [];
+        const seatsToInsert: Array<[string, string, string, string | null, string | null, string, string | null, number | null, string, string, ...SeatIndexValues]> = [];
+        const seatsToUpdate: Array<{ id: string; zoneId: string | null; metadata: string; index: SeatIndexValues }> = [];
         
         for (const seat of seatsPayload) {
           const label = seat.label.trim();
@@ -1764,12 +1775,12 @@ export async function venueRoutes(app: FastifyInstance) {
           
           // Si el asiento está protegido (tiene tickets vendidos), solo actualizar metadata, no insertar
           if (protectedSeatIds.has(seat.id)) {
-            const seatMetadata = JSON.stringify(buildSeatMetadata(seat));
+            const metadata = buildSeatMetadata(seat);
             let zoneId: string | null = null;
             if (seat.zoneId && (!validZoneIds || validZoneIds.has(seat.zoneId))) {
               zoneId = seat.zoneId;
             }
-            seatsToUpdate.push({ id: seat.id, zoneId, metadata: seatMetadata });
+            seatsToUpdate.push({ id: seat.id, zoneId, metadata: JSON.stringify(metadata), index: seatIndexValues(metadata) });
             seenLabels.add(label);
             continue;
           }
@@ -1795,12 +1806,13 @@ export async function venueRoutes(app: FastifyInstance) {
             zoneId = seat.zoneId;
           }
 
-          const seatMetadata = JSON.stringify(buildSeatMetadata(seat));
+          const metadata = buildSeatMetadata(seat);
 
           seatsToInsert.push([
             seat.id, venueId, layoutId, zoneId, seat.tableId ?? null, 
             label, rowLabel, columnNumber, 
-            normalizeSeatStatus(seat.status), seatMetadata
+            normalizeSeatStatus(seat.status), JSON.stringify(metadata),
+            ...seatIndexValues(metadata),
           ]);
         }
         
@@ -1810,10 +1822,10 @@ export async function venueRoutes(app: FastifyInstance) {
         for (let i = 0; i < seatsToInsert.length; i += BATCH_SIZE) {
           const batch = seatsToInsert.slice(i, i + BATCH_SIZE);
           if (batch.length > 0) {
-            const placeholders = batch.map(() => '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NOW(), NOW())').join(', ');
+            const placeholders = batch.map(() => '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NOW(), NOW())').join(', ');
             const values = batch.flat();
             await connection.query(
-              `INSERT INTO Seat (id, venueId, layoutId, zoneId, tableId, label, rowLabel, columnNumber, status, metadata, createdAt, updatedAt)
+              `INSERT INTO Seat (id, venueId, layoutId, zoneId, tableId, label, rowLabel, columnNumber, status, metadata, sectionId, sectionName, posX, posY, createdAt, updatedAt)
                VALUES ${placeholders}
                ON DUPLICATE KEY UPDATE 
                  zoneId = VALUES(zoneId),
@@ -1823,6 +1835,10 @@ export async function venueRoutes(app: FastifyInstance) {
                  columnNumber = VALUES(columnNumber),
                  status = VALUES(status),
                  metadata = VALUES(metadata),
+                 sectionId = VALUES(sectionId),
+                 sectionName = VALUES(sectionName),
+                 posX = VALUES(posX),
+                 posY = VALUES(posY),
                  updatedAt = NOW()`,
               values,
             );
@@ -1833,8 +1849,8 @@ export async function venueRoutes(app: FastifyInstance) {
         // Update protected seats (only metadata and zoneId, keep status/label intact)
         for (const seatUpdate of seatsToUpdate) {
           await connection.query(
-            `UPDATE Seat SET zoneId = ?, metadata = ?, updatedAt = NOW() WHERE id = ?`,
-            [seatUpdate.zoneId, seatUpdate.metadata, seatUpdate.id],
+            `UPDATE Seat SET zoneId = ?, metadata = ?, sectionId = ?, sectionName = ?, posX = ?, posY = ?, updatedAt = NOW() WHERE id = ?`,
+            [seatUpdate.zoneId, seatUpdate.metadata, ...seatUpdate.index, seatUpdate.id],
           );
           syncStats.seats.updated = (syncStats.seats.updated ?? 0) + 1;
         }
@@ -1858,11 +1874,13 @@ export async function venueRoutes(app: FastifyInstance) {
             protectedLabelsCount: protectedLabels.size,
           }, 'Seats skipped during save');
         }
+
+        return newVersion;
       });
 
       return reply.send({ 
         success: true, 
-        version: currentVersion + 1,
+        version: savedVersion,
         sync: syncStats,
         warnings: syncStats.seats.protected > 0 || syncStats.zones.protected > 0
           ? `${syncStats.seats.protected} asientos y ${syncStats.zones.protected} zonas protegidos por tener boletos vendidos`
@@ -1892,23 +1910,46 @@ export async function venueRoutes(app: FastifyInstance) {
     }
   });
 
-  // GET /api/venues/:venueId/layouts/:layoutId/history - Layout version history
+  // GET /api/venues/:venueId/layouts/:layoutId/history?limit=&before= - Layout version history
   app.get("/api/venues/:venueId/layouts/:layoutId/history", async (request, reply) => {
     const paramsSchema = z.object({
       venueId: z.string().min(1),
       layoutId: z.string().min(1),
     });
+    const querySchema = z.object({
+      limit: z.coerce.number().int().min(1).max(100).default(10),
+      before: z.coerce.number().int().positive().optional(),
+    });
     const { venueId, layoutId } = paramsSchema.parse(request.params);
+    const { limit, before } = querySchema.parse(request.query);
 
+    // La version actual (VenueLayout) y las anteriores del historial por deltas
+    // (LayoutRevision, ver server/layout_revisions.py), paginadas por version sin
+    // leer los payloads. Cada version conserva la forma de siempre: id del
+    // layout y su metadata.
+    const versionFilter = before ? "AND version < ?" : "";
     const history = await query<RowDataPacket[]>(
-      `SELECT id, venueId, name, version, metadata, isDefault, publishedAt, createdBy, createdAt, updatedAt
-       FROM VenueLayout
-       WHERE venueId = ? AND id = ?
+      `SELECT * FROM (
+         SELECT id, venueId, name, version, metadata, isDefault, publishedAt, createdBy, createdAt, updatedAt
+         FROM VenueLayout
+         WHERE venueId = ? AND id = ?
+         UNION ALL
+         SELECT vl.id, vl.venueId, vl.name, r.version, vl.metadata, vl.isDefault, vl.publishedAt,
+                r.createdBy, r.createdAt, r.createdAt AS updatedAt
+         FROM LayoutRevision r
+         INNER JOIN VenueLayout vl ON vl.id = r.layoutId
+         WHERE vl.venueId = ? AND r.layoutId = ? AND r.version < vl.version
+       ) versions
+       WHERE 1 = 1 ${versionFilter}
        ORDER BY version DESC
-       LIMIT 10`,
-      [venueId, layoutId],
+       LIMIT ?`,
+      [venueId, layoutId, venueId, layoutId, ...(before ? [before] : []), limit],
     );
 
+    if (history.length === limit) {
+      reply.header("X-Next-Before", String(history[history.length - 1].version));
+    }
+
     return history.map((row) => ({
       id: row.id,
       venueId: row.venueId,
@@ -1965,7 +2006,7 @@ export async function venueRoutes(app: FastifyInstance) {
     const seatsByTable = seats.reduce((acc, seat) => {
       if (!seat.tableId) return acc;
       if (!acc[seat.tableId]) acc[seat.tableId] = [];
-      const meta = seat.metadata ? JSON.parse(seat.metadata) : {};
+      const meta = seat.metadata ? parseBlobJson(seat.metadata) : {};
       acc[seat.tableId].push({
         id: seat.id,
         label: seat.label,
@@ -2136,24 +2177,28 @@ export async function venueRoutes(app: FastifyInstance) {
       const seatNumber = config.startNumber + idx;
       const label = `${tableName}-${seatNumber}`;
 
+      const metadata = {
+        tableId,
+        offsetX: pos.offsetX,
+        offsetY: pos.offsetY,
+        angle: pos.angle,
+        shape: "circle",
+        seatType: "standard",
+      };
+
       return query(
-        `INSERT INTO Seat (id, venueId, zoneId, label, rowLabel, columnNumber, status, metadata, createdAt, updatedAt)
-         VALUES (?, ?, ?, ?, ?, ?, 'AVAILABLE', ?, NOW(), NOW())`,
+        `INSERT INTO Seat (id, venueId, zoneId, tableId, label, rowLabel, columnNumber, status, metadata, sectionId, sectionName, posX, posY, createdAt, updatedAt)
+         VALUES (?, ?, ?, ?, ?, ?, ?, 'AVAILABLE', ?, ?, ?, ?, ?, NOW(), NOW())`,
         [
           seatId,
           venueId,
           config.zoneId,
+          tableId,
           label,
           tableName,
           seatNumber,
-          JSON.stringify({
-            tableId,
-            offsetX: pos.offsetX,
-            offsetY: pos.offsetY,
-            angle: pos.angle,
-            shape: "circle",
-            seatType: "standard",
-          }),
+          JSON.stringify(metadata),
+          ...seatIndexValues(metadata),
         ]
       );
     });
@@ -2176,7 +2221,8 @@ export async function venueRoutes(app: FastifyInstance) {
 
     const { tableId } = paramsSchema.parse(request.params);
 
-    await query(`DELETE FROM Seat WHERE metadata->>'$.tableId' = ?`, [tableId]);
+    // Por la columna tableId: metadata puede estar comprimida (server/blob_codec.py)
+    await query(`DELETE FROM Seat WHERE tableId = ?`, [tableId]);
     await query(`DELETE FROM VenueTable WHERE id = ?`, [tableId]);
 
     return reply.code(200).send({ message: "Mesa eliminada" });
@@ -2210,7 +2256,7 @@ export async function venueRoutes(app: FastifyInstance) {
 
     // Get original seats
     const seats = await query<RowDataPacket[]>(
-      `SELECT * FROM Seat WHERE metadata->>'$.tableId' = ? ORDER BY columnNumber ASC`,
+      `SELECT * FROM Seat WHERE tableId = ? ORDER BY columnNumber ASC`,
       [tableId]
     );
 
@@ -2242,20 +2288,22 @@ export async function venueRoutes(app: FastifyInstance) {
       const newSeatId = randomUUID();
       const seatNumber = startNum + idx;
       const label = `${config.newName}-${seatNumber}`;
-      const metadata = JSON.parse(seat.metadata ?? "{}");
+      const metadata = parseBlobJson(seat.metadata ?? "{}");
       metadata.tableId = newTableId;
 
       return query(
-        `INSERT INTO Seat (id, venueId, zoneId, label, rowLabel, columnNumber, status, metadata, createdAt, updatedAt)
-         VALUES (?, ?, ?, ?, ?, ?, 'AVAILABLE', ?, NOW(), NOW())`,
+        `INSERT INTO Seat (id, venueId, zoneId, tableId, label, rowLabel, columnNumber, status, metadata, sectionId, sectionName, posX, posY, createdAt, updatedAt)
+         VALUES (?, ?, ?, ?, ?, ?, ?, 'AVAILABLE', ?, ?, ?, ?, ?, NOW(), NOW())`,
         [
           newSeatId,
           venueId,
           seat.zoneId,
+          newTableId,
           label,
           config.newName,
           seatNumber,
           JSON.stringify(metadata),
+          ...seatIndexValues(metadata),
         ]
       );
     });
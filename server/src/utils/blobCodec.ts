@@ -0,0 +1,57 @@
+// Sobre comprimido para columnas LongText con JSON (server/blob_codec.py):
+// VenueLayout.layoutJson, Venue.layoutJson, LayoutSection.polygonPoints y
+// Seat.metadata pueden guardarse como "~bz1<codec>:<base64>" con el JSON en
+// zlib. Un valor sin el prefijo es JSON normal, así que los dos formatos
+// conviven en la misma columna.
+
+import { deflateSync, inflateSync } from "zlib";
+
+const MAGIC = "~bz";
+const ENVELOPE_VERSION = "1";
+const HEADER_LEN = MAGIC.length + 3;
+
+// Debe ser idéntico a SEAT_METADATA_DICT en server/blob_codec.py
+const SEAT_METADATA_DICT = Buffer.from(
+  '{"sectionId": "section-", "sectionName": "", "color": "#", ' +
+    '"canvas": {"position": {"x": ., "y": .}, "size": {"width": ., "height": .}, ' +
+    '"label": "-"}, "tableId": "", "offsetX": , "offsetY": , "angle": , ' +
+    '"shape": "circle", "seatType": "standard"}',
+  "utf8",
+);
+
+export type BlobCodec = "z" | "d";
+
+const DICTIONARIES: Record<BlobCodec, Buffer | undefined> = {
+  z: undefined,
+  d: SEAT_METADATA_DICT,
+};
+
+export const isEncodedBlob = (value: unknown): value is string =>
+  typeof value === "string" && value.startsWith(MAGIC);
+
+export function decodeBlob(value: string): string;
+export function decodeBlob(value: string | null | undefined): string | null | undefined;
+export function decodeBlob(value: string | null | undefined) {
+  if (!isEncodedBlob(value)) {
+    return value;
+  }
+  const version = value[MAGIC.length];
+  const codec = value[MAGIC.length + 1] as BlobCodec;
+  if (version !== ENVELOPE_VERSION || value[HEADER_LEN - 1] !== ":" || !(codec in DICTIONARIES)) {
+    throw new Error(`Sobre comprimido no soportado: ${value.slice(0, HEADER_LEN)}`);
+  }
+  const dictionary = DICTIONARIES[codec];
+  const body = Buffer.from(value.slice(HEADER_LEN), "base64");
+  return inflateSync(body, dictionary ? { dictionary } : {}).toString("utf8");
+}
+
+// JSON.parse que acepta valores comprimidos
+export const parseBlobJson = <T = any>(value: string): T => JSON.parse(decodeBlob(value));
+
+// Comprimir solo si el resultado es más corto que el JSON original
+export function encodeBlob(text: string, codec: BlobCodec = "z"): string {
+  const dictionary = DICTIONARIES[codec];
+  const body = deflateSync(Buffer.from(text, "utf8"), { level: 9, ...(dictionary ? { dictionary } : {}) });
+  const encoded = `${MAGIC}${ENVELOPE_VERSION}${codec}:${body.toString("base64")}`;
+  return encoded.length < text.length ? encoded : text;
+}
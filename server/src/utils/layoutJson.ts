@@ -0,0 +1,85 @@
+// Lectura de VenueLayout.layoutJson / Venue.layoutJson.
+// Las herramientas de Python (server/compact_seats.py) pueden guardar los
+// asientos de canvas.objects como un bloque "compactSeats" con columnas por
+// sección; aquí se expande de nuevo a objetos Circle de Fabric.js para que el
+// resto del servidor y el frontend sigan viendo el formato de siempre.
+// El valor de la columna puede venir además como sobre comprimido (blobCodec.ts).
+
+import { decodeBlob } from "./blobCodec";
+
+const COMPACT_TYPE = "compactSeats";
+const COMPACT_FORMAT = 1;
+const COLUMNS = ["left", "top", "radius", "row", "number", "seatId", "status"] as const;
+const SECTION_KEYS = ["sectionId", "section", "fill"] as const;
+const DERIVED = ["width", "height"];
+
+type CompactSection = Record<string, any> & { count: number; seatIdPrefix?: string };
+
+type CompactSeatsBlock = {
+  _customType: typeof COMPACT_TYPE;
+  format: number;
+  keys: string[];
+  template: Record<string, any>;
+  sections: CompactSection[];
+  overrides?: Record<string, Record<string, any>>;
+  missing?: Record<string, string[]>;
+};
+
+const isCompactBlock = (obj: any): obj is CompactSeatsBlock =>
+  Boolean(obj) && typeof obj === "object" && obj._customType === COMPACT_TYPE;
+
+export function decodeCompactSeats(block: CompactSeatsBlock): Record<string, any>[] {
+  if (block.format !== COMPACT_FORMAT) {
+    throw new Error(`Formato de compactSeats no soportado: ${block.format}`);
+  }
+  const seats: Record<string, any>[] = [];
+  const overrides = block.overrides ?? {};
+  const missing = block.missing ?? {};
+  let index = 0;
+
+  for (const section of block.sections) {
+    const column = (name: string, i: number) => {
+      const values = section[name];
+      const value = Array.isArray(values) ? values[i] : values;
+      return name === "seatId" && section.seatIdPrefix ? section.seatIdPrefix + value : value;
+    };
+
+    for (let i = 0; i < section.count; i++) {
+      const seat: Record<string, any> = {};
+      for (const key of block.keys) {
+        if ((COLUMNS as readonly string[]).includes(key)) {
+          seat[key] = column(key, i);
+        } else if ((SECTION_KEYS as readonly string[]).includes(key)) {
+          seat[key] = section[key];
+        } else if (DERIVED.includes(key)) {
+          const radius = column("radius", i);
+          seat[key] = typeof radius === "number" ? radius * 2 : null;
+        } else {
+          seat[key] = block.template[key];
+        }
+      }
+      Object.assign(seat, overrides[String(index)] ?? {});
+      for (const key of missing[String(index)] ?? []) {
+        delete seat[key];
+      }
+      seats.push(seat);
+      index++;
+    }
+  }
+  return seats;
+}
+
+export function expandCompactSeats<T = any>(layout: T): T {
+  const objects = (layout as any)?.canvas?.objects;
+  if (!Array.isArray(objects) || !objects.some(isCompactBlock)) {
+    return layout;
+  }
+  (layout as any).canvas.objects = objects.flatMap((obj: any) =>
+    isCompactBlock(obj) ? decodeCompactSeats(obj) : [obj],
+  );
+  return layout;
+}
+
+export function parseLayoutJson<T = any>(raw: string): T {
+  return expandCompactSeats(JSON.parse(decodeBlob(raw)));
+}
@@ -0,0 +1,196 @@
+// Historial de VenueLayout.layoutJson por deltas (tabla LayoutRevision), el
+// mismo formato que escribe server/layout_revisions.py: cada BASE_INTERVAL
+// versiones el documento completo (kind = "base") y entre ellas el JSON Patch
+// (RFC 6902) contra la revisión anterior (kind = "delta"). El sha256 es el del
+// JSON canónico de Python (llaves ordenadas, sin espacios), para que
+// reconstruct() pueda verificar también las revisiones guardadas desde aquí.
+
+import { createHash, randomUUID } from "crypto";
+import { RowDataPacket } from "mysql2";
+import type { DBConnection } from "../lib/db";
+import { decodeBlob } from "./blobCodec";
+
+export const BASE_INTERVAL = 20;
+
+type PatchOp = { op: "add" | "remove" | "replace"; path: string; value?: unknown };
+
+const isObject = (value: unknown): value is Record<string, unknown> =>
+  value !== null && typeof value === "object" && !Array.isArray(value);
+
+const has = (obj: Record<string, unknown>, key: string) => Object.prototype.hasOwnProperty.call(obj, key);
+
+const escapeToken = (token: string | number) => String(token).replace(/~/g, "~0").replace(/\//g, "~1");
+const pointer = (path: (string | number)[]) => path.map((token) => "/" + escapeToken(token)).join("");
+
+function sameTree(a: unknown, b: unknown): boolean {
+  if (Array.isArray(a) && Array.isArray(b)) {
+    return a.length === b.length && a.every((value, i) => sameTree(value, b[i]));
+  }
+  if (isObject(a) && isObject(b)) {
+    const keys = Object.keys(a);
+    return keys.length === Object.keys(b).length && keys.every((key) => has(b, key) && sameTree(a[key], b[key]));
+  }
+  return a === b;
+}
+
+function diffValue(oldValue: unknown, newValue: unknown, path: (string | number)[], ops: PatchOp[]) {
+  if (isObject(oldValue) && isObject(newValue)) {
+    for (const key of Object.keys(oldValue)) {
+      if (!has(newValue, key)) {
+        ops.push({ op: "remove", path: pointer([...path, key]) });
+      }
+    }
+    for (const [key, value] of Object.entries(newValue)) {
+      if (has(oldValue, key)) {
+        diffValue(oldValue[key], value, [...path, key], ops);
+      } else {
+        ops.push({ op: "add", path: pointer([...path, key]), value });
+      }
+    }
+  } else if (Array.isArray(oldValue) && Array.isArray(newValue)) {
+    diffList(oldValue, newValue, path, ops);
+  } else if (oldValue !== newValue) {
+    ops.push({ op: "replace", path: pointer(path), value: newValue });
+  }
+}
+
+// Igual que _diff_list: prefijo y sufijo comunes quedan fuera del patch
+function diffList(oldList: unknown[], newList: unknown[], path: (string | number)[], ops: PatchOp[]) {
+  let start = 0;
+  const limit = Math.min(oldList.length, newList.length);
+  while (start < limit && sameTree(oldList[start], newList[start])) {
+    start++;
+  }
+  let oldEnd = oldList.length;
+  let newEnd = newList.length;
+  while (oldEnd > start && newEnd > start && sameTree(oldList[oldEnd - 1], newList[newEnd - 1])) {
+    oldEnd--;
+    newEnd--;
+  }
+
+  const common = Math.min(oldEnd, newEnd) - start;
+  for (let i = start; i < start + common; i++) {
+    diffValue(oldList[i], newList[i], [...path, i], ops);
+  }
+  for (let i = oldEnd - 1; i >= start + common; i--) {
+    ops.push({ op: "remove", path: pointer([...path, i]) });
+  }
+  for (let i = start + common; i < newEnd; i++) {
+    ops.push({ op: "add", path: pointer([...path, i]), value: newList[i] });
+  }
+}
+
+/** JSON Patch que convierte oldDoc en newDoc (mismo algoritmo que make_patch) */
+export function makePatch(oldDoc: unknown, newDoc: unknown): PatchOp[] {
+  const ops: PatchOp[] = [];
+  diffValue(oldDoc, newDoc, [], ops);
+  return ops;
+}
+
+// Números como los escribe json.dumps de Python al leer este mismo JSON:
+// enteros como int y el resto con repr() de float
+function pythonNumber(value: number): string {
+  if (Number.isInteger(value) && Math.abs(value) < 1e21) {
+    return String(value);
+  }
+  const [mantissa, exponent] = value.toExponential().split("e");
+  const exp = Number(exponent);
+  if (exp >= -4 && exp < 16) {
+    return String(value);
+  }
+  const digits = String(Math.abs(exp)).padStart(2, "0");
+  return `${mantissa}e${exp < 0 ? "-" : "+"}${digits}`;
+}
+
+// sort_keys de Python ordena por punto de código, no por unidades UTF-16
+const compareKeys = (a: string, b: string) => {
+  const x = Array.from(a);
+  const y = Array.from(b);
+  for (let i = 0; i < Math.min(x.length, y.length); i++) {
+    const diff = x[i].codePointAt(0)! - y[i].codePointAt(0)!;
+    if (diff) {
+      return diff;
+    }
+  }
+  return x.length - y.length;
+};
+
+function canonicalJson(value: unknown): string {
+  if (Array.isArray(value)) {
+    return `[${value.map(canonicalJson).join(",")}]`;
+  }
+  if (isObject(value)) {
+    const keys = Object.keys(value).sort(compareKeys);
+    return `{${keys.map((key) => `${JSON.stringify(key)}:${canonicalJson(value[key])}`).join(",")}}`;
+  }
+  if (typeof value === "number") {
+    return pythonNumber(value);
+  }
+  return JSON.stringify(value ?? null);
+}
+
+/** sha256 del documento canónico (canonical_sha en layout_revisions.py) */
+export const canonicalSha = (doc: unknown) => createHash("sha256").update(canonicalJson(doc), "utf8").digest("hex");
+
+async function insertRevision(
+  connection: DBConnection,
+  layoutId: string,
+  version: number,
+  kind: "base" | "delta",
+  baseVersion: number,
+  payload: string,
+  sha: string,
+  createdBy: string | null,
+) {
+  await connection.query(
+    `INSERT INTO LayoutRevision (id, layoutId, version, kind, baseVersion, payload, sha256, size, createdBy, createdAt)
+     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NOW(3))`,
+    [randomUUID(), layoutId, version, kind, baseVersion, payload, sha, payload.length, createdBy],
+  );
+}
+
+/**
+ * Registrar doc como la siguiente versión del layout, dentro de la
+ * transacción del guardado. Debe llamarse antes de escribir el nuevo
+ * layoutJson: el valor actual (bloquea la fila con FOR UPDATE) es la versión
+ * anterior. Si el layout aún no tiene historial se guarda primero como base.
+ * El delta se calcula contra el layoutJson actual solo si coincide con la
+ * última revisión (mismo sha256); si no, la nueva revisión es una base.
+ * Regresa el número de la nueva versión.
+ */
+export async function recordLayoutRevision(
+  connection: DBConnection,
+  layoutId: string,
+  doc: unknown,
+  createdBy: string | null = null,
+): Promise<number> {
+  const [[layout]] = await connection.query<RowDataPacket[]>(
+    `SELECT version, layoutJson FROM VenueLayout WHERE id = ? FOR UPDATE`,
+    [layoutId],
+  );
+  if (!layout) {
+    throw new Error(`No existe el layout ${layoutId}`);
+  }
+  const previous = JSON.parse(decodeBlob(layout.layoutJson as string | null) || "{}");
+  const previousSha = canonicalSha(previous);
+
+  let [[latest]] = await connection.query<RowDataPacket[]>(
+    `SELECT version, baseVersion, sha256 FROM LayoutRevision WHERE layoutId = ? ORDER BY version DESC LIMIT 1`,
+    [layoutId],
+  );
+  if (!latest) {
+    const version = Number(layout.version ?? 1);
+    await insertRevision(connection, layoutId, version, "base", version, JSON.stringify(previous), previousSha, createdBy);
+    latest = { version, baseVersion: version, sha256: previousSha } as RowDataPacket;
+  }
+
+  const version = Math.max(Number(latest.version), Number(layout.version ?? 0)) + 1;
+  const sha = canonicalSha(doc);
+  if (version - Number(latest.baseVersion) >= BASE_INTERVAL || latest.sha256 !== previousSha) {
+    await insertRevision(connection, layoutId, version, "base", version, JSON.stringify(doc), sha, createdBy);
+  } else {
+    const payload = JSON.stringify(makePatch(previous, doc));
+    await insertRevision(connection, layoutId, version, "delta", Number(latest.baseVersion), payload, sha, createdBy);
+  }
+  return version;
+}
@@ -0,0 +1,38 @@
+// Columnas materializadas de Seat (sectionId, sectionName, posX, posY).
+// Son copias de metadata.sectionId, metadata.sectionName y
+// metadata.canvas.position que usan los índices de las consultas por sección
+// y posición; no pueden ser columnas generadas porque metadata puede venir
+// como sobre comprimido (blobCodec.ts). Todo INSERT o UPDATE que escribe
+// Seat.metadata debe escribirlas también (igual que seat_index_values en
+// server/seat_sinks.py).
+
+import { decodeBlob } from "./blobCodec";
+
+export const SEAT_INDEX_COLUMNS = ["sectionId", "sectionName", "posX", "posY"] as const;
+
+export type SeatIndexValues = [string | null, string | null, number | null, number | null];
+
+const asString = (value: unknown) => (typeof value === "string" && value ? value : null);
+const asNumber = (value: unknown) => {
+  const num = typeof value === "string" ? Number(value) : value;
+  return typeof num === "number" && Number.isFinite(num) ? num : null;
+};
+
+/** Valores de SEAT_INDEX_COLUMNS a partir de metadata (objeto, JSON o sobre comprimido) */
+export function seatIndexValues(metadata: unknown): SeatIndexValues {
+  let meta: any = metadata;
+  if (typeof meta === "string") {
+    try {
+      meta = JSON.parse(decodeBlob(meta));
+    } catch {
+      meta = null;
+    }
+  } else if (Buffer.isBuffer(meta)) {
+    return seatIndexValues(meta.toString("utf8"));
+  }
+  if (!meta || typeof meta !== "object") {
+    return [null, null, null, null];
+  }
+  const position = meta.canvas?.position ?? {};
+  return [asString(meta.sectionId), asString(meta.sectionName), asNumber(position.x), asNumber(position.y)];
+}
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Sincronizar los asientos generados con la tabla Seat aplicando solo las
+diferencias, en lugar de DELETE de todo el venue + INSERT de todo.
+
+Lee el archivo de generate_seats_db_v3.py --bulk, recorre los asientos
+actuales del layout con un cursor de streaming y los empareja por id (o por
+label si el id cambio). Despues aplica en una sola transaccion:
+  - DELETE de los asientos que ya no existen
+  - UPDATE de los que cambiaron (label, fila, numero o metadata)
+  - INSERT de los nuevos
+Los asientos que no cambiaron no se tocan, asi que no se borran sus boletos,
+historial de estados ni cortesias (ON DELETE CASCADE). El status actual de
+la DB se conserva.
+
+    python3 generate_seats_db_v3.py --bulk && python3 sync_seats.py
+"""
+
+import argparse
+import json
+
+from blob_codec import decode_blob
+from boletera_db import get_pool
+from generate_seats_db_v3 import commit_section_caches
+from load_seats import COLUMNS_SQL, MANIFEST_PATH
+from seat_sinks import SEAT_COLUMNS, SEAT_INDEX_COLUMNS, read_tsv
+
+# Columnas que se comparan y actualizan (status lo maneja la venta)
+SYNC_COLUMNS = ('label', 'rowLabel', 'columnNumber', 'metadata') + SEAT_INDEX_COLUMNS
+ID_CHUNK = 500
+
+
+def normalize(row):
+    """Valores comparables de una fila Seat (del TSV o de la DB)"""
+    metadata = row['metadata']
+    if isinstance(metadata, (str, bytes)):
+        metadata = json.loads(decode_blob(metadata))
+    column = row['columnNumber']
+    pos_x, pos_y = row['posX'], row['posY']
+    return (
+        row['label'],
+        row['rowLabel'],
+        int(column) if column is not None else None,
+        metadata,
+        row['sectionId'],
+        row['sectionName'],
+        float(pos_x) if pos_x is not None else None,
+        float(pos_y) if pos_y is not None else None,
+    )
+
+
+def in_scope(seat_id, section_ids):
+    if section_ids is None:
+        return True
+    return any(seat_id.startswith(f'seat-{section_id}-') for section_id in section_ids)
+
+
+def diff_seats(generated, current):
+    """
+    Comparar asientos generados contra los actuales.
+
+    generated: dict id -> fila Seat generada (dict con SEAT_COLUMNS)
+    current: iterable de filas Seat actuales (id y SYNC_COLUMNS)
+    Regresa (inserts, updates, deletes): filas a insertar, tuplas
+    (id en DB, label actual, fila generada) a actualizar e ids a borrar.
+    """
+    pending = dict(generated)
+    unmatched = {}
+    updates = []
+    for row in current:
+        seat = pending.pop(row['id'], None)
+        if seat is None:
+            unmatched[row['label']] = row
+        elif normalize(seat) != normalize(row):
+            updates.append((row['id'], row['label'], seat))
+
+    # Asientos cuyo id cambio pero conservan el label: se actualiza la fila
+    # existente (con su id) en lugar de borrarla e insertarla
+    inserts = []
+    for seat in pending.values():
+        row = unmatched.pop(seat['label'], None)
+        if row is None:
+            inserts.append(seat)
+        elif normalize(seat) != normalize(row):
+            updates.append((row['id'], row['label'], seat))
+
+    deletes = [row['id'] for row in unmatched.values()]
+    return inserts, updates, deletes
+
+
+def load_generated(path, section_ids):
+    generated = {}
+    for values in read_tsv(path):
+        seat = dict(zip(SEAT_COLUMNS, values))
+        if in_scope(seat['id'], section_ids):
+            generated[seat['id']] = seat
+    return generated
+
+
+def iter_current(db, layout_id, section_ids):
+    rows = db.stream(
+        f"SELECT id, {', '.join(SYNC_COLUMNS)} FROM Seat WHERE layoutId = %s",
+        (layout_id,), dicts=True
+    )
+    for row in rows:
+        if in_scope(row['id'], section_ids):
+            yield row
+
+
+def apply_diff(db, cursor, inserts, updates, deletes):
+    for start in range(0, len(deletes), ID_CHUNK):
+        chunk = deletes[start:start + ID_CHUNK]
+        cursor.execute(f"DELETE FROM Seat WHERE id IN ({', '.join(['%s'] * len(chunk))})", chunk)
+
+    # @@unique([layoutId, label]): si dos asientos intercambian labels, el
+    # UPDATE directo chocaria. Primero se liberan los labels que cambian.
+    relabeled = [seat_id for seat_id, label, seat in updates if label != seat['label']]
+    for start in range(0, len(relabeled), ID_CHUNK):
+        chunk = relabeled[start:start + ID_CHUNK]
+        cursor.execute(f"UPDATE Seat SET label = CONCAT('~sync~', id) WHERE id IN ({', '.join(['%s'] * len(chunk))})", chunk)
+
+    if updates:
+        db.update_many(
+            'Seat', 'id', SYNC_COLUMNS,
+            [tuple(seat[column] for column in SYNC_COLUMNS) + (seat_id,) for seat_id, _, seat in updates],
+            extra=('t.updatedAt = NOW()',), cursor=cursor
+        )
+
+    placeholders = ', '.join(['%s'] * len(SEAT_COLUMNS))
+    db.executemany(
+        f'INSERT INTO Seat ({COLUMNS_SQL}, createdAt, updatedAt) VALUES ({placeholders}, NOW(), NOW())',
+        [tuple(seat[column] for column in SEAT_COLUMNS) for seat in inserts],
+        cursor=cursor
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sincronizar asientos generados con la tabla Seat (solo diferencias)')
+    parser.add_argument('--manifest', default=MANIFEST_PATH,
+                        help=f'Manifiesto escrito por generate_seats_db_v3.py --bulk (default: {MANIFEST_PATH})')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Solo mostrar cuantos asientos se insertarian, actualizarian y borrarian')
+    args = parser.parse_args()
+
+    with open(args.manifest, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    section_ids = manifest.get('sectionIds')
+
+    generated = load_generated(manifest['file'], section_ids)
+    print(f'Asientos generados: {len(generated)}')
+
+    db = get_pool(size=1)
+    inserts, updates, deletes = diff_seats(generated, iter_current(db, manifest['layoutId'], section_ids))
+    print(f'Insertar: {len(inserts)}, actualizar: {len(updates)}, borrar: {len(deletes)}')
+
+    if args.dry_run:
+        return
+    if not (inserts or updates or deletes):
+        print('Sin cambios')
+    else:
+        with db.transaction() as cursor:
+            apply_diff(db, cursor, inserts, updates, deletes)
+        print('Asientos sincronizados correctamente!')
+    # La DB ya coincide con la generacion: su cache de --incremental es valido
+    commit_section_caches()
+
+
+if __name__ == '__main__':
+    main()
@@ -2,8 +2,9 @@
 """
 Script para actualizar la capacidad de cada seccion
 """
-import json
-import subprocess
+import pymysql
+
+from boletera_db import get_pool
 
 LAYOUT_ID = 'ad44b249-13ad-4c51-b1ff-f73ce9b80c9b'
 
@@ -21,30 +22,25 @@ SECTION_COUNTS = {
 }
 
 def main():
-    updates = []
-    for section_id, capacity in SECTION_COUNTS.items():
-        updates.append(f"UPDATE LayoutSection SET capacity = {capacity} WHERE id = '{section_id}';")
-    
-    sql = '\n'.join(updates)
+    db = get_pool()
     
-    result = subprocess.run([
-        'mysql', '-u', 'boletera_user', '-pCer0un0cer0.com20182417', 
-        'boletera_db'
-    ], input=sql, capture_output=True, text=True)
-    
-    if result.returncode == 0:
+    try:
+        db.update_many(
+            'LayoutSection', 'id', ('capacity',),
+            [(capacity, section_id) for section_id, capacity in SECTION_COUNTS.items()]
+        )
         print('Capacidades actualizadas correctamente!')
-    else:
-        print(f'Error: {result.stderr}')
+    except pymysql.err.MySQLError as e:
+        print(f'Error: {e}')
     
     # Verificar
-    result = subprocess.run([
-        'mysql', '-u', 'boletera_user', '-pCer0un0cer0.com20182417', 
-        'boletera_db', '-e',
-        f"SELECT name, capacity FROM LayoutSection WHERE layoutId = '{LAYOUT_ID}' ORDER BY name"
-    ], capture_output=True, text=True)
-    
-    print(result.stdout)
+    rows = db.query(
+        'SELECT name, capacity FROM LayoutSection WHERE parentLayoutId = %s ORDER BY name',
+        (LAYOUT_ID,)
+    )
+    print('name\tcapacity')
+    for name, capacity in rows:
+        print(f'{name}\t{capacity}')
 
 if __name__ == '__main__':
     main()
@@ -1,52 +1,60 @@
 #!/usr/bin/env python3
 """
 Script para actualizar layoutJson con los asientos generados
+
+Lee el layoutJson de la DB por pedazos y escribe /tmp/layout_updated.json
+reemplazando los asientos, sin cargar todo el documento en memoria. Para
+guardar directo en la DB usar save_layout.py. Con --compact los asientos se
+guardan como un bloque compactSeats (ver compact_seats.py).
 """
 
-import json
-import subprocess
+import argparse
+
+from boletera_db import get_pool
+from compact_seats import encode_seats, expand_objects
+from layout_stream import is_seat, iter_file_chunks, iter_json_array, iter_layout_chunks, write_merged
 
 LAYOUT_ID = 'ad44b249-13ad-4c51-b1ff-f73ce9b80c9b'
 
-def main():
-    # Obtener layoutJson actual
-    query = f"SELECT layoutJson FROM VenueLayout WHERE id = '{LAYOUT_ID}'"
-    result = subprocess.run([
-        'mysql', '-u', 'boletera_user', '-pCer0un0cer0.com20182417', 
-        'boletera_db', '-N', '-e', query
-    ], capture_output=True, text=True)
-
-    layout_json_str = result.stdout.strip()
-    if not layout_json_str:
-        print('Error: No se encontro el layout')
-        return
-    
-    layout = json.loads(layout_json_str)
-    
-    # La estructura es layout.canvas.objects
+def merge_seats(layout, new_seats):
+    """
+    Reemplazar los asientos de layout.canvas.objects por new_seats. Los
+    bloques compactSeats tambien son asientos y se reemplazan completos.
+    """
     canvas_objects = layout.get('canvas', {}).get('objects', [])
-    print(f'Objetos originales en canvas.objects: {len(canvas_objects)}')
-
-    # Cargar nuevos asientos para canvas
-    with open('/tmp/seats_for_canvas.json', 'r') as f:
-        new_seats = json.load(f)
 
-    print(f'Asientos a agregar: {len(new_seats)}')
-
-    # Remover asientos anteriores si existen
-    objects = [obj for obj in canvas_objects if obj.get('_customType') != 'seat']
-    print(f'Objetos sin asientos: {len(objects)}')
+    # Remover asientos anteriores si existen (sueltos o en bloque compacto)
+    objects = [obj for obj in canvas_objects if not is_seat(obj)]
 
     # Agregar nuevos asientos
     objects.extend(new_seats)
     layout['canvas']['objects'] = objects
+    return objects
+
+def main():
+    parser = argparse.ArgumentParser(description='Reemplazar los asientos del layoutJson')
+    parser.add_argument('--compact', action='store_true',
+                        help='Guardar los asientos como un bloque compactSeats')
+    args = parser.parse_args()
+
+    db = get_pool()
+    if not db.query_value('SELECT COUNT(*) FROM VenueLayout WHERE id = %s AND layoutJson IS NOT NULL', (LAYOUT_ID,)):
+        print('Error: No se encontro el layout')
+        return
 
-    print(f'Total objetos finales: {len(objects)}')
+    # Nuevos asientos para canvas, leidos uno por uno
+    new_seats = iter_json_array(iter_file_chunks('/tmp/seats_for_canvas.json'))
+    if args.compact:
+        new_seats = [encode_seats(expand_objects(new_seats))]
 
-    # Guardar JSON actualizado
+    # Guardar JSON actualizado (la estructura es layout.canvas.objects)
     with open('/tmp/layout_updated.json', 'w', encoding='utf-8') as f:
-        json.dump(layout, f, ensure_ascii=False)
+        kept, removed, added = write_merged(iter_layout_chunks(db, LAYOUT_ID), new_seats, f)
 
+    print(f'Objetos originales en canvas.objects: {kept + removed}')
+    print(f'Asientos a agregar: {added}')
+    print(f'Objetos sin asientos: {kept}')
+    print(f'Total objetos finales: {kept + added}')
     print('Layout actualizado guardado en /tmp/layout_updated.json')
 
 if __name__ == '__main__':